@@ -0,0 +1,57 @@
+#include <stdint.h>
+#include <math.h>
+#include <hidet/runtime/symbols.h>
+#include <hidet/runtime/memory_planner.h>
+#include <hidet/runtime/cpu/context.h>
+#include <hidet/runtime/cpu/float32.h>
+#include <hidet/runtime/logging.h>
+#include <hidet/runtime/int_fastdiv.h>
+
+
+static void hidet_matmul_compute_c_8d75(float * __restrict__ a, float * __restrict__ b, float * __restrict__ c) {
+  #pragma omp parallel for
+  for (int32_t w = 0; (w < 1024); w = (w + 1)) {
+    float acc_Sum = 0.0f;
+    for (int32_t v = 0; (v < 64); v = (v + 1)) {
+      acc_Sum = ((a[(((w / 256) * 64) + v)] * b[((w % 256) + (v * 256))]) + acc_Sum);
+    } 
+    c[w] = acc_Sum;
+  } 
+}
+
+DLL void hidet_launch_0(float * __restrict__ a, float * __restrict__ b, float * __restrict__ c) {
+  try {
+    hidet_matmul_compute_c_8d75(a, b, c);
+  } catch (HidetException &e) { 
+    hidet_set_last_error(e.what());
+    return ;
+  }
+}
+
+DLL void hidet_get_input_shape(int32_t idx, int32_t * __restrict__ dims) {
+  try {
+    if (idx == 0) {
+      dims[0] = 4;
+      dims[1] = 64;
+    } 
+    if (idx == 1) {
+      dims[0] = 64;
+      dims[1] = 256;
+    } 
+  } catch (HidetException &e) { 
+    hidet_set_last_error(e.what());
+    return ;
+  }
+}
+
+DLL void hidet_get_output_shape(int32_t idx, int32_t * __restrict__ dims) {
+  try {
+    if (idx == 0) {
+      dims[0] = 4;
+      dims[1] = 256;
+    } 
+  } catch (HidetException &e) { 
+    hidet_set_last_error(e.what());
+    return ;
+  }
+}
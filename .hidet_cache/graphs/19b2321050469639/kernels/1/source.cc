@@ -0,0 +1,49 @@
+#include <stdint.h>
+#include <math.h>
+#include <hidet/runtime/symbols.h>
+#include <hidet/runtime/memory_planner.h>
+#include <hidet/runtime/cpu/context.h>
+#include <hidet/runtime/cpu/float32.h>
+#include <hidet/runtime/logging.h>
+#include <hidet/runtime/int_fastdiv.h>
+
+
+static void hidet_relu_compute_y_ff44(float * __restrict__ x, float * __restrict__ y) {
+  #pragma omp parallel for
+  for (int32_t w = 0; (w < 8); w = (w + 1)) {
+    y[w] = fmaxf(x[w], 0.0f);
+  } 
+}
+
+DLL void hidet_launch_0(float * __restrict__ x, float * __restrict__ y) {
+  try {
+    hidet_relu_compute_y_ff44(x, y);
+  } catch (HidetException &e) { 
+    hidet_set_last_error(e.what());
+    return ;
+  }
+}
+
+DLL void hidet_get_input_shape(int32_t idx, int32_t * __restrict__ dims) {
+  try {
+    if (idx == 0) {
+      dims[0] = 1;
+      dims[1] = 8;
+    } 
+  } catch (HidetException &e) { 
+    hidet_set_last_error(e.what());
+    return ;
+  }
+}
+
+DLL void hidet_get_output_shape(int32_t idx, int32_t * __restrict__ dims) {
+  try {
+    if (idx == 0) {
+      dims[0] = 1;
+      dims[1] = 8;
+    } 
+  } catch (HidetException &e) { 
+    hidet_set_last_error(e.what());
+    return ;
+  }
+}
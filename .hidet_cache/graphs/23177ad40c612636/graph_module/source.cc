@@ -0,0 +1,103 @@
+#include <stdint.h>
+#include <math.h>
+#include <hidet/runtime/symbols.h>
+#include <hidet/runtime/memory_planner.h>
+#include <hidet/runtime/cpu/context.h>
+#include <hidet/runtime/cpu/float32.h>
+#include <hidet/runtime/logging.h>
+#include <hidet/runtime/int_fastdiv.h>
+
+uint8_t *cpu_workspace;
+uint8_t *cuda_workspace;
+uint8_t *hip_workspace;
+void* weights[1];
+
+DLL void hidet_launch(void * __restrict__ inputs, void * __restrict__ outputs, void* * __restrict__ p_kernels) {
+  try {
+    memory_planner_init(0);
+    memory_planner_init(1);
+    int64_t matmul = memory_planner_allocate(0, int64_t(32ll));
+    void (*hidet_k0_Matmul)(void*, void*, void*) = ((void (*)( void*, void*, void*))(p_kernels[0]));
+    hidet_k0_Matmul(inputs, weights[0], (cpu_workspace + matmul));
+    int64_t relu = memory_planner_allocate(0, int64_t(32ll));
+    void (*hidet_k1_Relu)(void*, void*) = ((void (*)( void*, void*))(p_kernels[1]));
+    hidet_k1_Relu((cpu_workspace + matmul), (cpu_workspace + relu));
+    memory_planner_free(0, matmul);
+    void (*hidet_k2_AddScalar)(void*, void*) = ((void (*)( void*, void*))(p_kernels[2]));
+    hidet_k2_AddScalar((cpu_workspace + relu), outputs);
+    memory_planner_free(0, relu);
+  } catch (HidetException &e) { 
+    hidet_set_last_error(e.what());
+    return ;
+  }
+}
+
+DLL void hidet_init(int32_t num_weights, void* * __restrict__ p_weights) {
+  try {
+    assert((num_weights == 1));  // Expect 1 weights
+    weights[0] = p_weights[0];
+  } catch (HidetException &e) { 
+    hidet_set_last_error(e.what());
+    return ;
+  }
+}
+
+DLL void hidet_get_output_shape(int32_t index, int32_t * __restrict__ dims) {
+  try {
+    if (0 == index) {
+      dims[0] = 1;
+      dims[1] = 8;
+    } 
+  } catch (HidetException &e) { 
+    hidet_set_last_error(e.what());
+    return ;
+  }
+}
+
+DLL void hidet_get_workspace_size(int64_t * __restrict__ sizes) {
+  try {
+    int64_t cpu_size = int64_t(0ll);
+    int64_t cuda_size = int64_t(0ll);
+    int64_t hip_size = int64_t(0ll);
+    memory_planner_init(0);
+    memory_planner_init(1);
+    memory_planner_init(2);
+    int64_t matmul = memory_planner_allocate(0, int64_t(32ll));
+    cpu_size = std::max(cpu_size, memory_planner_used(0));
+    cuda_size = std::max(cuda_size, memory_planner_used(1));
+    hip_size = std::max(hip_size, memory_planner_used(2));
+    int64_t relu = memory_planner_allocate(0, int64_t(32ll));
+    cpu_size = std::max(cpu_size, memory_planner_used(0));
+    cuda_size = std::max(cuda_size, memory_planner_used(1));
+    hip_size = std::max(hip_size, memory_planner_used(2));
+    memory_planner_free(0, matmul);
+    cpu_size = std::max(cpu_size, memory_planner_used(0));
+    cuda_size = std::max(cuda_size, memory_planner_used(1));
+    hip_size = std::max(hip_size, memory_planner_used(2));
+    memory_planner_free(0, relu);
+    sizes[0] = cpu_size;
+    sizes[1] = cuda_size;
+    sizes[2] = hip_size;
+  } catch (HidetException &e) { 
+    hidet_set_last_error(e.what());
+    return ;
+  }
+}
+
+DLL void hidet_set_workspace(int32_t idx, void * __restrict__ space) {
+  try {
+    assert(((0 <= idx) && (idx < 3)));  // Invalid workspace index
+    if (idx == 0) {
+      cpu_workspace = ((uint8_t*)(space));
+    } else {
+      if (idx == 1) {
+        cuda_workspace = ((uint8_t*)(space));
+      } else {
+        hip_workspace = ((uint8_t*)(space));
+      } 
+    } 
+  } catch (HidetException &e) { 
+    hidet_set_last_error(e.what());
+    return ;
+  }
+}
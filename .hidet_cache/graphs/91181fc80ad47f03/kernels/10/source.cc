@@ -0,0 +1,53 @@
+#include <stdint.h>
+#include <math.h>
+#include <hidet/runtime/symbols.h>
+#include <hidet/runtime/memory_planner.h>
+#include <hidet/runtime/cpu/context.h>
+#include <hidet/runtime/cpu/float32.h>
+#include <hidet/runtime/logging.h>
+#include <hidet/runtime/int_fastdiv.h>
+
+
+static void hidet_div_compute_z_5e03(float * __restrict__ x, float * __restrict__ y, float * __restrict__ z) {
+  #pragma omp parallel for
+  for (int32_t w = 0; (w < 256); w = (w + 1)) {
+    z[w] = (x[w] / y[(w / 64)]);
+  } 
+}
+
+DLL void hidet_launch_0(float * __restrict__ x, float * __restrict__ y, float * __restrict__ z) {
+  try {
+    hidet_div_compute_z_5e03(x, y, z);
+  } catch (HidetException &e) { 
+    hidet_set_last_error(e.what());
+    return ;
+  }
+}
+
+DLL void hidet_get_input_shape(int32_t idx, int32_t * __restrict__ dims) {
+  try {
+    if (idx == 0) {
+      dims[0] = 4;
+      dims[1] = 64;
+    } 
+    if (idx == 1) {
+      dims[0] = 4;
+      dims[1] = 1;
+    } 
+  } catch (HidetException &e) { 
+    hidet_set_last_error(e.what());
+    return ;
+  }
+}
+
+DLL void hidet_get_output_shape(int32_t idx, int32_t * __restrict__ dims) {
+  try {
+    if (idx == 0) {
+      dims[0] = 4;
+      dims[1] = 64;
+    } 
+  } catch (HidetException &e) { 
+    hidet_set_last_error(e.what());
+    return ;
+  }
+}
@@ -0,0 +1,56 @@
+#include <stdint.h>
+#include <math.h>
+#include <hidet/runtime/symbols.h>
+#include <hidet/runtime/memory_planner.h>
+#include <hidet/runtime/cpu/context.h>
+#include <hidet/runtime/cpu/float32.h>
+#include <hidet/runtime/logging.h>
+#include <hidet/runtime/int_fastdiv.h>
+
+
+static void hidet_add_compute_z_3903(float * __restrict__ x, float * __restrict__ y, float * __restrict__ z, int32_t b) {
+  #pragma omp parallel for
+  for (int32_t w = 0; (w < (b * 32)); w = (w + 1)) {
+    z[w] = (x[w] + y[w]);
+  } 
+}
+
+DLL void hidet_launch_0(float * __restrict__ x, float * __restrict__ y, float * __restrict__ z) {
+  try {
+    int32_t b = get_symbol_value("b");
+    hidet_add_compute_z_3903(x, y, z, b);
+  } catch (HidetException &e) { 
+    hidet_set_last_error(e.what());
+    return ;
+  }
+}
+
+DLL void hidet_get_input_shape(int32_t idx, int32_t * __restrict__ dims) {
+  try {
+    int32_t b = get_symbol_value("b");
+    if (idx == 0) {
+      dims[0] = b;
+      dims[1] = 32;
+    } 
+    if (idx == 1) {
+      dims[0] = b;
+      dims[1] = 32;
+    } 
+  } catch (HidetException &e) { 
+    hidet_set_last_error(e.what());
+    return ;
+  }
+}
+
+DLL void hidet_get_output_shape(int32_t idx, int32_t * __restrict__ dims) {
+  try {
+    int32_t b = get_symbol_value("b");
+    if (idx == 0) {
+      dims[0] = b;
+      dims[1] = 32;
+    } 
+  } catch (HidetException &e) { 
+    hidet_set_last_error(e.what());
+    return ;
+  }
+}
@@ -0,0 +1,57 @@
+#include <stdint.h>
+#include <math.h>
+#include <hidet/runtime/symbols.h>
+#include <hidet/runtime/memory_planner.h>
+#include <hidet/runtime/cpu/context.h>
+#include <hidet/runtime/cpu/float32.h>
+#include <hidet/runtime/logging.h>
+#include <hidet/runtime/int_fastdiv.h>
+
+
+static void hidet_matmul_compute_c_33e6(float * __restrict__ a, float * __restrict__ b, float * __restrict__ c) {
+  #pragma omp parallel for
+  for (int32_t w = 0; (w < 6); w = (w + 1)) {
+    float acc_Sum = 0.0f;
+    for (int32_t v = 0; (v < 41); v = (v + 1)) {
+      acc_Sum = ((a[(((w / 3) * 41) + v)] * b[((w % 3) + (v * 3))]) + acc_Sum);
+    } 
+    c[w] = acc_Sum;
+  } 
+}
+
+DLL void hidet_launch_0(float * __restrict__ a, float * __restrict__ b, float * __restrict__ c) {
+  try {
+    hidet_matmul_compute_c_33e6(a, b, c);
+  } catch (HidetException &e) { 
+    hidet_set_last_error(e.what());
+    return ;
+  }
+}
+
+DLL void hidet_get_input_shape(int32_t idx, int32_t * __restrict__ dims) {
+  try {
+    if (idx == 0) {
+      dims[0] = 2;
+      dims[1] = 41;
+    } 
+    if (idx == 1) {
+      dims[0] = 41;
+      dims[1] = 3;
+    } 
+  } catch (HidetException &e) { 
+    hidet_set_last_error(e.what());
+    return ;
+  }
+}
+
+DLL void hidet_get_output_shape(int32_t idx, int32_t * __restrict__ dims) {
+  try {
+    if (idx == 0) {
+      dims[0] = 2;
+      dims[1] = 3;
+    } 
+  } catch (HidetException &e) { 
+    hidet_set_last_error(e.what());
+    return ;
+  }
+}
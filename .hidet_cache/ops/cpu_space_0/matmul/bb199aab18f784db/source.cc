@@ -0,0 +1,57 @@
+#include <stdint.h>
+#include <math.h>
+#include <hidet/runtime/symbols.h>
+#include <hidet/runtime/memory_planner.h>
+#include <hidet/runtime/cpu/context.h>
+#include <hidet/runtime/cpu/float32.h>
+#include <hidet/runtime/logging.h>
+#include <hidet/runtime/int_fastdiv.h>
+
+
+static void hidet_matmul_compute_c_bb19(float * __restrict__ a, float * __restrict__ b, float * __restrict__ c) {
+  #pragma omp parallel for
+  for (int32_t w = 0; (w < 8); w = (w + 1)) {
+    float acc_Sum = 0.0f;
+    acc_Sum = ((a[((w / 4) * 3)] * b[(w % 4)]) + acc_Sum);
+    acc_Sum = ((a[(((w / 4) * 3) + 1)] * b[((w % 4) + 4)]) + acc_Sum);
+    acc_Sum = ((a[(((w / 4) * 3) + 2)] * b[((w % 4) + 8)]) + acc_Sum);
+    c[w] = acc_Sum;
+  } 
+}
+
+DLL void hidet_launch_0(float * __restrict__ a, float * __restrict__ b, float * __restrict__ c) {
+  try {
+    hidet_matmul_compute_c_bb19(a, b, c);
+  } catch (HidetException &e) { 
+    hidet_set_last_error(e.what());
+    return ;
+  }
+}
+
+DLL void hidet_get_input_shape(int32_t idx, int32_t * __restrict__ dims) {
+  try {
+    if (idx == 0) {
+      dims[0] = 2;
+      dims[1] = 3;
+    } 
+    if (idx == 1) {
+      dims[0] = 3;
+      dims[1] = 4;
+    } 
+  } catch (HidetException &e) { 
+    hidet_set_last_error(e.what());
+    return ;
+  }
+}
+
+DLL void hidet_get_output_shape(int32_t idx, int32_t * __restrict__ dims) {
+  try {
+    if (idx == 0) {
+      dims[0] = 2;
+      dims[1] = 4;
+    } 
+  } catch (HidetException &e) { 
+    hidet_set_last_error(e.what());
+    return ;
+  }
+}
@@ -0,0 +1,60 @@
+#include <stdint.h>
+#include <math.h>
+#include <hidet/runtime/symbols.h>
+#include <hidet/runtime/memory_planner.h>
+#include <hidet/runtime/cpu/context.h>
+#include <hidet/runtime/cpu/float32.h>
+#include <hidet/runtime/logging.h>
+#include <hidet/runtime/int_fastdiv.h>
+
+
+static void hidet_matmul_compute_c_c8fe(float * __restrict__ a, float * __restrict__ b, float * __restrict__ c, int32_t b_1) {
+  #pragma omp parallel for
+  for (int32_t w = 0; (w < (b_1 * 32)); w = (w + 1)) {
+    float acc_Sum = 0.0f;
+    for (int32_t v = 0; (v < 16); v = (v + 1)) {
+      acc_Sum = ((a[(((w / 32) * 16) + v)] * b[((w % 32) + (v * 32))]) + acc_Sum);
+    } 
+    c[w] = acc_Sum;
+  } 
+}
+
+DLL void hidet_launch_0(float * __restrict__ a, float * __restrict__ b, float * __restrict__ c) {
+  try {
+    int32_t b_1 = get_symbol_value("b");
+    hidet_matmul_compute_c_c8fe(a, b, c, b_1);
+  } catch (HidetException &e) { 
+    hidet_set_last_error(e.what());
+    return ;
+  }
+}
+
+DLL void hidet_get_input_shape(int32_t idx, int32_t * __restrict__ dims) {
+  try {
+    int32_t b = get_symbol_value("b");
+    if (idx == 0) {
+      dims[0] = b;
+      dims[1] = 16;
+    } 
+    if (idx == 1) {
+      dims[0] = 16;
+      dims[1] = 32;
+    } 
+  } catch (HidetException &e) { 
+    hidet_set_last_error(e.what());
+    return ;
+  }
+}
+
+DLL void hidet_get_output_shape(int32_t idx, int32_t * __restrict__ dims) {
+  try {
+    int32_t b = get_symbol_value("b");
+    if (idx == 0) {
+      dims[0] = b;
+      dims[1] = 32;
+    } 
+  } catch (HidetException &e) { 
+    hidet_set_last_error(e.what());
+    return ;
+  }
+}
@@ -0,0 +1,56 @@
+#include <stdint.h>
+#include <math.h>
+#include <hidet/runtime/symbols.h>
+#include <hidet/runtime/memory_planner.h>
+#include <hidet/runtime/cpu/context.h>
+#include <hidet/runtime/cpu/float32.h>
+#include <hidet/runtime/logging.h>
+#include <hidet/runtime/int_fastdiv.h>
+
+
+static void hidet_reduce_max_compute_y_b0d0(float * __restrict__ x, float * __restrict__ y, int32_t b) {
+  #pragma omp parallel for
+  for (int32_t w = 0; (w < b); w = (w + 1)) {
+    float acc_Max = -3.4028234663852886e+38f;
+    for (int32_t v = 0; (v < 32); v = (v + 1)) {
+      acc_Max = fmaxf(acc_Max, x[((w * 32) + v)]);
+    } 
+    y[w] = acc_Max;
+  } 
+}
+
+DLL void hidet_launch_0(float * __restrict__ x, float * __restrict__ y) {
+  try {
+    int32_t b = get_symbol_value("b");
+    hidet_reduce_max_compute_y_b0d0(x, y, b);
+  } catch (HidetException &e) { 
+    hidet_set_last_error(e.what());
+    return ;
+  }
+}
+
+DLL void hidet_get_input_shape(int32_t idx, int32_t * __restrict__ dims) {
+  try {
+    int32_t b = get_symbol_value("b");
+    if (idx == 0) {
+      dims[0] = b;
+      dims[1] = 32;
+    } 
+  } catch (HidetException &e) { 
+    hidet_set_last_error(e.what());
+    return ;
+  }
+}
+
+DLL void hidet_get_output_shape(int32_t idx, int32_t * __restrict__ dims) {
+  try {
+    int32_t b = get_symbol_value("b");
+    if (idx == 0) {
+      dims[0] = b;
+      dims[1] = 1;
+    } 
+  } catch (HidetException &e) { 
+    hidet_set_last_error(e.what());
+    return ;
+  }
+}
@@ -0,0 +1,99 @@
+#include <stdint.h>
+#include <math.h>
+#include <hidet/runtime/symbols.h>
+#include <hidet/runtime/memory_planner.h>
+#include <hidet/runtime/cpu/context.h>
+#include <hidet/runtime/cpu/float32.h>
+#include <hidet/runtime/logging.h>
+#include <hidet/runtime/int_fastdiv.h>
+
+uint8_t *cpu_workspace;
+uint8_t *cuda_workspace;
+uint8_t *hip_workspace;
+void* weights[2];
+
+DLL void hidet_launch(void * __restrict__ inputs, void * __restrict__ outputs, void* * __restrict__ p_kernels) {
+  try {
+    void (*hidet_k0_Matmul)(void*, void*, void*) = ((void (*)( void*, void*, void*))(p_kernels[0]));
+    hidet_k0_Matmul(inputs, weights[0], cpu_workspace);
+    void (*hidet_k1_Relu)(void*, void*) = ((void (*)( void*, void*))(p_kernels[1]));
+    hidet_k1_Relu(cpu_workspace, (cpu_workspace + int64_t(512ll)));
+    void (*hidet_k2_Matmul)(void*, void*, void*) = ((void (*)( void*, void*, void*))(p_kernels[2]));
+    hidet_k2_Matmul((cpu_workspace + int64_t(512ll)), weights[1], cpu_workspace);
+    void (*hidet_k3_Relu)(void*, void*) = ((void (*)( void*, void*))(p_kernels[3]));
+    hidet_k3_Relu(inputs, (cpu_workspace + int64_t(256ll)));
+    void (*hidet_k4_Add)(void*, void*, void*) = ((void (*)( void*, void*, void*))(p_kernels[4]));
+    hidet_k4_Add(cpu_workspace, (cpu_workspace + int64_t(256ll)), (cpu_workspace + int64_t(512ll)));
+    void (*hidet_k5_ReduceMax)(void*, void*) = ((void (*)( void*, void*))(p_kernels[5]));
+    hidet_k5_ReduceMax((cpu_workspace + int64_t(512ll)), (cpu_workspace + int64_t(256ll)));
+    void (*hidet_k6_Subtract)(void*, void*, void*) = ((void (*)( void*, void*, void*))(p_kernels[6]));
+    hidet_k6_Subtract((cpu_workspace + int64_t(512ll)), (cpu_workspace + int64_t(256ll)), cpu_workspace);
+    void (*hidet_k7_Exp)(void*, void*) = ((void (*)( void*, void*))(p_kernels[7]));
+    hidet_k7_Exp(cpu_workspace, (cpu_workspace + int64_t(256ll)));
+    void (*hidet_k8_ReduceSum)(void*, void*) = ((void (*)( void*, void*))(p_kernels[8]));
+    hidet_k8_ReduceSum((cpu_workspace + int64_t(256ll)), cpu_workspace);
+    void (*hidet_k9_Divide)(void*, void*, void*) = ((void (*)( void*, void*, void*))(p_kernels[9]));
+    hidet_k9_Divide((cpu_workspace + int64_t(256ll)), cpu_workspace, outputs);
+  } catch (HidetException &e) { 
+    hidet_set_last_error(e.what());
+    return ;
+  }
+}
+
+DLL void hidet_init(int32_t num_weights, void* * __restrict__ p_weights) {
+  try {
+    assert((num_weights == 2));  // Expect 2 weights
+    weights[0] = p_weights[0];
+    weights[1] = p_weights[1];
+  } catch (HidetException &e) { 
+    hidet_set_last_error(e.what());
+    return ;
+  }
+}
+
+DLL void hidet_get_output_shape(int32_t index, int32_t * __restrict__ dims) {
+  try {
+    if (0 == index) {
+      dims[0] = 4;
+      dims[1] = 16;
+    } 
+  } catch (HidetException &e) { 
+    hidet_set_last_error(e.what());
+    return ;
+  }
+}
+
+DLL void hidet_get_workspace_size(int64_t * __restrict__ sizes) {
+  try {
+    int64_t cpu_size = int64_t(0ll);
+    int64_t cuda_size = int64_t(0ll);
+    int64_t hip_size = int64_t(0ll);
+    cpu_size = int64_t(1024ll);
+    cuda_size = int64_t(0ll);
+    hip_size = int64_t(0ll);
+    sizes[0] = cpu_size;
+    sizes[1] = cuda_size;
+    sizes[2] = hip_size;
+  } catch (HidetException &e) { 
+    hidet_set_last_error(e.what());
+    return ;
+  }
+}
+
+DLL void hidet_set_workspace(int32_t idx, void * __restrict__ space) {
+  try {
+    assert(((0 <= idx) && (idx < 3)));  // Invalid workspace index
+    if (idx == 0) {
+      cpu_workspace = ((uint8_t*)(space));
+    } else {
+      if (idx == 1) {
+        cuda_workspace = ((uint8_t*)(space));
+      } else {
+        hip_workspace = ((uint8_t*)(space));
+      } 
+    } 
+  } catch (HidetException &e) { 
+    hidet_set_last_error(e.what());
+    return ;
+  }
+}
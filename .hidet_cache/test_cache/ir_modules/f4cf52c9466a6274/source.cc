@@ -0,0 +1,20 @@
+#include <stdint.h>
+#include <math.h>
+#include <hidet/runtime/symbols.h>
+#include <hidet/runtime/memory_planner.h>
+#include <hidet/runtime/cpu/context.h>
+#include <hidet/runtime/cpu/float32.h>
+#include <hidet/runtime/logging.h>
+#include <hidet/runtime/int_fastdiv.h>
+
+
+DLL void hidet_launch() {
+  try {
+    void *ptr = ((void*)(get_ptr_symbol_value("ptr")));
+    printf("a = %p\n", ptr);
+    assert((ptr == (void*)1231231));
+  } catch (HidetException &e) { 
+    hidet_set_last_error(e.what());
+    return ;
+  }
+}
@@ -0,0 +1,60 @@
+#include <stdint.h>
+#include <math.h>
+#include <hidet/runtime/symbols.h>
+#include <hidet/runtime/memory_planner.h>
+#include <hidet/runtime/cpu/context.h>
+#include <hidet/runtime/cpu/float32.h>
+#include <hidet/runtime/logging.h>
+#include <hidet/runtime/int_fastdiv.h>
+
+
+static void hidet_add_compute_z_387c(float * __restrict__ x, float * __restrict__ y, float * __restrict__ z, int32_t seq) {
+  #pragma omp parallel for
+  for (int32_t w = 0; (w < ((seq * 12) * seq)); w = (w + 1)) {
+    z[((((w / seq) % seq) * seq) + ((w / (seq * seq)) * (seq * seq)) + (w % seq))] = (x[((((w / seq) % seq) * seq) + ((w / (seq * seq)) * (seq * seq)) + (w % seq))] + y[((((w / seq) % seq) * seq) + (w % seq))]);
+  } 
+}
+
+DLL void hidet_launch_0(float * __restrict__ x, float * __restrict__ y, float * __restrict__ z) {
+  try {
+    int32_t seq = get_symbol_slot_value("seq");
+    hidet_add_compute_z_387c(x, y, z, seq);
+  } catch (HidetException &e) { 
+    hidet_set_last_error(e.what());
+    return ;
+  }
+}
+
+DLL void hidet_get_input_shape(int32_t idx, int32_t * __restrict__ dims) {
+  try {
+    int32_t seq = get_symbol_slot_value("seq");
+    if (idx == 0) {
+      dims[0] = 1;
+      dims[1] = 12;
+      dims[2] = seq;
+      dims[3] = seq;
+    } 
+    if (idx == 1) {
+      dims[0] = seq;
+      dims[1] = seq;
+    } 
+  } catch (HidetException &e) { 
+    hidet_set_last_error(e.what());
+    return ;
+  }
+}
+
+DLL void hidet_get_output_shape(int32_t idx, int32_t * __restrict__ dims) {
+  try {
+    int32_t seq = get_symbol_slot_value("seq");
+    if (idx == 0) {
+      dims[0] = 1;
+      dims[1] = 12;
+      dims[2] = seq;
+      dims[3] = seq;
+    } 
+  } catch (HidetException &e) { 
+    hidet_set_last_error(e.what());
+    return ;
+  }
+}
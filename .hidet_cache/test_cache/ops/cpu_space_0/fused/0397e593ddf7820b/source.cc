@@ -0,0 +1,82 @@
+#include <stdint.h>
+#include <math.h>
+#include <hidet/runtime/symbols.h>
+#include <hidet/runtime/memory_planner.h>
+#include <hidet/runtime/cpu/context.h>
+#include <hidet/runtime/cpu/float32.h>
+#include <hidet/runtime/logging.h>
+#include <hidet/runtime/int_fastdiv.h>
+
+
+static void hidet_fused_compute_c_0397(float * __restrict__ data, int32_t * __restrict__ indices, float * __restrict__ data_1, float * __restrict__ b, float * __restrict__ c, int32_t seq) {
+  #pragma omp parallel for
+  for (int32_t w = 0; (w < (seq * 2304)); w = (w + 1)) {
+    float acc_Sum = 0.0f;
+    for (int32_t v = 0; (v < 768); v = (v + 1)) {
+      acc_Sum = (((data[((((indices[(w / 2304)] < 0) ? (indices[(w / 2304)] + 50257) : indices[(w / 2304)]) * 768) + v)] + data_1[(((((w / 2304) < 0) ? ((w / 2304) + 1024) : (w / 2304)) * 768) + v)]) * b[((w % 2304) + (v * 2304))]) + acc_Sum);
+    } 
+    c[w] = acc_Sum;
+  } 
+}
+
+static void hidet_fused_compute_y_0397(float * __restrict__ c, float * __restrict__ y, float * __restrict__ y_1, int32_t seq) {
+  #pragma omp parallel for
+  for (int32_t w = 0; (w < (seq * 2304)); w = (w + 1)) {
+    y_1[((((w / (seq * 64)) % 12) * (seq * 64)) + (((w / 64) % seq) * 64) + ((w / (seq * 768)) * (seq * 768)) + (w % 64))] = (c[((((w / (seq * 64)) % 12) * 64) + (((w / (seq * 768)) % 3) * 768) + (w % 64) + ((((w / 64) % seq) % seq) * 2304))] + y[(((((w / (seq * 64)) % 12) * 64) + (((w / (seq * 768)) % 3) * 768) + (w % 64)) % 2304)]);
+  } 
+}
+
+DLL void hidet_launch_0(float * __restrict__ b, float * __restrict__ y, float * __restrict__ data, int32_t * __restrict__ indices, float * __restrict__ data_1, float * __restrict__ y_1) {
+  try {
+    int32_t seq = get_symbol_slot_value("seq");
+    uint8_t *buffer = ((uint8_t*)(request_cpu_workspace((((((seq * 9216) - 9216) + 9343) / 128) * 128), false)));
+    float *c = ((float*)((&buffer[int64_t(0ll)])));
+    hidet_fused_compute_c_0397(data, indices, data_1, b, c, seq);
+    hidet_fused_compute_y_0397(c, y, y_1, seq);
+  } catch (HidetException &e) { 
+    hidet_set_last_error(e.what());
+    return ;
+  }
+}
+
+DLL void hidet_get_input_shape(int32_t idx, int32_t * __restrict__ dims) {
+  try {
+    int32_t seq = get_symbol_slot_value("seq");
+    if (idx == 0) {
+      dims[0] = 768;
+      dims[1] = 2304;
+    } 
+    if (idx == 1) {
+      dims[0] = 2304;
+    } 
+    if (idx == 2) {
+      dims[0] = 50257;
+      dims[1] = 768;
+    } 
+    if (idx == 3) {
+      dims[0] = seq;
+    } 
+    if (idx == 4) {
+      dims[0] = 1024;
+      dims[1] = 768;
+    } 
+  } catch (HidetException &e) { 
+    hidet_set_last_error(e.what());
+    return ;
+  }
+}
+
+DLL void hidet_get_output_shape(int32_t idx, int32_t * __restrict__ dims) {
+  try {
+    int32_t seq = get_symbol_slot_value("seq");
+    if (idx == 0) {
+      dims[0] = 3;
+      dims[1] = 12;
+      dims[2] = seq;
+      dims[3] = 64;
+    } 
+  } catch (HidetException &e) { 
+    hidet_set_last_error(e.what());
+    return ;
+  }
+}
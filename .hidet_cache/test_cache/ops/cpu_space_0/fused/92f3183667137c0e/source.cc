@@ -0,0 +1,70 @@
+#include <stdint.h>
+#include <math.h>
+#include <hidet/runtime/symbols.h>
+#include <hidet/runtime/memory_planner.h>
+#include <hidet/runtime/cpu/context.h>
+#include <hidet/runtime/cpu/float32.h>
+#include <hidet/runtime/logging.h>
+#include <hidet/runtime/int_fastdiv.h>
+
+
+static void hidet_fused_compute_c_92f3(float * __restrict__ data, float * __restrict__ c, int32_t seq) {
+  #pragma omp parallel for
+  for (int32_t w = 0; (w < ((seq * 12) * seq)); w = (w + 1)) {
+    float acc_Sum = 0.0f;
+    for (int32_t v = 0; (v < 64); v = (v + 1)) {
+      acc_Sum = ((data[((((w / seq) % seq) * 64) + ((w / (seq * seq)) * (seq * 64)) + v)] * data[((seq * 768) + (((w % seq) % seq) * 64) + (((w / (seq * seq)) % 12) * (seq * 64)) + v)]) + acc_Sum);
+    } 
+    c[((((w / seq) % seq) * seq) + ((w / (seq * seq)) * (seq * seq)) + (w % seq))] = acc_Sum;
+  } 
+}
+
+static void hidet_fused_compute_z_92f3(float * __restrict__ c, float * __restrict__ z, int32_t seq) {
+  #pragma omp parallel for
+  for (int32_t w = 0; (w < ((seq * 12) * seq)); w = (w + 1)) {
+    z[((((w / seq) % seq) * seq) + ((w / (seq * seq)) * (seq * seq)) + (w % seq))] = (((1.0f - (((w % seq) <= ((w / seq) % seq)) ? 1.0f : 0.0f)) * -10000000000.0f) + (c[((((w / seq) % seq) * seq) + ((w / (seq * seq)) * (seq * seq)) + (w % seq))] / 8.0f));
+  } 
+}
+
+DLL void hidet_launch_0(float * __restrict__ data, float * __restrict__ z) {
+  try {
+    int32_t seq = get_symbol_slot_value("seq");
+    uint8_t *buffer = ((uint8_t*)(request_cpu_workspace(((((((((seq - 1) * seq) * 4) + ((seq * seq) * 44) + (seq * 4)) - 4) + 131) / 128) * 128), false)));
+    float *c = ((float*)((&buffer[int64_t(0ll)])));
+    hidet_fused_compute_c_92f3(data, c, seq);
+    hidet_fused_compute_z_92f3(c, z, seq);
+  } catch (HidetException &e) { 
+    hidet_set_last_error(e.what());
+    return ;
+  }
+}
+
+DLL void hidet_get_input_shape(int32_t idx, int32_t * __restrict__ dims) {
+  try {
+    int32_t seq = get_symbol_slot_value("seq");
+    if (idx == 0) {
+      dims[0] = 3;
+      dims[1] = 12;
+      dims[2] = seq;
+      dims[3] = 64;
+    } 
+  } catch (HidetException &e) { 
+    hidet_set_last_error(e.what());
+    return ;
+  }
+}
+
+DLL void hidet_get_output_shape(int32_t idx, int32_t * __restrict__ dims) {
+  try {
+    int32_t seq = get_symbol_slot_value("seq");
+    if (idx == 0) {
+      dims[0] = 1;
+      dims[1] = 12;
+      dims[2] = seq;
+      dims[3] = seq;
+    } 
+  } catch (HidetException &e) { 
+    hidet_set_last_error(e.what());
+    return ;
+  }
+}
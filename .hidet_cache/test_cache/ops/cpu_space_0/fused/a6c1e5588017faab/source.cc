@@ -0,0 +1,72 @@
+#include <stdint.h>
+#include <math.h>
+#include <hidet/runtime/symbols.h>
+#include <hidet/runtime/memory_planner.h>
+#include <hidet/runtime/cpu/context.h>
+#include <hidet/runtime/cpu/float32.h>
+#include <hidet/runtime/logging.h>
+#include <hidet/runtime/int_fastdiv.h>
+
+
+static void hidet_fused_compute_c_a6c1(float * __restrict__ x, float * __restrict__ y, float * __restrict__ data, float * __restrict__ c, int32_t seq) {
+  #pragma omp parallel for
+  for (int32_t w = 0; (w < (seq * 768)); w = (w + 1)) {
+    float acc_Sum = 0.0f;
+    for (int32_t v = 0; (v < seq); v = (v + 1)) {
+      acc_Sum = (((x[((((w / 64) % seq) * seq) + ((w / (seq * 64)) * (seq * seq)) + v)] / y[(((w / (seq * 64)) * seq) + ((w / 64) % seq))]) * data[((seq * 1536) + ((w / (seq * 64)) * (seq * 64)) + (w % 64) + (v * 64))]) + acc_Sum);
+    } 
+    c[((((w / 64) % seq) * 64) + ((w / (seq * 64)) * (seq * 64)) + (w % 64))] = acc_Sum;
+  } 
+}
+
+DLL void hidet_launch_0(float * __restrict__ x, float * __restrict__ y, float * __restrict__ data, float * __restrict__ c) {
+  try {
+    int32_t seq = get_symbol_slot_value("seq");
+    hidet_fused_compute_c_a6c1(x, y, data, c, seq);
+  } catch (HidetException &e) { 
+    hidet_set_last_error(e.what());
+    return ;
+  }
+}
+
+DLL void hidet_get_input_shape(int32_t idx, int32_t * __restrict__ dims) {
+  try {
+    int32_t seq = get_symbol_slot_value("seq");
+    if (idx == 0) {
+      dims[0] = 1;
+      dims[1] = 12;
+      dims[2] = seq;
+      dims[3] = seq;
+    } 
+    if (idx == 1) {
+      dims[0] = 1;
+      dims[1] = 12;
+      dims[2] = seq;
+      dims[3] = 1;
+    } 
+    if (idx == 2) {
+      dims[0] = 3;
+      dims[1] = 12;
+      dims[2] = seq;
+      dims[3] = 64;
+    } 
+  } catch (HidetException &e) { 
+    hidet_set_last_error(e.what());
+    return ;
+  }
+}
+
+DLL void hidet_get_output_shape(int32_t idx, int32_t * __restrict__ dims) {
+  try {
+    int32_t seq = get_symbol_slot_value("seq");
+    if (idx == 0) {
+      dims[0] = 1;
+      dims[1] = 12;
+      dims[2] = seq;
+      dims[3] = 64;
+    } 
+  } catch (HidetException &e) { 
+    hidet_set_last_error(e.what());
+    return ;
+  }
+}
@@ -0,0 +1,3 @@
+#!/bin/bash
+
+/usr/bin/g++ -I/root/package/include -L/root/package/build/lib -O3 -std=c++11 -mavx2 -m64 -ffast-math -march=sapphirerapids -fPIC -fopenmp -Wl,--no-as-needed -lhidet_runtime -shared  /root/package/.hidet_cache/test_cache/ops/cpu_space_0/rearrange/c0fea47b8bcf5cbd/source.cc -o /root/package/.hidet_cache/test_cache/ops/cpu_space_0/rearrange/c0fea47b8bcf5cbd/lib.so
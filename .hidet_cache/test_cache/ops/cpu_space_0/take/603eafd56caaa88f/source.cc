@@ -0,0 +1,52 @@
+#include <stdint.h>
+#include <math.h>
+#include <hidet/runtime/symbols.h>
+#include <hidet/runtime/memory_planner.h>
+#include <hidet/runtime/cpu/context.h>
+#include <hidet/runtime/cpu/float32.h>
+#include <hidet/runtime/logging.h>
+#include <hidet/runtime/int_fastdiv.h>
+
+
+static void hidet_take_compute_output_603e(float * __restrict__ data, int32_t * __restrict__ indices, float * __restrict__ output) {
+  #pragma omp parallel for
+  for (int32_t w = 0; (w < 2304); w = (w + 1)) {
+    output[w] = data[((((indices[(w / 768)] < 0) ? (indices[(w / 768)] + 50257) : indices[(w / 768)]) * 768) + (w % 768))];
+  } 
+}
+
+DLL void hidet_launch_0(float * __restrict__ data, int32_t * __restrict__ indices, float * __restrict__ output) {
+  try {
+    hidet_take_compute_output_603e(data, indices, output);
+  } catch (HidetException &e) { 
+    hidet_set_last_error(e.what());
+    return ;
+  }
+}
+
+DLL void hidet_get_input_shape(int32_t idx, int32_t * __restrict__ dims) {
+  try {
+    if (idx == 0) {
+      dims[0] = 50257;
+      dims[1] = 768;
+    } 
+    if (idx == 1) {
+      dims[0] = 3;
+    } 
+  } catch (HidetException &e) { 
+    hidet_set_last_error(e.what());
+    return ;
+  }
+}
+
+DLL void hidet_get_output_shape(int32_t idx, int32_t * __restrict__ dims) {
+  try {
+    if (idx == 0) {
+      dims[0] = 3;
+      dims[1] = 768;
+    } 
+  } catch (HidetException &e) { 
+    hidet_set_last_error(e.what());
+    return ;
+  }
+}
@@ -0,0 +1,47 @@
+#include <stdint.h>
+#include <math.h>
+#include <hidet/runtime/symbols.h>
+#include <hidet/runtime/memory_planner.h>
+#include <hidet/runtime/cpu/context.h>
+#include <hidet/runtime/cpu/float32.h>
+#include <hidet/runtime/logging.h>
+#include <hidet/runtime/int_fastdiv.h>
+
+
+static void hidet_tri_compute_out_a6a9(float * __restrict__ out, int32_t seq) {
+  #pragma omp parallel for
+  for (int32_t w = 0; (w < (seq * seq)); w = (w + 1)) {
+    out[(((w / seq) * seq) + (w % seq))] = (((w % seq) <= (w / seq)) ? 1.0f : 0.0f);
+  } 
+}
+
+DLL void hidet_launch_0(float * __restrict__ out) {
+  try {
+    int32_t seq = get_symbol_slot_value("seq");
+    hidet_tri_compute_out_a6a9(out, seq);
+  } catch (HidetException &e) { 
+    hidet_set_last_error(e.what());
+    return ;
+  }
+}
+
+DLL void hidet_get_input_shape(int32_t idx, int32_t * __restrict__ dims) {
+  try {
+  } catch (HidetException &e) { 
+    hidet_set_last_error(e.what());
+    return ;
+  }
+}
+
+DLL void hidet_get_output_shape(int32_t idx, int32_t * __restrict__ dims) {
+  try {
+    int32_t seq = get_symbol_slot_value("seq");
+    if (idx == 0) {
+      dims[0] = seq;
+      dims[1] = seq;
+    } 
+  } catch (HidetException &e) { 
+    hidet_set_last_error(e.what());
+    return ;
+  }
+}
@@ -15,6 +15,44 @@
 #include <map>
 #include <string>
 #include <hidet/runtime/common.h>
+#include <hidet/runtime/logging.h>
+
+// The integer symbols are stored in slots of the symbol table. A symbol is registered once to get its slot, then its
+// value is read and written through the slot without looking up its name.
+#define HIDET_MAX_NUM_SYMBOLS 1024
+
+DLL int32_t hidet_symbol_table[HIDET_MAX_NUM_SYMBOLS];
+
+// Whether the symbol in each slot has been set since the symbol table was reset.
+DLL bool hidet_symbol_is_set[HIDET_MAX_NUM_SYMBOLS];
+
+// Check the slot of a symbol read by get_symbol_slot_value. The slot is negative if the symbol could not be
+// registered (e.g., the symbol table is full).
+inline int32_t check_symbol_slot(int32_t slot, const char *symbol_name) {
+    if (slot < 0) {
+        LOG(ERROR) << "Symbol " << symbol_name << " is not registered, at most " << HIDET_MAX_NUM_SYMBOLS
+                   << " symbols are supported";
+    }
+    if (!hidet_symbol_is_set[slot]) {
+        LOG(ERROR) << "Symbol " << symbol_name << " not found";
+    }
+    return slot;
+}
+
+// Read the value of a symbol in generated code. Each call site registers the symbol on its first execution, and reads
+// the symbol table directly afterwards. The slots are assigned at runtime, so they can not be embedded into the
+// compiled modules that might be loaded by other processes. Reading a symbol that has not been set is an error.
+#define get_symbol_slot_value(symbol_name)                        \
+    (hidet_symbol_table[check_symbol_slot([]() {                  \
+        static const int32_t slot = register_symbol(symbol_name); \
+        return slot;                                              \
+    }(), symbol_name)])
+
+DLL int32_t register_symbol(const char *symbol_name);
+
+DLL void set_symbol_values(int32_t num_symbols, const int32_t *slots, const int32_t *values);
+
+DLL void get_symbol_values(int32_t num_symbols, const int32_t *slots, int32_t *values);
 
 DLL void reset_symbol_table();
 
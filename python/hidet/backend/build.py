@@ -23,6 +23,8 @@ import hidet.cuda
 from hidet.libinfo import get_include_dirs
 from hidet.ffi.ffi import library_paths
 from hidet.ir.target import Target
+from hidet.backend.compile_cache import compile_cache_key, load_cached_object, store_cached_object
+from hidet.backend.precompiled_header import get_precompiled_header
 
 
 class CompilationFailed(Exception):
@@ -41,6 +43,18 @@ class SourceCompiler:
     The base class of source compiler.
     """
 
+    def get_compile_command(
+        self,
+        src_path: str,
+        out_lib_path: str,
+        target: Target,
+        include_dirs: Sequence[str] = (),
+        linking_dirs: Sequence[str] = (),
+        linking_libs: Sequence[str] = (),
+        object_files: Sequence[str] = (),
+    ) -> List[str]:
+        raise NotImplementedError()
+
     def compile(
         self,
         src_path: str,
@@ -51,7 +65,35 @@ class SourceCompiler:
         linking_libs: Sequence[str] = (),
         object_files: Sequence[str] = (),
     ) -> None:
-        raise NotImplementedError()
+        command: str = " ".join(
+            self.get_compile_command(
+                src_path,
+                out_lib_path,
+                target,
+                include_dirs=include_dirs,
+                linking_dirs=linking_dirs,
+                linking_libs=linking_libs,
+                object_files=object_files,
+            )
+        )
+
+        # identical generated sources compiled with the same command produce the same library, reuse it if we
+        # have compiled the same source before (e.g., by another task or another tuning candidate)
+        cache_key: Optional[str] = None
+        if hidet.option.get_cache_compiled_objects():
+            cache_key = compile_cache_key(command, src_path, out_lib_path, object_files)
+            if load_cached_object(cache_key, out_lib_path):
+                with open(os.path.join(os.path.dirname(out_lib_path), 'compile.sh'), 'w') as f:
+                    f.write("#!/bin/bash\n\n")
+                    f.write("# reused the compiled object with key {}\n".format(cache_key))
+                    f.write(command)
+                    f.write("\n")
+                return
+
+        self.run_compile_command(command, src_path, out_lib_path)
+
+        if cache_key is not None:
+            store_cached_object(cache_key, out_lib_path)
 
     def run_compile_command(self, command: str, src_path, out_lib_path: str):
         try:
@@ -120,7 +162,7 @@ class NVCC(SourceCompiler):
                 return path
         raise FileNotFoundError('Can not find nvcc compiler.')
 
-    def compile(
+    def get_compile_command(
         self,
         src_path: str,
         out_lib_path: str,
@@ -129,7 +171,7 @@ class NVCC(SourceCompiler):
         linking_dirs: Sequence[str] = (),
         linking_libs: Sequence[str] = (),
         object_files: Sequence[str] = (),
-    ) -> None:
+    ) -> List[str]:
         if len(object_files) > 0 and out_lib_path.endswith('.o'):
             raise ValueError('Can not compile multiple objects into a single object file.')
 
@@ -200,7 +242,7 @@ class NVCC(SourceCompiler):
             out_lib_path,
         ]
 
-        self.run_compile_command(" ".join(command), src_path, out_lib_path)
+        return command
 
 
 class HIPCC(SourceCompiler):
@@ -223,7 +265,7 @@ class HIPCC(SourceCompiler):
                 return path
         raise FileNotFoundError('Can not find hipcc compiler.')
 
-    def compile(
+    def get_compile_command(
         self,
         src_path: str,
         out_lib_path: str,
@@ -232,7 +274,7 @@ class HIPCC(SourceCompiler):
         linking_dirs: Sequence[str] = (),
         linking_libs: Sequence[str] = (),
         object_files: Sequence[str] = (),
-    ) -> None:
+    ) -> List[str]:
         if len(object_files) > 0 and out_lib_path.endswith('.o'):
             raise ValueError('Can not compile multiple objects into a single object file.')
 
@@ -279,7 +321,7 @@ class HIPCC(SourceCompiler):
             out_lib_path,
         ]
 
-        self.run_compile_command(" ".join(command), src_path, out_lib_path)
+        return command
 
 
 class GCC(SourceCompiler):
@@ -297,7 +339,7 @@ class GCC(SourceCompiler):
             return path
         raise FileNotFoundError('Can not find g++ compiler.')
 
-    def compile(
+    def get_compile_command(
         self,
         src_path: str,
         out_lib_path: str,
@@ -306,7 +348,7 @@ class GCC(SourceCompiler):
         linking_dirs: Sequence[str] = (),
         linking_libs: Sequence[str] = (),
         object_files: Sequence[str] = (),
-    ) -> None:
+    ) -> List[str]:
         if len(object_files) > 0 and out_lib_path.endswith('.o'):
             raise ValueError('Can not compile multiple objects into a single object file.')
 
@@ -315,14 +357,8 @@ class GCC(SourceCompiler):
         else:
             arch = hidet.option.cpu.get_arch()
 
-        command = [
-            # the path to nvcc compiler
-            self.gcc_path,
-            # the included directories.
-            *['-I{}'.format(include_dir) for include_dir in self.include_dirs + list(include_dirs)],
-            # the library directories.
-            *['-L{}'.format(library_dir) for library_dir in self.library_dirs + list(linking_dirs)],
-            *['-l{}'.format(library) for library in linking_libs],
+        include_flags = ['-I{}'.format(include_dir) for include_dir in self.include_dirs + list(include_dirs)]
+        compile_flags = [
             # apply -O3 optimization.
             '-O3',
             # use c++11 standard
@@ -336,6 +372,27 @@ class GCC(SourceCompiler):
             '-fPIC',
             # enable OpenMP.
             '-fopenmp',
+        ]
+
+        # use the precompiled header of the headers included by the generated source, if enabled
+        pch_flags = []
+        if hidet.option.get_precompiled_header() and src_path.endswith('.cc'):
+            pch_path = get_precompiled_header(src_path, [self.gcc_path, *include_flags, *compile_flags])
+            if pch_path is not None:
+                pch_flags = ['-include', pch_path]
+
+        command = [
+            # the path to nvcc compiler
+            self.gcc_path,
+            # the included directories.
+            *include_flags,
+            # the library directories.
+            *['-L{}'.format(library_dir) for library_dir in self.library_dirs + list(linking_dirs)],
+            *['-l{}'.format(library) for library in linking_libs],
+            # the compilation flags, which must be consistent with the ones used to build the precompiled header.
+            *compile_flags,
+            # the precompiled header.
+            *pch_flags,
             # link the hidet runtime, all APIs for communication between kernels and host system are in hidet runtime.
             '-Wl,--no-as-needed -lhidet_runtime',
             # generate shared library (lib.so).
@@ -349,7 +406,7 @@ class GCC(SourceCompiler):
             out_lib_path,
         ]
 
-        self.run_compile_command(" ".join(command), src_path, out_lib_path)
+        return command
 
 
 def compile_source(
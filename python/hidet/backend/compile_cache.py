@@ -0,0 +1,196 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Content-addressed cache of compiled objects and shared libraries.
+
+Different tasks (or different tuning candidates of the same task) frequently lower to byte-identical source code.
+This module stores the output of each compiler invocation under a key derived from the content of the generated
+source, the compiler command (compiler path, flags, target arch), the content of the hidet runtime headers and the
+content of the linked object files, so that identical compilations are only performed once. The cached outputs are
+stored in ``<cache_dir>/objects/<key[:2]>/<key><ext>`` and copied to the output path when reused (the libraries of
+different tasks must not share an inode, as the dynamic loader identifies the loaded libraries by their inode).
+"""
+from typing import Sequence, Dict, Tuple
+import os
+import shutil
+import hashlib
+import tempfile
+import threading
+
+import hidet.option
+from hidet.libinfo import get_include_dirs
+from hidet.utils.counters import counters
+
+_include_digest_lock = threading.Lock()
+# (include dir, [(relative path, size, mtime)]) -> digest of the header contents
+_include_digests: Dict[Tuple[str, Tuple[Tuple[str, int, int], ...]], str] = {}
+
+
+def _file_digest(path: str) -> str:
+    sha = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
+def include_dir_digest(include_dir: str) -> str:
+    """
+    Get the digest of the content of all the headers in an include directory.
+
+    The digest is memoized on the size and the modification time of the headers, so that the headers are only read
+    again when any of them has changed.
+
+    Parameters
+    ----------
+    include_dir: str
+        The include directory.
+
+    Returns
+    -------
+    ret: str
+        The hex digest of the relative paths and the content of the files in the directory.
+    """
+    stats = []
+    for root, dirs, files in os.walk(include_dir):
+        dirs.sort()
+        for name in sorted(files):
+            path = os.path.join(root, name)
+            st = os.stat(path)
+            stats.append((os.path.relpath(path, include_dir), st.st_size, st.st_mtime_ns))
+    memo_key = (include_dir, tuple(stats))
+    with _include_digest_lock:
+        if memo_key in _include_digests:
+            return _include_digests[memo_key]
+    sha = hashlib.sha256()
+    for relpath, _, _ in stats:
+        sha.update(relpath.encode())
+        sha.update(_file_digest(os.path.join(include_dir, relpath)).encode())
+    digest = sha.hexdigest()
+    with _include_digest_lock:
+        _include_digests[memo_key] = digest
+    return digest
+
+
+def compile_cache_dir() -> str:
+    return os.path.join(hidet.option.get_cache_dir(), 'objects')
+
+
+def compile_cache_key(command: str, src_path: str, out_lib_path: str, object_files: Sequence[str] = ()) -> str:
+    """
+    Get the key of a compilation.
+
+    The paths of the source file, the output library and the object files are specific to the working directory of
+    each task, thus we replace them with placeholders in the command and hash their content instead. The headers of
+    the hidet runtime included by the source are covered by the digest of the hidet include directories, see
+    :func:`include_dir_digest`.
+
+    Parameters
+    ----------
+    command: str
+        The compilation command.
+    src_path: str
+        The path to the source file.
+    out_lib_path: str
+        The path to the output library or object file.
+    object_files: Sequence[str]
+        The object files to be linked into the output library.
+
+    Returns
+    -------
+    ret: str
+        The hex digest used as the key of the compilation.
+    """
+    normalized = command.replace(src_path, '<source>').replace(out_lib_path, '<output>')
+    for i, object_file in enumerate(object_files):
+        normalized = normalized.replace(object_file, '<object_{}>'.format(i))
+
+    sha = hashlib.sha256()
+    sha.update(hidet.__version__.encode())
+    sha.update(normalized.encode())
+    sha.update(os.path.splitext(out_lib_path)[1].encode())
+    sha.update(_file_digest(src_path).encode())
+    for include_dir in get_include_dirs():
+        sha.update(include_dir_digest(include_dir).encode())
+    for object_file in object_files:
+        sha.update(_file_digest(object_file).encode())
+    return sha.hexdigest()
+
+
+def _cached_object_path(key: str, out_lib_path: str) -> str:
+    ext = os.path.splitext(out_lib_path)[1]
+    return os.path.join(compile_cache_dir(), key[:2], key + ext)
+
+
+def _copy_atomic(src: str, dst: str):
+    # copy into a temporary file next to the destination and rename it, so that a library loaded from the
+    # destination is never truncated while it is mapped by the dynamic loader
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(dst)), suffix='.tmp')
+    os.close(fd)
+    try:
+        shutil.copyfile(src, tmp_path)
+        os.replace(tmp_path, dst)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def load_cached_object(key: str, out_lib_path: str) -> bool:
+    """
+    Try to reuse the cached output of a compilation.
+
+    Parameters
+    ----------
+    key: str
+        The key of the compilation, see :func:`compile_cache_key`.
+    out_lib_path: str
+        The path to place the compiled library or object file at.
+
+    Returns
+    -------
+    ret: bool
+        True if the cached output exists and has been placed at `out_lib_path`, False otherwise.
+    """
+    cached_path = _cached_object_path(key, out_lib_path)
+    if not os.path.exists(cached_path):
+        counters['compile_cache']['miss'] += 1
+        return False
+    try:
+        _copy_atomic(cached_path, out_lib_path)
+        # update the last access time used by the cache eviction
+        os.utime(cached_path)
+    except OSError:
+        counters['compile_cache']['miss'] += 1
+        return False
+    counters['compile_cache']['hit'] += 1
+    return True
+
+
+def store_cached_object(key: str, out_lib_path: str):
+    """
+    Store the output of a compilation in the cache.
+
+    The file is first copied into a temporary file in the cache directory and then atomically renamed, so that
+    concurrent builders never observe a partially written entry.
+
+    Parameters
+    ----------
+    key: str
+        The key of the compilation, see :func:`compile_cache_key`.
+    out_lib_path: str
+        The path to the compiled library or object file.
+    """
+    cached_path = _cached_object_path(key, out_lib_path)
+    if os.path.exists(cached_path):
+        return
+    os.makedirs(os.path.dirname(cached_path), exist_ok=True)
+    _copy_atomic(out_lib_path, cached_path)
@@ -0,0 +1,116 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Precompiled headers for the generated sources.
+
+Each generated source starts with the ``#include`` directives of the hidet runtime headers (see
+``Codegen.require_headers``). Parsing these headers dominates the compilation time of small kernels. This module
+builds a precompiled header for each distinct set of included headers, header contents and compilation flags, and
+stores it in ``<cache_dir>/pch/<key>/hidet_pch.h.gch``. The compiler uses it via
+``-include <cache_dir>/pch/<key>/hidet_pch.h``.
+When the precompiled header is not usable, g++ silently falls back to parse the header itself, and the include
+guards of the headers make the includes in the generated source no-ops.
+"""
+from typing import List, Optional, Sequence
+import os
+import hashlib
+import logging
+import subprocess
+
+import hidet.option
+from hidet.libinfo import get_include_dirs
+from hidet.backend.compile_cache import include_dir_digest
+from hidet.utils.folder_lock import FolderLock
+
+logger = logging.Logger(__name__)
+logger.setLevel(logging.INFO)
+logger.addHandler(logging.StreamHandler())
+
+
+def _leading_includes(src_path: str) -> List[str]:
+    """
+    Get the ``#include`` directives at the beginning of the source file.
+    """
+    includes = []
+    with open(src_path, 'r') as f:
+        for line in f:
+            line = line.strip()
+            if line.startswith('#include'):
+                includes.append(line)
+            elif line:
+                break
+    return includes
+
+
+def get_precompiled_header(src_path: str, compile_flags: Sequence[str]) -> Optional[str]:
+    """
+    Get the precompiled header for the given source file, building it if it does not exist.
+
+    Parameters
+    ----------
+    src_path: str
+        The path to the generated source file.
+
+    compile_flags: Sequence[str]
+        The compiler path followed by the include and code generation flags. The precompiled header is only valid
+        for the compilations using the same flags, and is rebuilt when any header of the hidet runtime changes.
+
+    Returns
+    -------
+    ret: Optional[str]
+        The path to the header to pass to ``-include``, or None if the source does not include any header or the
+        precompiled header could not be built.
+    """
+    includes = _leading_includes(src_path)
+    if len(includes) == 0:
+        return None
+
+    sha = hashlib.sha256()
+    sha.update(hidet.__version__.encode())
+    sha.update(' '.join(compile_flags).encode())
+    sha.update('\n'.join(includes).encode())
+    for include_dir in get_include_dirs():
+        sha.update(include_dir_digest(include_dir).encode())
+    key = sha.hexdigest()
+
+    pch_dir = os.path.join(hidet.option.get_cache_dir(), 'pch', key)
+    header_path = os.path.join(pch_dir, 'hidet_pch.h')
+    gch_path = header_path + '.gch'
+    failed_path = os.path.join(pch_dir, 'failed.txt')
+    if os.path.exists(gch_path):
+        return header_path
+    if os.path.exists(failed_path):
+        return None
+
+    os.makedirs(pch_dir, exist_ok=True)
+    with FolderLock(pch_dir):
+        if os.path.exists(gch_path):
+            return header_path
+        if os.path.exists(failed_path):
+            return None
+        with open(header_path, 'w') as f:
+            f.write('\n'.join(includes))
+            f.write('\n')
+        tmp_gch_path = gch_path + '.tmp'
+        command = [*compile_flags, '-x', 'c++-header', header_path, '-o', tmp_gch_path]
+        result = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=False)
+        if result.returncode:
+            message = result.stderr.decode('utf-8', errors='replace').strip()
+            logger.warning('Failed to build the precompiled header, fall back to parse the headers:\n%s', message)
+            # do not try again for the same headers and flags
+            with open(failed_path, 'w') as f:
+                f.write(' '.join(command) + '\n' + message)
+            if os.path.exists(tmp_gch_path):
+                os.remove(tmp_gch_path)
+            return None
+        os.replace(tmp_gch_path, gch_path)
+    return header_path
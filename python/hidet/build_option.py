@@ -0,0 +1,525 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+The options of the kernel caches and the build pipeline.
+
+These options are registered along with the other hidet options, and their setters and getters are available as
+``hidet.option.<name>`` (e.g., :py:func:`hidet.option.cache_size_limit`).
+"""
+from typing import Optional, Tuple, Union
+
+
+def _current_context():
+    from hidet.option import OptionContext
+
+    return OptionContext.current()
+
+
+def register_build_options():
+    from hidet.option import register_option
+
+    register_option(
+        name='tuning_budget',
+        type_hint='Tuple[Optional[float], Optional[int], Optional[int]]',
+        description='The (seconds, candidates, plateau) budget of tuning a task. None means no limit.',
+        default_value=(None, None, None),
+    )
+    register_option(
+        name='cache_size_limit',
+        type_hint='Optional[int]',
+        description='The size limit of the cache directory in bytes. None for no limit.',
+        default_value=None,
+    )
+    register_option(
+        name='compiled_task_cache_capacity',
+        type_hint='int',
+        description='The maximum number of compiled tasks kept in memory.',
+        default_value=4096,
+    )
+    register_option(
+        name='compiled_graph_cache_capacity',
+        type_hint='int',
+        description='The maximum number of compiled graphs kept in memory.',
+        default_value=128,
+    )
+    register_option(
+        name='compiled_graph_cache_max_bytes',
+        type_hint='Optional[int]',
+        description='The maximum bytes of weights and workspace of the in-memory compiled graphs. None for no limit.',
+        default_value=None,
+    )
+    register_option(
+        name='cache_index',
+        type_hint='bool',
+        description='Whether to look up the operators in the index of the operator cache before reading their files.',
+        default_value=True,
+        choices=[True, False],
+    )
+    register_option(
+        name='reuse_graph_kernels',
+        type_hint='bool',
+        description='Whether to copy the kernels of the cached compiled graphs on misses of the operator cache.',
+        default_value=True,
+        choices=[True, False],
+    )
+    register_option(
+        name='cache_compiled_objects',
+        type_hint='bool',
+        description='Whether to reuse the compiled objects of identical generated sources across tasks.',
+        default_value=True,
+        choices=[True, False],
+    )
+    register_option(
+        name='precompiled_header',
+        type_hint='bool',
+        description='Whether to compile the generated cpu sources with a precompiled header of the runtime headers.',
+        default_value=False,
+        choices=[True, False],
+    )
+    register_option(
+        name='persistent_worker_pool',
+        type_hint='bool',
+        default_value=False,
+        description='Whether to reuse a long-lived pool of worker processes across parallel builds.',
+        choices=[True, False],
+    )
+    register_option(
+        name='nested_parallel_limit',
+        type_hint='int',
+        default_value=2,
+        description='The maximum number of local builds that can use nested (second level) parallelism at the same '
+        'time.',
+    )
+    register_option(
+        name='unity_build',
+        type_hint='bool',
+        default_value=False,
+        description='Whether to always compile the candidates of a tunable task in grouped translation units.',
+        choices=[True, False],
+    )
+    register_option(
+        name='unity_build_max_candidates',
+        type_hint='int',
+        default_value=32,
+        description='The maximum number of candidates compiled in a single translation unit.',
+    )
+    register_option(
+        name='compile_profile',
+        type_hint='bool',
+        default_value=False,
+        description='Whether to profile the lowering passes and write a report to the graph cache.',
+        choices=[True, False],
+    )
+
+
+def tuning_budget(seconds: Optional[float] = None, candidates: Optional[int] = None, plateau: Optional[int] = None):
+    """
+    Set the budget of tuning a task.
+
+    By default, all the candidates returned by the task implementation are compiled, and all of them are benchmarked
+    to pick the best one. With a budget, the candidates are compiled incrementally in their priority order (the
+    order given by the task implementation) until the budget is spent, and only the compiled candidates take part
+    in the benchmarking. The skipped candidates, and the candidates that are not benchmarked due to the plateau, are
+    recorded in the ``candidates.json`` file of the task.
+
+    A task built with part of its candidates is marked in the operator cache. The following builds with a budget reuse
+    it, while the builds without a budget rebuild the task with all its candidates.
+
+    Parameters
+    ----------
+    seconds: Optional[float]
+        The time budget (in seconds) to compile the candidates of a task. The candidates are compiled in batches
+        and no new batch is started after the budget is spent. None means no limit.
+    candidates: Optional[int]
+        The maximum number of candidates to compile for a task. None means no limit.
+    plateau: Optional[int]
+        Stop benchmarking the candidates after this number of consecutive candidates that do not improve the best
+        latency. None means to benchmark all compiled candidates.
+    """
+    if candidates is not None and candidates < 1:
+        raise ValueError('At least one candidate must be compiled, got {}.'.format(candidates))
+    if plateau is not None and plateau < 1:
+        raise ValueError('The plateau must be positive, got {}.'.format(plateau))
+    _current_context().set_option('tuning_budget', (seconds, candidates, plateau))
+
+
+def get_tuning_budget() -> Tuple[Optional[float], Optional[int], Optional[int]]:
+    """
+    Get the budget of tuning a task.
+
+    Returns
+    -------
+    ret: Tuple[Optional[float], Optional[int], Optional[int]]
+        The (seconds, candidates, plateau) budget of tuning a task. None means no limit.
+    """
+    return _current_context().get_option('tuning_budget')
+
+
+def cache_index(enabled: bool = True):
+    """
+    Whether to look up the operators in the index of the operator cache.
+
+    The index records the meta data of the compiled operators in a single sqlite database in the operator cache, so
+    that loading a cached operator does not need to check and read the small files in its directory. Disable it if
+    the cache directory is on a file system that does not support the file locks of sqlite.
+
+    Parameters
+    ----------
+    enabled: bool
+        Whether to use the index of the operator cache.
+    """
+    _current_context().set_option('cache_index', enabled)
+
+
+def get_cache_index() -> bool:
+    """
+    Get the option value of whether to look up the operators in the index of the operator cache.
+
+    Returns
+    -------
+    ret: bool
+        Whether to use the index of the operator cache.
+    """
+    return _current_context().get_option('cache_index')
+
+
+def reuse_graph_kernels(enabled: bool = True):
+    """
+    Whether to fall back to the kernels of the cached compiled graphs when a task misses the operator cache.
+
+    Each compiled graph in the graph cache keeps a copy of its kernels. When enabled, building a flow graph records
+    its kernels in the ``graph_kernels`` index of the cache directory, and a task that is not in the operator cache
+    (e.g., after the operator cache is cleared or evicted) copies the kernel of a previously built graph with the same
+    task, search space and target into the operator cache instead of compiling it from scratch.
+
+    This is a per-kernel fallback of the operator cache, not an incremental rebuild of the graph: the flow graph is
+    still partitioned and fused as usual, every task is still looked up, and the graph module is always regenerated.
+    This option has no effect when the operator cache is disabled.
+
+    Parameters
+    ----------
+    enabled: bool
+        Whether to reuse the kernels of the cached compiled graphs.
+    """
+    _current_context().set_option('reuse_graph_kernels', enabled)
+
+
+def get_reuse_graph_kernels() -> bool:
+    """
+    Get the option value of whether to reuse the kernels of the cached compiled graphs.
+
+    Returns
+    -------
+    ret: bool
+        Whether to reuse the kernels of the cached compiled graphs.
+    """
+    return _current_context().get_option('reuse_graph_kernels')
+
+
+def cache_compiled_objects(enabled: bool = True):
+    """
+    Whether to cache the compiled objects keyed by the content of the generated source code.
+
+    When enabled, the compiler is only invoked once for byte-identical sources compiled with the same compiler and
+    flags (e.g., the same fused kernel generated by different tasks), and the compiled object or shared library is
+    reused for later builds. The cached objects are stored in the ``objects`` sub-directory of the cache directory.
+
+    Parameters
+    ----------
+    enabled: bool
+        Whether to cache the compiled objects.
+    """
+    _current_context().set_option('cache_compiled_objects', enabled)
+
+
+def get_cache_compiled_objects() -> bool:
+    """
+    Get the option value of whether to cache the compiled objects.
+
+    Returns
+    -------
+    ret: bool
+        Whether to cache the compiled objects.
+    """
+    return _current_context().get_option('cache_compiled_objects')
+
+
+def precompiled_header(enabled: bool = True):
+    """
+    Whether to use precompiled headers when compiling the generated sources.
+
+    When enabled, the ``#include`` directives at the beginning of each generated source (e.g., the hidet runtime
+    headers) are compiled once into a precompiled header for each distinct set of headers and compilation flags,
+    stored in the ``pch`` sub-directory of the cache directory, and reused by all following compilations.
+
+    .. note::
+
+        Only the sources compiled with g++ (i.e., the cpu target) use the precompiled header. The device side of
+        nvcc does not support precompiled headers.
+
+    Parameters
+    ----------
+    enabled: bool
+        Whether to use precompiled headers.
+    """
+    _current_context().set_option('precompiled_header', enabled)
+
+
+def get_precompiled_header() -> bool:
+    """
+    Get the option value of whether to use precompiled headers when compiling the generated sources.
+
+    Returns
+    -------
+    ret: bool
+        Whether to use precompiled headers.
+    """
+    return _current_context().get_option('precompiled_header')
+
+
+def cache_size_limit(limit: Optional[Union[int, str]] = None):
+    """
+    Set the size limit of the cache directory.
+
+    When the limit is set, hidet periodically evicts the least-recently-used entries (compiled operators, compiled
+    graphs, flow graphs, ir modules and compiled objects) after building operators and graphs to keep the cache
+    directory within the limit. The entries used by the current process or accessed in the last few minutes are not
+    evicted. See :mod:`hidet.utils.cache_manager` for details.
+
+    Parameters
+    ----------
+    limit: Optional[Union[int, str]]
+        The size limit in bytes, or a string with unit like '100GiB'. None for no limit.
+    """
+    from hidet.utils.cache_manager import parse_size
+
+    _current_context().set_option('cache_size_limit', parse_size(limit) if limit is not None else None)
+
+
+def get_cache_size_limit() -> Optional[int]:
+    """
+    Get the size limit of the cache directory.
+
+    Returns
+    -------
+    ret: Optional[int]
+        The size limit in bytes, or None if there is no limit.
+    """
+    return _current_context().get_option('cache_size_limit')
+
+
+def compiled_task_cache_capacity(capacity: int = 4096):
+    """
+    Set the maximum number of compiled tasks kept in memory.
+
+    When more tasks are built or loaded, the least recently used ones are dropped from the in-memory cache and will be
+    loaded from the operator cache on disk when they are used again.
+
+    Parameters
+    ----------
+    capacity: int
+        The maximum number of compiled tasks.
+    """
+    _current_context().set_option('compiled_task_cache_capacity', capacity)
+
+
+def get_compiled_task_cache_capacity() -> int:
+    """
+    Get the maximum number of compiled tasks kept in memory.
+
+    Returns
+    -------
+    ret: int
+        The maximum number of compiled tasks.
+    """
+    return _current_context().get_option('compiled_task_cache_capacity')
+
+
+def compiled_graph_cache_capacity(capacity: int = 128, max_bytes: Optional[Union[int, str]] = None):
+    """
+    Set the limits of the compiled graphs kept in memory.
+
+    When a limit is exceeded, the least recently used compiled graphs are dropped from the in-memory cache, which
+    releases their weights and workspace once they are not referenced elsewhere.
+
+    Parameters
+    ----------
+    capacity: int
+        The maximum number of compiled graphs.
+    max_bytes: Optional[Union[int, str]]
+        The maximum total bytes of the weights and workspace of the compiled graphs, or a string with unit like
+        '16GiB'. None for no limit.
+    """
+    from hidet.utils.cache_manager import parse_size
+
+    _current_context().set_option('compiled_graph_cache_capacity', capacity)
+    _current_context().set_option(
+        'compiled_graph_cache_max_bytes', parse_size(max_bytes) if max_bytes is not None else None
+    )
+
+
+def get_compiled_graph_cache_capacity() -> Tuple[int, Optional[int]]:
+    """
+    Get the limits of the compiled graphs kept in memory.
+
+    Returns
+    -------
+    ret: Tuple[int, Optional[int]]
+        The maximum number of compiled graphs, and the maximum total bytes of their weights and workspace (None for
+        no limit).
+    """
+    return (
+        _current_context().get_option('compiled_graph_cache_capacity'),
+        _current_context().get_option('compiled_graph_cache_max_bytes'),
+    )
+
+
+def persistent_worker_pool(enabled: bool = True):
+    """
+    Whether to reuse a long-lived pool of worker processes for parallel builds.
+
+    By default, a new pool of worker processes is created for each parallel build (e.g., each graph build). When
+    this option is enabled, the worker processes are created once and reused by the following parallel builds in the
+    same process, which avoids the start-up cost of the pool when many small graphs are built back to back. The
+    options of the current option context are sent to the workers along with each job.
+
+    The pool is re-created when the number of workers or the nested parallel limits change, and can be shut down
+    explicitly with :func:`hidet.utils.multiprocess.shutdown_worker_pool`.
+
+    Only the pool of the first parallel level (the builds of different tasks) is persistent. The nested pools of the
+    second level (e.g., the candidates of a task) are still forked for each call, since their jobs (IR modules and
+    closures) are handed to the workers by the fork instead of being pickled.
+
+    Parameters
+    ----------
+    enabled: bool
+        Whether to reuse a long-lived pool of worker processes.
+    """
+    _current_context().set_option('persistent_worker_pool', enabled)
+
+
+def get_persistent_worker_pool() -> bool:
+    """
+    Get the option value of whether to reuse a long-lived pool of worker processes for parallel builds.
+
+    Returns
+    -------
+    ret: bool
+        Whether to reuse a long-lived pool of worker processes.
+    """
+    return _current_context().get_option('persistent_worker_pool')
+
+
+def nested_parallel_limit(limit: int = 2):
+    """
+    Set the maximum number of local builds that can use the nested (second level) parallelism at the same time.
+
+    When a graph is built, its tasks are built in parallel (first level), and the candidates of each tunable task
+    are compiled in parallel as well (second level). This option bounds the number of tasks that can spawn their
+    own pool of workers concurrently, to prevent overloading the system.
+
+    Parameters
+    ----------
+    limit: int
+        The maximum number of builds that can use the nested parallelism at the same time.
+    """
+    _current_context().set_option('nested_parallel_limit', limit)
+
+
+def get_nested_parallel_limit() -> int:
+    """
+    Get the maximum number of local builds that can use the nested (second level) parallelism at the same time.
+
+    Returns
+    -------
+    ret: int
+        The maximum number of builds that can use the nested parallelism at the same time.
+    """
+    return _current_context().get_option('nested_parallel_limit')
+
+
+def unity_build(enabled: bool = True, max_candidates: Optional[int] = None):
+    """
+    Whether to compile the candidates of a tunable task in grouped translation units (unity build).
+
+    By default, the candidates of a tunable task are only grouped into shared translation units when there are more
+    candidates than the local workers, so that each worker compiles a few of them. When unity build is enabled, the
+    candidates (each in its own namespace) are always grouped into translation units of at most `max_candidates`
+    candidates, but into no fewer translation units than the workers, and each translation unit is compiled by a
+    single compiler invocation. This saves the compiler start-up and header parsing of the candidates while keeping
+    all the workers busy.
+
+    Parameters
+    ----------
+    enabled: bool
+        Whether to enable unity build.
+    max_candidates: Optional[int]
+        The maximum number of candidates in a single translation unit. If None, the current value is kept (default
+        32).
+    """
+    _current_context().set_option('unity_build', enabled)
+    if max_candidates is not None:
+        if max_candidates < 1:
+            raise ValueError('The maximum number of candidates per translation unit must be positive.')
+        _current_context().set_option('unity_build_max_candidates', max_candidates)
+
+
+def get_unity_build() -> bool:
+    """
+    Get the option value of whether to compile the candidates of a tunable task in grouped translation units.
+
+    Returns
+    -------
+    ret: bool
+        Whether unity build is enabled.
+    """
+    return _current_context().get_option('unity_build')
+
+
+def get_unity_build_max_candidates() -> int:
+    """
+    Get the maximum number of candidates compiled in a single translation unit.
+
+    Returns
+    -------
+    ret: int
+        The maximum number of candidates in a single translation unit.
+    """
+    return _current_context().get_option('unity_build_max_candidates')
+
+
+def compile_profile(enabled: bool = True):
+    """
+    Whether to profile the lowering passes.
+
+    When enabled, the wall time, the number of IR nodes before and after, and the memo sizes of each lowering pass
+    are recorded for every lowered IRModule. The records of the modules built for a flow graph are aggregated into
+    `compile_profile.json` and `compile_profile.txt` in the graph cache directory.
+
+    Parameters
+    ----------
+    enabled: bool
+        Whether to profile the lowering passes.
+    """
+    _current_context().set_option('compile_profile', enabled)
+
+
+def get_compile_profile() -> bool:
+    """
+    Get the option value of whether to profile the lowering passes.
+
+    Returns
+    -------
+    ret: bool
+        Whether to profile the lowering passes.
+    """
+    return _current_context().get_option('compile_profile')
@@ -0,0 +1,50 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from typing import Tuple
+import os
+import click
+import hidet
+from hidet.utils.cache_bundle import export_cache_bundle, import_cache_bundle
+from .utils import nbytes2str
+
+
+@click.command(name='export', help='Export the operator cache to a bundle file.')
+@click.argument('bundle', type=click.Path(dir_okay=False, writable=True))
+@click.option(
+    '--target',
+    'targets',
+    multiple=True,
+    type=click.Choice(['cuda', 'cpu', 'hip']),
+    help='Only export the operators built for the given target. Can be given multiple times.',
+)
+def hidet_cache_export(bundle: str, targets: Tuple[str, ...]):
+    print('Exporting hidet ops cache: {}'.format(os.path.join(hidet.option.get_cache_dir(), 'ops')))
+    num_entries = export_cache_bundle(bundle, targets=list(targets) if targets else None)
+    print('Exported {} operators to {} ({})'.format(num_entries, bundle, nbytes2str(os.path.getsize(bundle))))
+
+
+@click.command(name='import', help='Import the operators in a bundle file into the operator cache.')
+@click.argument('bundle', type=click.Path(exists=True, dir_okay=False))
+@click.option(
+    '--force',
+    is_flag=True,
+    default=False,
+    help='Import the operators built for a different architecture. The operators built by a different hidet version '
+    'are always skipped.',
+)
+def hidet_cache_import(bundle: str, force: bool):
+    print('Importing {} into hidet ops cache: {}'.format(bundle, os.path.join(hidet.option.get_cache_dir(), 'ops')))
+    stats = import_cache_bundle(bundle, force=force)
+    print(
+        'Imported {imported} operators, skipped {existing} existing, {incompatible} incompatible '
+        'and {corrupted} corrupted operators.'.format(**stats)
+    )
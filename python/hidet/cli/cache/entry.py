@@ -12,6 +12,9 @@
 import click
 from .status import hidet_cache_status
 from .clear import hidet_cache_clear
+from .warmup import hidet_cache_warmup
+from .bundle import hidet_cache_export, hidet_cache_import
+from .evict import hidet_cache_evict
 
 
 @click.group(name='cache', help='Manage hidet cache.')
@@ -19,6 +22,13 @@ def hidet_cache_group():
     pass
 
 
-for command in [hidet_cache_status, hidet_cache_clear]:
+for command in [
+    hidet_cache_status,
+    hidet_cache_clear,
+    hidet_cache_evict,
+    hidet_cache_warmup,
+    hidet_cache_export,
+    hidet_cache_import,
+]:
     assert isinstance(command, click.Command)
     hidet_cache_group.add_command(command)
@@ -0,0 +1,49 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from typing import Optional
+import os
+import click
+import hidet
+from hidet.utils.cache_manager import evict_cache, DEFAULT_MIN_AGE
+from .utils import nbytes2str
+
+
+@click.command(name='evict', help='Evict the least-recently-used cache entries to keep the cache within a size limit.')
+@click.option(
+    '--limit',
+    default=None,
+    type=str,
+    help='The size limit of the cache, e.g., "100GiB". Default to hidet.option.cache_size_limit.',
+)
+@click.option(
+    '--min-age',
+    default=DEFAULT_MIN_AGE,
+    show_default=True,
+    type=float,
+    help='Do not evict the entries accessed in the last given seconds.',
+)
+@click.option('--dry-run', is_flag=True, default=False, help='Only show the entries to evict.')
+def hidet_cache_evict(limit: Optional[str], min_age: float, dry_run: bool):
+    if limit is None:
+        limit = hidet.option.get_cache_size_limit()
+        if limit is None:
+            raise click.UsageError('Please specify --limit, or set the cache_size_limit option in hidet config.')
+    cache_dir: str = hidet.option.get_cache_dir()
+    print('Evicting hidet cache: {}'.format(cache_dir))
+    evicted = evict_cache(limit, cache_dir, min_age=min_age, dry_run=dry_run)
+    for entry in evicted:
+        print('  {} {}'.format(nbytes2str(entry.size).rjust(12), os.path.relpath(entry.path, cache_dir)))
+    freed_space = sum(entry.size for entry in evicted)
+    if dry_run:
+        print('Would evict {} entries, freeing {}'.format(len(evicted), nbytes2str(freed_space)))
+    else:
+        print('Evicted {} entries, freed space: {}'.format(len(evicted), nbytes2str(freed_space)))
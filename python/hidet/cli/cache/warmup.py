@@ -0,0 +1,205 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from typing import List, Tuple, Optional, Union, Set
+import os
+import re
+import sys
+import json
+import time
+import pickle
+import traceback
+import click
+from tqdm import tqdm
+from tabulate import tabulate
+import hidet
+from hidet.ir.task import Task
+from hidet.graph.flow_graph import FlowGraph
+
+# (name, task or path to the pickled task, target, space)
+WarmupJob = Tuple[str, Union[str, Task], str, int]
+
+
+def _infer_target_space(task_path: str) -> Tuple[Optional[str], Optional[int]]:
+    # the tasks in the operator cache are stored in ops/<target>_space_<space>/<task name>/<task hash>/task.pickle
+    config_dir = os.path.basename(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(task_path)))))
+    matched = re.fullmatch(r'(\w+)_space_(\d)', config_dir)
+    if matched is None:
+        return None, None
+    return matched.group(1), int(matched.group(2))
+
+
+def _collect_task_file(task_path: str, target: Optional[str], space: Optional[int], jobs: List[WarmupJob]):
+    inferred_target, inferred_space = _infer_target_space(task_path)
+    target = target if target is not None else inferred_target
+    space = space if space is not None else inferred_space
+    if target is None:
+        raise click.UsageError('Can not infer the target of {}, please specify it with --target.'.format(task_path))
+    jobs.append((task_path, task_path, target, space if space is not None else 0))
+
+
+def _collect_graph(
+    graph_path: str,
+    graph: FlowGraph,
+    target: Optional[str],
+    space: Optional[int],
+    optimize: bool,
+    jobs: List[WarmupJob],
+):
+    if optimize:
+        graph = hidet.graph.optimize(graph)
+    built: Set[Tuple[str, str]] = set()
+    for node in graph.nodes:
+        node_target = target if target is not None else node.build_target
+        if (node.task.calculate_hash(), node_target) in built:
+            continue
+        built.add((node.task.calculate_hash(), node_target))
+        jobs.append(('{}:{}'.format(graph_path, node.name), node.task, node_target, space or 0))
+
+
+def _collect_jobs(
+    path: str, target: Optional[str], space: Optional[int], optimize: bool, jobs: List[WarmupJob], visited: Set[str]
+):
+    path = os.path.abspath(path)
+    if path in visited:
+        return
+    visited.add(path)
+    if os.path.isdir(path):
+        for root, _, files in os.walk(path):
+            if 'task.pickle' in files:
+                _collect_task_file(os.path.join(root, 'task.pickle'), target, space, jobs)
+        return
+    if os.path.basename(path) == 'task.pickle':
+        _collect_task_file(path, target, space, jobs)
+        return
+    if path.endswith('.txt'):
+        # a manifest file with one path per line, relative paths are relative to the manifest file
+        with open(path, 'r') as f:
+            for line in f:
+                line = line.strip()
+                if line and not line.startswith('#'):
+                    item = line if os.path.isabs(line) else os.path.join(os.path.dirname(path), line)
+                    _collect_jobs(item, target, space, optimize, jobs, visited)
+        return
+    with open(path, 'rb') as f:
+        obj = pickle.load(f)
+    if isinstance(obj, Task):
+        _collect_task_file(path, target, space, jobs)
+    elif isinstance(obj, FlowGraph):
+        _collect_graph(path, obj, target, space, optimize, jobs)
+    else:
+        raise click.UsageError('Expect a pickled task or flow graph in {}, got {}.'.format(path, type(obj).__name__))
+
+
+def _warmup_job(job: WarmupJob) -> Tuple[str, bool, float, str]:
+    name, task, target, space = job
+    start = time.time()
+    try:
+        if isinstance(task, str):
+            task = hidet.load_task(task)
+        with hidet.option.context():
+            hidet.option.search_space(space)
+            task.build(target=target, load=False)
+        return name, True, time.time() - start, ''
+    except Exception:  # pylint: disable=broad-except
+        return name, False, time.time() - start, traceback.format_exc()
+
+
+@click.command(
+    name='warmup',
+    help='Pre-build operators into the cache. Each PATH could be a pickled task (e.g., the task.pickle files in the '
+    'operator cache), a pickled flow graph (saved by hidet.save_graph), a directory that contains task.pickle files, '
+    'or a manifest file (.txt) that lists these paths, one per line.',
+)
+@click.argument('paths', nargs=-1, required=True, type=click.Path(exists=True))
+@click.option(
+    '--target',
+    default=None,
+    type=click.Choice(['cuda', 'cpu', 'hip']),
+    help='The build target. By default, it is inferred from the location of the task in the operator cache, or '
+    'from the operators of the flow graph.',
+)
+@click.option(
+    '--space',
+    default=None,
+    type=click.Choice(['0', '1', '2']),
+    help='Schedule space. By default, it is inferred from the location of the task in the operator cache, or 0.',
+)
+@click.option('--num-workers', default=None, type=int, help='The number of tasks to build in parallel.')
+@click.option('--optimize', is_flag=True, default=False, help='Optimize the flow graphs before building them.')
+@click.option(
+    '--cache-dir',
+    default=None,
+    type=click.Path(dir_okay=True, file_okay=False, writable=True),
+    help='The cache directory to build the operators into.',
+)
+@click.option('--report', type=click.Path(exists=False, dir_okay=False, writable=True), help='Report file path.')
+def hidet_cache_warmup(
+    paths: Tuple[str, ...],
+    target: Optional[str],
+    space: Optional[str],
+    num_workers: Optional[int],
+    optimize: bool,
+    cache_dir: Optional[str],
+    report: Optional[str],
+):
+    from hidet.drivers.utils import lazy_initialize_cuda
+    from hidet.utils.multiprocess import parallel_imap_1stlevel
+
+    if cache_dir:
+        hidet.option.cache_dir(cache_dir)
+    if num_workers:
+        hidet.option.num_local_workers(num_workers)
+
+    jobs: List[WarmupJob] = []
+    visited: Set[str] = set()
+    for path in paths:
+        _collect_jobs(path, target, int(space) if space is not None else None, optimize, jobs, visited)
+    if len(jobs) == 0:
+        print('No task found.')
+        return
+    print('Hidet cache directory: {}'.format(hidet.option.get_cache_dir()))
+
+    if any(job[2] == 'cuda' for job in jobs):
+        lazy_initialize_cuda()
+    start = time.time()
+    results = list(
+        tqdm(parallel_imap_1stlevel(_warmup_job, jobs), desc='Warm up', total=len(jobs), ncols=80, file=sys.stdout)
+    )
+    elapsed = time.time() - start
+
+    failed = [(name, msg) for name, success, _, msg in results if not success]
+    slowest = sorted(results, key=lambda result: result[2], reverse=True)[:10]
+    print('Slowest tasks:')
+    print(tabulate([[name, '{:.1f}'.format(latency)] for name, _, latency, _ in slowest], headers=['Task', 'Time (s)']))
+    print(
+        'Built {} tasks in {:.1f} seconds ({:.2f} tasks/min), {} failed.'.format(
+            len(results) - len(failed), elapsed, len(results) / elapsed * 60, len(failed)
+        )
+    )
+    for name, msg in failed:
+        print('Failed to build {}:\n    {}'.format(name, msg.strip().replace('\n', '\n    ')))
+
+    if report:
+        with open(report, 'w') as f:
+            json.dump(
+                {
+                    'elapsed': elapsed,
+                    'tasks': [
+                        {'name': name, 'success': success, 'time': latency, 'error': msg}
+                        for name, success, latency, msg in results
+                    ],
+                },
+                f,
+                indent=2,
+            )
+    if failed:
+        sys.exit(1)
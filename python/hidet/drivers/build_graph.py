@@ -9,9 +9,11 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-from typing import List, Dict
+from typing import List, Dict, Optional, Tuple
 import os
+import logging
 import json
+import time
 from hashlib import sha256
 import numpy
 import hidet
@@ -20,13 +22,21 @@ from hidet.ir.expr import SymbolVar, Var, Expr, var
 from hidet.ir.stmt import AssignStmt, DeclareStmt
 from hidet.graph.tensor import Tensor
 from hidet.graph.flow_graph import FlowGraph
-from hidet.runtime.compiled_module import CompiledModule
+from hidet.runtime.compiled_module import CompiledModule, compiled_module_exists
 from hidet.runtime.compiled_graph import CompiledGraph, GraphMetaData, GraphExecution, GraphExecutionInstruction
 from hidet.runtime.compiled_task import CompiledTask, TensorSignature
 from hidet.graph.operator import Operator
 from hidet.ir import primitives
 from hidet.utils.dataclass import asdict
 from hidet.utils import copy_tree_ignore_existing
+from hidet.utils.cache_manager import maybe_evict_cache
+
+logger = logging.Logger(__name__)
+logger.setLevel(logging.INFO)
+logger.addHandler(logging.StreamHandler())
+
+# the alignment of the intermediate tensors in the workspaces, the same as memory_planner_allocate
+WORKSPACE_ALIGNMENT = 128
 
 
 def get_graph_weights(graph):
@@ -113,6 +123,189 @@ def create_graph_execution(graph: FlowGraph, weights: List[Tensor], node2kernel:
     )
 
 
+class LiveInterval:
+    def __init__(self, tensor: Tensor, device: str, size: int, start: int, end: int):
+        self.tensor: Tensor = tensor
+        self.device: str = device
+        self.size: int = size
+        self.start: int = start
+        self.end: int = end
+        self.offset: int = -1
+
+    def overlaps(self, other: 'LiveInterval') -> bool:
+        return self.start <= other.end and other.start <= self.end
+
+
+class StaticMemoryPlan:
+    """
+    The offsets of the intermediate tensors of a static-shape graph in the workspaces, computed at build time.
+
+    Attributes
+    ----------
+    offsets: Dict[Tensor, int]
+        The offset in the workspace of its device of each intermediate tensor that allocates memory (the tensors
+        sharing the memory of others are not included). Empty tensors get -1, as they do from the runtime memory
+        planner.
+    workspace_size: Dict[str, int]
+        The planned workspace size of each device kind, in bytes.
+    runtime_workspace_size: Dict[str, int]
+        The workspace size of each device kind that the runtime best-fit memory planner would require, in bytes.
+    """
+
+    def __init__(
+        self, offsets: Dict[Tensor, int], workspace_size: Dict[str, int], runtime_workspace_size: Dict[str, int]
+    ):
+        self.offsets: Dict[Tensor, int] = offsets
+        self.workspace_size: Dict[str, int] = workspace_size
+        self.runtime_workspace_size: Dict[str, int] = runtime_workspace_size
+
+    def summary(self) -> str:
+        items = []
+        for device, size in self.workspace_size.items():
+            if size == 0 and self.runtime_workspace_size[device] == 0:
+                continue
+            items.append(
+                '{} workspace {:.2f} MiB (runtime planner: {:.2f} MiB)'.format(
+                    device, size / 1024**2, self.runtime_workspace_size[device] / 1024**2
+                )
+            )
+        return ', '.join(items) if items else 'no workspace'
+
+
+def _collect_live_intervals(graph_nodes: List[Operator], t_mapping) -> List[LiveInterval]:
+    # replay the allocations and frees of the launch function, node i allocates its outputs before the kernel and
+    # frees its inputs after the kernel, so the tensors live in [i, j] overlap with those live in [j, k]
+    intervals: Dict[Var, LiveInterval] = {}
+    for idx, node in enumerate(graph_nodes):
+        for y in node.outputs:
+            if not t_mapping.is_allocated(y) and t_mapping.is_local(y):
+                v = t_mapping.get_var(y)
+                intervals[v] = LiveInterval(y, y.device.kind, int(y.nbytes), idx, len(graph_nodes))
+                t_mapping.set_allocated(y, True)
+        for x in node.inputs:
+            t_mapping.dec_usage_count(x)
+            if t_mapping.get_usage_count(x) == 0 and t_mapping.is_local(x):
+                intervals[t_mapping.get_var(x)].end = idx
+                t_mapping.set_allocated(x, False)
+    return list(intervals.values())
+
+
+def _align_workspace_size(size: int) -> int:
+    return (size + WORKSPACE_ALIGNMENT - 1) // WORKSPACE_ALIGNMENT * WORKSPACE_ALIGNMENT
+
+
+def _greedy_by_size_offsets(intervals: List[LiveInterval]) -> Tuple[Dict[Tensor, int], int]:
+    # place the largest tensors first, each into the smallest gap left by the placed tensors that live at the same
+    # time, or after all of them when no gap fits
+    offsets: Dict[Tensor, int] = {}
+    placed: List[LiveInterval] = []
+    peak = 0
+    for it in sorted(intervals, key=lambda it: (-it.size, it.start)):
+        size = _align_workspace_size(it.size)
+        best_offset, best_gap = None, None
+        prev_end = 0
+        for other in sorted((p for p in placed if p.overlaps(it)), key=lambda p: p.offset):
+            gap = other.offset - prev_end
+            if gap >= size and (best_gap is None or gap < best_gap):
+                best_offset, best_gap = prev_end, gap
+            prev_end = max(prev_end, other.offset + _align_workspace_size(other.size))
+        it.offset = best_offset if best_offset is not None else prev_end
+        offsets[it.tensor] = it.offset
+        placed.append(it)
+        peak = max(peak, it.offset + size)
+    return offsets, peak
+
+
+def _best_fit_offsets(intervals: List[LiveInterval], num_nodes: int) -> Tuple[Dict[Tensor, int], int]:
+    # simulate memory_planner_allocate and memory_planner_free of src/hidet/runtime/memory_planner.cpp, which place
+    # each allocation into the smallest free region that fits (the lowest one among the regions of the same size)
+    free_regions: List[List[int]] = []  # sorted [start, size] of the free regions below the top
+    top = 0
+    peak = 0
+    offsets: Dict[Tensor, int] = {}
+    allocs: List[List[LiveInterval]] = [[] for _ in range(num_nodes + 1)]
+    frees: List[List[LiveInterval]] = [[] for _ in range(num_nodes + 1)]
+    for it in intervals:
+        allocs[it.start].append(it)
+        frees[it.end].append(it)
+    for idx in range(num_nodes):
+        for it in allocs[idx]:
+            size = _align_workspace_size(it.size)
+            fits = [
+                (region_size, start, i) for i, (start, region_size) in enumerate(free_regions) if region_size >= size
+            ]
+            if fits:
+                region_size, start, i = min(fits)
+                offsets[it.tensor] = start
+                if region_size > size:
+                    free_regions[i] = [start + size, region_size - size]
+                else:
+                    del free_regions[i]
+            else:
+                offsets[it.tensor] = top
+                top += size
+        peak = max(peak, top)
+        for it in frees[idx]:
+            free_regions.append([offsets[it.tensor], _align_workspace_size(it.size)])
+            free_regions.sort()
+            merged: List[List[int]] = []
+            for start, region_size in free_regions:
+                if merged and merged[-1][0] + merged[-1][1] == start:
+                    merged[-1][1] += region_size
+                else:
+                    merged.append([start, region_size])
+            if merged and merged[-1][0] + merged[-1][1] == top:
+                top = merged.pop()[0]
+            free_regions = merged
+    return offsets, peak
+
+
+def plan_static_memory(graph_nodes: List[Operator], t_mapping) -> Optional[StaticMemoryPlan]:
+    """
+    Plan the workspace offsets of the intermediate tensors of a static-shape graph.
+
+    The live interval of each intermediate tensor is derived from the node order, and the offsets are assigned
+    greedily by size with best-fit placement. The assignment replayed from the runtime best-fit memory planner is
+    used instead when it needs a smaller workspace, so the planned workspace is never larger than before.
+
+    Parameters
+    ----------
+    graph_nodes: List[Operator]
+        The nodes of the graph, in execution order.
+    t_mapping: Tensor2VarMap
+        The tensor to variable map after the share map optimization. Its usage counts are consumed.
+
+    Returns
+    -------
+    ret: Optional[StaticMemoryPlan]
+        The memory plan, or None if any intermediate tensor has a dynamic size.
+    """
+    for node in graph_nodes:
+        for y in node.outputs:
+            if t_mapping.is_local(y) and not all(isinstance(d, int) for d in y.shape):
+                return None
+
+    intervals = _collect_live_intervals(graph_nodes, t_mapping)
+    offsets: Dict[Tensor, int] = {}
+    workspace_size: Dict[str, int] = {}
+    runtime_workspace_size: Dict[str, int] = {}
+    for device in ['cpu', 'cuda', 'hip']:
+        device_intervals = [it for it in intervals if it.device == device and it.size > 0]
+        greedy_offsets, greedy_size = _greedy_by_size_offsets(device_intervals)
+        best_fit_offsets, best_fit_size = _best_fit_offsets(device_intervals, len(graph_nodes))
+        if greedy_size <= best_fit_size:
+            offsets.update(greedy_offsets)
+            workspace_size[device] = greedy_size
+        else:
+            offsets.update(best_fit_offsets)
+            workspace_size[device] = best_fit_size
+        runtime_workspace_size[device] = best_fit_size
+    for it in intervals:
+        if it.size == 0:
+            offsets[it.tensor] = -1
+    return StaticMemoryPlan(offsets, workspace_size, runtime_workspace_size)
+
+
 def get_graph_meta_data(graph: FlowGraph, num_kernels, space: int) -> GraphMetaData:
     # input tensor signature
     inputs = []
@@ -142,7 +335,7 @@ def get_graph_meta_data(graph: FlowGraph, num_kernels, space: int) -> GraphMetaD
     for w in get_graph_weights(graph):
         lines.append(w.signature())
     for node in graph.nodes:
-        lines.append(str(node.task))
+        lines.append(node.task.calculate_hash())
     lines.append(str(graph))
     lines.append(str(space))
 
@@ -191,9 +384,7 @@ def build_graph_module(graph: FlowGraph, graph_weights: List[Tensor], node2kerne
                     for dim_idx, dim in meta.each(enumerate(graph.outputs[idx].shape)):
                         dims[dim_idx] = dim
 
-        def get_workspace_size_impl(cpu_size: Var, cuda_size: Var, hip_size: Var):
-            sb = hidet.ir.builders.StmtBuilder()
-
+        def placeholder_tensor_map() -> 'Tensor2VarMap':
             # Create intermediate variables just as in launch_impl
             intermediate_vars = [var(x.op.name.lower(), int64) for x in graph_intermediates]
 
@@ -216,6 +407,26 @@ def build_graph_module(graph: FlowGraph, graph_weights: List[Tensor], node2kerne
                 cuda_workspace,  # Use actual variable from outer scope
             )
 
+            # Apply share_map optimization first - critical for matching execution
+            t_mapping.process_share_map(graph_nodes)
+            return t_mapping
+
+        # For static-shape graphs, the offsets of the intermediate tensors are planned at build time
+        memory_plan: Optional[StaticMemoryPlan] = plan_static_memory(graph_nodes, placeholder_tensor_map())
+        if memory_plan is not None:
+            logger.debug('Static memory plan: %s', memory_plan.summary())
+
+        def get_workspace_size_impl(cpu_size: Var, cuda_size: Var, hip_size: Var):
+            sb = hidet.ir.builders.StmtBuilder()
+
+            if memory_plan is not None:
+                sb += AssignStmt(cpu_size, int64(memory_plan.workspace_size['cpu']))
+                sb += AssignStmt(cuda_size, int64(memory_plan.workspace_size['cuda']))
+                sb += AssignStmt(hip_size, int64(memory_plan.workspace_size['hip']))
+                return sb.finish()
+
+            t_mapping = placeholder_tensor_map()
+
             # Initialize memory planners
             cpu_idx = 0
             cuda_idx = 1
@@ -224,9 +435,6 @@ def build_graph_module(graph: FlowGraph, graph_weights: List[Tensor], node2kerne
             for idx in [cpu_idx, cuda_idx, hip_idx]:
                 sb += memory_planner_init(idx)
 
-            # Apply share_map optimization first - critical for matching execution
-            t_mapping.process_share_map(graph_nodes)
-
             # Follow the same allocation pattern as in launch_impl
             for node in graph_nodes:
                 for y in node.outputs:
@@ -293,8 +501,9 @@ def build_graph_module(graph: FlowGraph, graph_weights: List[Tensor], node2kerne
             )
 
             sb = hidet.ir.builders.StmtBuilder()
-            sb += memory_planner_init(0)
-            sb += memory_planner_init(1)
+            if memory_plan is None:
+                sb += memory_planner_init(0)
+                sb += memory_planner_init(1)
             d2i = {'cpu': 0, 'cuda': 1, 'hip': 2}
 
             # Apply share_map optimization
@@ -308,7 +517,10 @@ def build_graph_module(graph: FlowGraph, graph_weights: List[Tensor], node2kerne
                     node_params.append(t_mapping.get_full_addr(x))
                 for y in node.outputs:
                     if not t_mapping.is_allocated(y) and t_mapping.is_local(y):
-                        init_addr = memory_planner_allocate(d2i[y.device.kind], tensor_size[y])
+                        if memory_plan is not None:
+                            init_addr = int64(memory_plan.offsets[y])
+                        else:
+                            init_addr = memory_planner_allocate(d2i[y.device.kind], tensor_size[y])
                         sb += DeclareStmt(t_mapping.get_var(y), init=init_addr)
                         t_mapping.set_allocated(y, True)
                     node_params.append(t_mapping.get_full_addr(y))
@@ -322,7 +534,8 @@ def build_graph_module(graph: FlowGraph, graph_weights: List[Tensor], node2kerne
                 for x in node.inputs:
                     t_mapping.dec_usage_count(x)
                     if t_mapping.get_usage_count(x) == 0 and t_mapping.is_local(x):
-                        sb += memory_planner_free(d2i[x.device.kind], t_mapping.get_var(x))
+                        if memory_plan is None:
+                            sb += memory_planner_free(d2i[x.device.kind], t_mapping.get_var(x))
                         t_mapping.set_allocated(x, False)
 
             return sb.finish()
@@ -340,6 +553,71 @@ def build_graph_module(graph: FlowGraph, graph_weights: List[Tensor], node2kerne
     return script_module.build()
 
 
+def graph_kernel_key(task_hash: str, space: int, target: str) -> str:
+    kernel_string = task_hash + ' space: {}'.format(space) + ' target: {}'.format(target)
+    return sha256(kernel_string.encode('utf-8')).hexdigest()[:32]
+
+
+def register_graph_kernels(cgraph: CompiledGraph, kernel_keys: List[str]):
+    """
+    Record the kernels of the cached compiled graph in the graph kernel index.
+
+    The index maps the key of each kernel (see :func:`graph_kernel_key`) to its directory in the graph cache, so that
+    the following builds of other graphs could reuse the kernels even when the operator cache has been cleared.
+    """
+    index_dir = hidet.utils.cache_dir('graph_kernels')
+    kernels_dir = os.path.join(cgraph.get_cache_dir(), 'kernels')
+    with open(os.path.join(cgraph.get_cache_dir(), 'kernels.json'), 'w') as f:
+        json.dump(kernel_keys, f, indent=4)
+    for i, key in enumerate(kernel_keys):
+        index_path = os.path.join(index_dir, key)
+        tmp_path = '{}.{}.tmp'.format(index_path, os.getpid())
+        with open(tmp_path, 'w') as f:
+            f.write(os.path.join(kernels_dir, str(i)))
+        os.replace(tmp_path, index_path)
+
+
+def lookup_graph_kernel(task_hash: str, space: int, target: str) -> Optional[str]:
+    """
+    Find the kernel of a cached compiled graph that implements the given task.
+
+    Parameters
+    ----------
+    task_hash: str
+        The hash of the task, see :meth:`hidet.ir.task.Task.calculate_hash`.
+    space: int
+        The search space level the kernel was built with.
+    target: str
+        The target the kernel was built for.
+
+    Returns
+    -------
+    ret: Optional[str]
+        The directory of the kernel, or None if no valid kernel is found.
+    """
+    key = graph_kernel_key(task_hash, space, target)
+    index_path = os.path.join(hidet.option.get_cache_dir(), 'graph_kernels', key)
+    if not os.path.exists(index_path):
+        return None
+    with open(index_path, 'r') as f:
+        kernel_dir = f.read().strip()
+
+    # the graph might have been removed or overwritten since the kernel was registered
+    version_path = os.path.join(kernel_dir, 'version.txt')
+    keys_path = os.path.join(os.path.dirname(os.path.dirname(kernel_dir)), 'kernels.json')
+    if not (os.path.exists(version_path) and os.path.exists(keys_path) and compiled_module_exists(kernel_dir)):
+        return None
+    with open(version_path, 'r') as f:
+        if f.read().strip() != hidet.__version__:
+            return None
+    with open(keys_path, 'r') as f:
+        kernel_keys = json.load(f)
+    index = int(os.path.basename(kernel_dir))
+    if index >= len(kernel_keys) or kernel_keys[index] != key:
+        return None
+    return kernel_dir
+
+
 def save_to_graph_cache(cgraph: CompiledGraph):
     cache_dir = cgraph.get_cache_dir()
 
@@ -368,6 +646,7 @@ def save_to_graph_cache(cgraph: CompiledGraph):
 
 def build_flow_graph(graph, *, space=0) -> CompiledGraph:
     assert isinstance(graph, FlowGraph)
+    build_start_time = time.time()
 
     # get the graph weights
     graph_weights: List[Tensor] = get_graph_weights(graph)
@@ -378,15 +657,19 @@ def build_flow_graph(graph, *, space=0) -> CompiledGraph:
 
         graph._build_nodes()  # pylint: disable=protected-access
         graph_kernels: List[CompiledTask] = []
+        kernel_keys: List[str] = []
         task2kernel: Dict[str, int] = {}
         node2kernel: List[int] = []
         for node in graph.nodes:
-            task_string = str(node.task) + ' space: {}'.format(space) + ' target: {}'.format(node.build_target)
-            if task_string not in task2kernel:
+            key = graph_kernel_key(node.task.calculate_hash(), space, node.build_target)
+            if key not in task2kernel:
                 kernel_idx = len(graph_kernels)
-                task2kernel[task_string] = kernel_idx
+                task2kernel[key] = kernel_idx
+                kernel_keys.append(key)
+                # the unchanged kernels are loaded from the operator cache, or from the cached graphs that contain
+                # them (see lookup_graph_kernel), only the new kernels are compiled
                 graph_kernels.append(node.task.build(target=node.build_target))
-            node2kernel.append(task2kernel[task_string])
+            node2kernel.append(task2kernel[key])
 
     # build the graph module
     graph_module = build_graph_module(graph, graph_weights, node2kernel)
@@ -409,6 +692,8 @@ def build_flow_graph(graph, *, space=0) -> CompiledGraph:
 
     # save the compiled graph to cache
     save_to_graph_cache(compiled_graph)
+    if hidet.option.get_reuse_graph_kernels():
+        register_graph_kernels(compiled_graph, kernel_keys)
 
     # dump the graph visual when needed
     if hidet.option.get_option('debug_dump_graph_visual'):
@@ -421,9 +706,33 @@ def build_flow_graph(graph, *, space=0) -> CompiledGraph:
         # Alternative format and rendering of Flow Graph
         graph.draw(os.path.join(cache_dir, 'flowgraph.dot'))
 
+    # keep the cache directory within the size limit
+    maybe_evict_cache()
+
+    # write the profile of the lowering passes when needed
+    if hidet.option.get_compile_profile():
+        write_graph_compile_profile(compiled_graph, since=build_start_time)
+
     return compiled_graph
 
 
+def write_graph_compile_profile(compiled_graph: CompiledGraph, since: float):
+    from hidet.transforms.instruments.compile_profile_instrument import (
+        load_compile_profiles,
+        write_compile_profile_report,
+    )
+
+    # only the modules lowered during this build are included, the kernels loaded from cache were not lowered
+    module_dirs = [compiled_task.task_dir for compiled_task in compiled_graph.compiled_tasks]
+    module_dirs.append(compiled_graph.graph_module.module_dir)
+    records = []
+    for module_dir in dict.fromkeys(module_dirs):
+        for record in load_compile_profiles(os.path.join(module_dir, 'lower_profile.json')):
+            if record['timestamp'] >= since:
+                records.append(record)
+    write_compile_profile_report(records, out_dir=compiled_graph.get_cache_dir())
+
+
 # Supporting storage for Tensor2VarMap
 class Tensor2VarMapUnit:
     def __init__(self, v: Var, local: bool, usage_count=0):
@@ -9,11 +9,14 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-from typing import Sequence, Dict, Union
+from typing import Sequence, Dict, Union, List, Optional
 import logging
 import os
 import pickle
 import random
+import contextlib
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor
 from tqdm import tqdm
 
 import hidet.cuda
@@ -22,7 +25,7 @@ from hidet.drivers.utils import lazy_initialize_cuda
 from hidet.ir.module import IRModule
 from hidet.ir.type import FuncType
 from hidet.ir.target import Target
-from hidet.transforms import lower, PassContext, SaveIRInstrument, ProfileInstrument
+from hidet.transforms import lower, PassContext, SaveIRInstrument, ProfileInstrument, CompileProfileInstrument
 from hidet.utils.multiprocess import parallel_imap_2ndlevel, get_parallel_num_workers
 from hidet.utils.stack_limit import set_stack_limit
 from hidet.utils.folder_lock import FolderLock
@@ -54,6 +57,8 @@ def create_instruments(output_dir: str, ir_module: IRModule):
                 ProfileInstrument(log_file=os.path.join(ir_candidate_dir, 'lower_time.txt')),
             ]
         )
+    if hidet.option.get_compile_profile():
+        instruments.append(CompileProfileInstrument(log_file=os.path.join(output_dir, 'lower_profile.json')))
     return instruments
 
 
@@ -116,49 +121,165 @@ def build_ir_module(
     - **Parallel Safety:** The file lock ensures that only one process builds the IR module for a specific
       `output_dir`.
     """
-    lib_name = get_library_name(output_kind)
-    lib_path = os.path.join(output_dir, lib_name)
-
     # Acquire file lock for this output directory
     with FolderLock(output_dir):  # Locks on .lock file in the output directory
-        if should_skip_build(lib_path, output_kind, output_dir, force):
-            return
+        job = generate_ir_module_source(ir_module, output_dir, target, output_kind, force)
+        if job is not None:
+            job.compile()
 
-        if hidet.option.compile_server.enabled() and can_remote_build(ir_module):
-            from hidet.apps.compile_server import remote_build
 
-            remote_build(ir_module, output_dir, target=target, output_kind=output_kind)
-            return
+class CompilationJob:
+    """
+    A compiler invocation for an IR module whose source code has been generated.
 
-        target = Target.from_string(target) if isinstance(target, str) else target
-        src_path = get_source_path(output_dir, target)
+    Building an IR module has a Python part (lowering and code generation) and a compiler part (the gcc/nvcc
+    subprocess). Separating the second part into a job allows the drivers to run the compiler of one module while
+    lowering the next ones.
+    """
 
-        # Set the recursion limit for lowering
-        set_stack_limit()
+    def __init__(
+        self,
+        output_dir: str,
+        output_kind: str,
+        target: Target,
+        src_path: str,
+        include_dirs: Sequence[str],
+        linking_dirs: Sequence[str],
+        linking_libs: Sequence[str],
+        object_files: Sequence[str],
+    ):
+        self.output_dir: str = output_dir
+        self.output_kind: str = output_kind
+        self.target: Target = target
+        self.src_path: str = src_path
+        self.include_dirs: List[str] = list(include_dirs)
+        self.linking_dirs: List[str] = list(linking_dirs)
+        self.linking_libs: List[str] = list(linking_libs)
+        self.object_files: List[str] = list(object_files)
+
+    def compile(self):
+        """
+        Run the compiler. The caller is responsible for holding the lock of the output directory.
 
-        # Lower the IR module
-        ir_module = lower_ir_module(ir_module, output_dir, target)
+        The compiler may run in a thread of the driver, thus it must not configure the global options. The target
+        carries its arch in its attributes, which take precedence over the options.
+        """
+        compile_source(
+            self.src_path,
+            output_library_file=os.path.join(self.output_dir, get_library_name(self.output_kind)),
+            target=self.target,
+            include_dirs=self.include_dirs,
+            linking_dirs=self.linking_dirs,
+            linking_libraries=self.linking_libs,
+            object_files=self.object_files,
+        )
 
-        # Generate source code
-        codegen(ir_module, src_out_path=src_path, target=target)
+    def compile_locked(self, force: bool = False):
+        """
+        Acquire the lock of the output directory and run the compiler, unless another process has already built the
+        library in the meantime (and force is False).
+        """
+        with FolderLock(self.output_dir):
+            lib_path = os.path.join(self.output_dir, get_library_name(self.output_kind))
+            if should_skip_build(lib_path, self.output_kind, self.output_dir, force):
+                return
+            self.compile()
 
-        # Collect dependencies for compilation
-        include_dir, linking_dir, linking_lib, object_file = collect_dependencies(ir_module)
 
-        # Compile source code
-        compile_source(
-            src_path,
-            output_library_file=lib_path,
-            target=target,
-            include_dirs=include_dir,
-            linking_dirs=linking_dir,
-            linking_libraries=linking_lib,
-            object_files=object_file,
-        )
+def generate_ir_module_source(
+    ir_module: Union[IRModule, Sequence[IRModule]],
+    output_dir: str,
+    target: Union[str, Target],
+    output_kind: str = '.so',
+    force: bool = False,
+) -> Optional[CompilationJob]:
+    """
+    Lower the IR module and generate its source code, without running the compiler.
+
+    The caller is responsible for holding the lock of the output directory.
+
+    Returns
+    -------
+    ret: Optional[CompilationJob]
+        The job to compile the generated source code, or None if there is nothing left to compile (the library
+        already exists, or the module has been built by the compile server).
+    """
+    lib_path = os.path.join(output_dir, get_library_name(output_kind))
+    if should_skip_build(lib_path, output_kind, output_dir, force):
+        return None
+
+    if hidet.option.compile_server.enabled() and can_remote_build(ir_module):
+        from hidet.apps.compile_server import remote_build
+
+        remote_build(ir_module, output_dir, target=target, output_kind=output_kind)
+        return None
+
+    target = Target.from_string(target) if isinstance(target, str) else target
+    src_path = get_source_path(output_dir, target)
+
+    # Set the recursion limit for lowering
+    set_stack_limit()
+
+    # Lower the IR module
+    ir_module = lower_ir_module(ir_module, output_dir, target)
+
+    # Generate source code
+    codegen(ir_module, src_out_path=src_path, target=target)
+
+    # Collect dependencies for compilation
+    include_dir, linking_dir, linking_lib, object_file = collect_dependencies(ir_module)
+
+    # Write function types for shared libraries
+    if output_kind == '.so':
+        write_function_types(ir_module, output_dir)
+
+    return CompilationJob(
+        output_dir=output_dir,
+        output_kind=output_kind,
+        target=target,
+        src_path=src_path,
+        include_dirs=include_dir,
+        linking_dirs=linking_dir,
+        linking_libs=linking_lib,
+        object_files=object_file,
+    )
+
+
+def regroup_modules(modules):
+    """
+    Regroup IR modules for parallel processing.
+
+    Each group of modules is emitted into a single translation unit (the modules have different namespaces) and
+    compiled by a single compiler invocation. In unity build mode, the modules are grouped into translation units
+    of at most `unity_build_max_candidates` modules, with at least one translation unit per worker (as long as
+    there are enough modules) to keep all the workers busy; otherwise, they are only grouped when there are more
+    modules than workers.
+    """
+    from hidet.utils import cdiv
+
+    max_candidates_per_job = hidet.option.get_unity_build_max_candidates()
+    num_workers = get_parallel_num_workers(is_remote_allowed=True)
+    len_modules = len(modules)
+
+    if hidet.option.get_unity_build():
+        num_new_jobs = max(cdiv(len_modules, max_candidates_per_job), min(len_modules, num_workers))
+        if num_new_jobs >= len_modules:
+            return modules
+    else:
+        if len_modules <= num_workers:
+            return modules
+        num_new_jobs = cdiv(len_modules, num_workers * max_candidates_per_job) * num_workers
+    job_per_worker = len_modules // num_new_jobs
+    num_modules_for_1st_pass = job_per_worker * num_new_jobs
+
+    grouped_modules = [modules[i : i + job_per_worker] for i in range(0, num_modules_for_1st_pass, job_per_worker)]
+    remainder = modules[num_modules_for_1st_pass:]
 
-        # Write function types for shared libraries
-        if output_kind == '.so':
-            write_function_types(ir_module, output_dir)
+    for i, module in enumerate(remainder):
+        grouped_modules[i % len(grouped_modules)].append(module)
+
+    assert sum(len(group) for group in grouped_modules) == len(modules)
+    return grouped_modules
 
 
 def build_ir_module_batch(
@@ -182,35 +303,23 @@ def build_ir_module_batch(
         exists in the specified output directory.
     """
 
-    def build_job(args):
-        ir_module, output_dir = args
-        build_ir_module(ir_module, output_dir, output_kind=output_kind, target=target, force=force)
-
-    def regroup_modules(modules):
-        """
-        Regroup IR modules for parallel processing.
-        """
-        from hidet.utils import cdiv
-
-        MAX_CANDIDATES_PER_JOB = 32
-        num_workers = get_parallel_num_workers(is_remote_allowed=True)
-        len_modules = len(modules)
-
-        if len_modules <= num_workers:
-            return modules
-
-        num_new_jobs = cdiv(len_modules, num_workers * MAX_CANDIDATES_PER_JOB) * num_workers
-        job_per_worker = len_modules // num_new_jobs
-        num_modules_for_1st_pass = job_per_worker * num_new_jobs
-
-        grouped_modules = [modules[i : i + job_per_worker] for i in range(0, num_modules_for_1st_pass, job_per_worker)]
-        remainder = modules[num_modules_for_1st_pass:]
+    # The lowering workers and the compiler threads share the slots of the local workers, so that at most
+    # `num_local_workers` of them are busy at the same time. The semaphore is created before the lowering workers
+    # are forked. The modules built by the compile server do not take local slots.
+    num_compilers = get_parallel_num_workers(is_remote_allowed=False)
+    if hidet.option.compile_server.enabled():
+        worker_slots = contextlib.nullcontext()
+    else:
+        worker_slots = multiprocessing.get_context('fork').BoundedSemaphore(num_compilers)
 
-        for i, module in enumerate(remainder):
-            grouped_modules[i % len(grouped_modules)].append(module)
+    def lower_job(args) -> Optional[CompilationJob]:
+        ir_module, output_dir = args
+        with worker_slots, FolderLock(output_dir):
+            return generate_ir_module_source(ir_module, output_dir, output_kind=output_kind, target=target, force=force)
 
-        assert sum(len(group) for group in grouped_modules) == len(modules)
-        return grouped_modules
+    def compile_job(compilation_job: CompilationJob):
+        with worker_slots:
+            compilation_job.compile_locked(force)
 
     def check_function_singular(module_list):
         """
@@ -240,10 +349,23 @@ def build_ir_module_batch(
 
     jobs = [(group, output_dir) for group, output_dir in zip(ir_modules_list, output_dirs[: len(ir_modules_list)])]
 
-    for _ in tqdm(
-        parallel_imap_2ndlevel(build_job, jobs, is_remote_allowed=True), desc="Compiling", total=len(jobs), ncols=80
-    ):
-        pass
+    # Two-stage pipeline: the worker processes lower the modules and generate their source code, while the compiler
+    # subprocesses of the modules that have been generated run in a bounded pool of threads in this process. Thus,
+    # the compilers do not wait for the lowering of the following modules.
+    # The thread pool must not start any thread before the worker processes are forked, which holds since the
+    # threads of ThreadPoolExecutor are created lazily on the first submission.
+    with tqdm(desc="Compiling", total=len(jobs), ncols=80) as pbar:
+        with ThreadPoolExecutor(max_workers=num_compilers) as compilers:
+            futures = []
+            for compilation_job in parallel_imap_2ndlevel(lower_job, jobs, is_remote_allowed=True):
+                if compilation_job is None:
+                    pbar.update()
+                    continue
+                future = compilers.submit(compile_job, compilation_job)
+                future.add_done_callback(lambda _: pbar.update())
+                futures.append(future)
+            for future in futures:
+                future.result()
 
     return output_dirs[: len(ir_modules_list)]
 
@@ -12,9 +12,10 @@
 import logging
 import re
 import os
+import time
 import json
 import shutil
-from typing import List, Optional, Tuple
+from typing import List, Optional, Tuple, Sequence
 from tqdm import tqdm
 
 import hidet.cuda
@@ -25,39 +26,105 @@ from hidet.ir.module import IRModule
 from hidet.ir.task import Task
 from hidet.drivers.build_module import build_ir_module, build_ir_module_batch
 from hidet.drivers.utils import lazy_initialize_cuda
-from hidet.runtime.compiled_module import compiled_module_exists
+from hidet.runtime.compiled_module import compiled_module_exists, CompiledModuleLoadError
 from hidet.runtime.compiled_task import CompiledTask, TensorSignature, load_compiled_task, compiled_task_cache
 from hidet.runtime.device import Device
-from hidet.utils.multiprocess import parallel_imap_1stlevel
+from hidet.utils.multiprocess import parallel_imap_1stlevel, get_parallel_num_workers
+from hidet.utils.counters import counters
+from hidet.utils.cache_manager import pin_cache_entry, unpin_cache_entry, touch_cache_entry, maybe_evict_cache
+from hidet.utils.cache_index import lookup_task_index, update_task_index, remove_task_index
 from hidet.utils.py import cyan, green
 
 logger = logging.Logger(__name__)
 logger.setLevel(logging.INFO)
 logger.addHandler(logging.StreamHandler())
 
+# the file in a task directory that marks a task built with only part of its candidates due to the tuning budget
+BUDGETED_BUILD_FILE = 'budgeted.txt'
 
-def _generate_candidate_summary(candidates: List[IRModule], task_dir: str):
+
+def _has_build_budget() -> bool:
+    return any(v is not None for v in option.get_tuning_budget()[:2])
+
+
+def _is_reusable_build(task_dir: str) -> bool:
+    """
+    A budgeted build is only reused by the builds that also have a tuning budget, while the builds without a budget
+    rebuild the task with all its candidates (which clears the mark).
+    """
+    return _has_build_budget() or not os.path.exists(os.path.join(task_dir, BUDGETED_BUILD_FILE))
+
+
+def _generate_candidate_summary(candidates: List[IRModule], task_dir: str, skipped: Sequence[IRModule] = ()):
     import tabulate
 
     headers = ['index']
     tuning_kwargs = getattr(candidates[0], '_tuning_kwargs', {})
     headers.extend(list(tuning_kwargs.keys()))
-    lines = []
-    for i, candidate in enumerate(candidates):
-        line = []
-        line.append(str(i))
-        tuning_kwargs = getattr(candidate, '_tuning_kwargs', {})
-        for header in headers[1:]:
-            if header in tuning_kwargs:
-                line.append(str(tuning_kwargs[header]))
-            else:
-                line.append('N/A')
-        lines.append(line)
+
+    def summarize(modules, start):
+        lines = []
+        for i, candidate in enumerate(modules, start=start):
+            line = []
+            line.append(str(i))
+            tuning_kwargs = getattr(candidate, '_tuning_kwargs', {})
+            for header in headers[1:]:
+                if header in tuning_kwargs:
+                    line.append(str(tuning_kwargs[header]))
+                else:
+                    line.append('N/A')
+            lines.append(line)
+        return lines
+
+    lines = summarize(candidates, start=0)
+    skipped_lines = summarize(skipped, start=len(candidates))
 
     with open(os.path.join(task_dir, 'candidates.txt'), 'w') as f:
         f.write(tabulate.tabulate(lines, headers=headers, tablefmt='plain'))
+        if len(skipped_lines) > 0:
+            f.write('\n\nskipped due to the tuning budget:\n')
+            f.write(tabulate.tabulate(skipped_lines, headers=headers, tablefmt='plain'))
     with open(os.path.join(task_dir, 'candidates.json'), 'w') as f:
-        json.dump({'headers': headers, 'candidates': lines}, f, indent=2)
+        json.dump({'headers': headers, 'candidates': lines, 'skipped': skipped_lines}, f, indent=2)
+
+
+def _build_candidates_with_budget(candidates: List[IRModule], task_dir: str, target: str) -> Tuple[int, List[str]]:
+    """
+    Build the candidates to object files in their priority order, until the tuning budget is spent.
+
+    Returns
+    -------
+    ret: Tuple[int, List[str]]
+        The number of built candidates (always a prefix of the given candidates) and the directories of the built
+        object files.
+    """
+    budget_seconds, budget_candidates, _ = option.get_tuning_budget()
+    if budget_candidates is not None:
+        candidates = candidates[:budget_candidates]
+    if budget_seconds is None:
+        batch_size = len(candidates)
+    else:
+        batch_size = get_parallel_num_workers(is_remote_allowed=True)
+
+    start_time = time.time()
+    num_built = 0
+    objects_path_list = []
+    while num_built < len(candidates):
+        if num_built > 0 and budget_seconds is not None and time.time() - start_time >= budget_seconds:
+            break
+        batch = candidates[num_built : num_built + batch_size]
+        objects_path_list.extend(
+            build_ir_module_batch(
+                ir_modules=batch,
+                output_dirs=[
+                    os.path.join(task_dir, 'candidates', str(i)) for i in range(num_built, num_built + len(batch))
+                ],
+                output_kind='.o',
+                target=target,
+            )
+        )
+        num_built += len(batch)
+    return num_built, objects_path_list
 
 
 def build_task_module(task: Task, candidates: List[IRModule], task_dir: str, target: str):
@@ -86,7 +153,14 @@ def build_task_module(task: Task, candidates: List[IRModule], task_dir: str, tar
 
     if len(candidates) == 0:
         raise ValueError('No candidate found.')
-    elif len(candidates) == 1:
+    # rebuild a previous budgeted build from scratch, including the candidates kept for debugging and the dispatch
+    # table that picks among them; the mark is written again below if the budget still skips some candidates
+    if os.path.exists(os.path.join(task_dir, BUDGETED_BUILD_FILE)):
+        shutil.rmtree(os.path.join(task_dir, 'candidates'), ignore_errors=True)
+        for name in [BUDGETED_BUILD_FILE, 'lib.so', 'dispatch_table.txt']:
+            if os.path.exists(os.path.join(task_dir, name)):
+                os.remove(os.path.join(task_dir, name))
+    if len(candidates) == 1:
         from hidet.transforms.generate_launch_func import generate_launch_func
 
         # when there is only one candidate, we reuse the candidate's ir module
@@ -109,15 +183,31 @@ def build_task_module(task: Task, candidates: List[IRModule], task_dir: str, tar
         for i, candidate in enumerate(candidates):
             candidate.namespace = f'candidate_{i}'
 
-        # generate the candidate summary
-        _generate_candidate_summary(candidates, task_dir)
         # build each candidate to an object file (.o)
-        objects_path_list = build_ir_module_batch(
-            ir_modules=candidates,
-            output_dirs=[os.path.join(task_dir, 'candidates', str(i)) for i in range(len(candidates))],
-            output_kind='.o',
-            target=target,
-        )
+        if _has_build_budget():
+            num_built, objects_path_list = _build_candidates_with_budget(candidates, task_dir, target)
+            if num_built < len(candidates):
+                logger.info(
+                    f"Tuning budget spent, built {num_built} out of {len(candidates)} candidates for {task.name}."
+                )
+                candidates, skipped = candidates[:num_built], candidates[num_built:]
+                with open(os.path.join(task_dir, BUDGETED_BUILD_FILE), 'w') as f:
+                    f.write('built {} out of {} candidates\n'.format(num_built, num_built + len(skipped)))
+                # record the number of candidates that are actually built
+                generate_meta_data(task, task_dir, target, num_candidates=len(candidates))
+            else:
+                skipped = []
+        else:
+            objects_path_list = build_ir_module_batch(
+                ir_modules=candidates,
+                output_dirs=[os.path.join(task_dir, 'candidates', str(i)) for i in range(len(candidates))],
+                output_kind='.o',
+                target=target,
+            )
+            skipped = []
+
+        # generate the candidate summary
+        _generate_candidate_summary(candidates, task_dir, skipped)
 
         param_types = [~t.type.dtype for t in task.params]
 
@@ -160,11 +250,28 @@ def build_task_module(task: Task, candidates: List[IRModule], task_dir: str, tar
 
     # build task ir module
     build_ir_module(ir_module=task_ir_module, output_dir=task_dir, output_kind='.so', target=target)
+    # keep the lowering profiles of the candidates before their directories are removed
+    if hidet.option.get_compile_profile():
+        _merge_candidate_profiles(task_dir)
     # clear the candidate object files that are no longer needed
     if not hidet.option.get_option('debug_cache_tuning'):
         shutil.rmtree(os.path.join(task_dir, 'candidates'), ignore_errors=True)
 
 
+def _merge_candidate_profiles(task_dir: str):
+    from hidet.transforms.instruments.compile_profile_instrument import merge_compile_profiles
+
+    candidates_dir = os.path.join(task_dir, 'candidates')
+    if not os.path.isdir(candidates_dir):
+        return
+    profile_files = []
+    for name in sorted(os.listdir(candidates_dir)):
+        profile_file = os.path.join(candidates_dir, name, 'lower_profile.json')
+        if os.path.exists(profile_file):
+            profile_files.append(profile_file)
+    merge_compile_profiles(profile_files, os.path.join(task_dir, 'lower_profile.json'))
+
+
 def generate_meta_data(task: Task, task_dir: str, build_target: str, num_candidates: int):
     from hidet.ir.compute import TensorNode
     from hidet.runtime.compiled_task import TaskMetaData
@@ -228,38 +335,51 @@ def build_task(task: Task, target='cuda', load=True) -> Optional[CompiledTask]:
         When load is True, the compiled function is returned. Otherwise, None is returned.
     """
     target = target.kind if isinstance(target, Device) else target
-    task_string = str(task)
+    task_hash = task.calculate_hash()
     space_level = option.get_option('search_space')
     op_cache_dir = os.path.join(option.get_option('cache_dir'), './ops')
     use_cache = option.get_option('cache_operator')
 
     # Check in-memory cache
-    compiled_task = check_in_memory_cache(target, space_level, task_string, load)
+    compiled_task = check_in_memory_cache(target, space_level, task_hash, load)
     if compiled_task:
         return compiled_task
 
     # Prepare cache paths and versioning
     config_str = f'{target}_space_{space_level}'
-    task_dir, version_path = prepare_cache_paths(op_cache_dir, config_str, task)
+    task_dir, version_path = prepare_cache_paths(op_cache_dir, config_str, task, task_hash)
+
+    # Check the index of the disk cache
+    if use_cache and option.get_cache_index():
+        index_entry = lookup_task_index(task_dir)
+        if index_entry is not None and _is_reusable_build(task_dir):
+            hit, compiled_task = load_task_from_index(task_dir, index_entry, target, space_level, task_hash, load)
+            if hit:
+                return compiled_task
 
     # Check disk cache
-    if use_cache and verify_disk_cache(version_path, task_dir):
-        return load_task_from_disk(task.name, task_dir, target, space_level, task_string, load)
+    if use_cache and verify_disk_cache(version_path, task_dir) and _is_reusable_build(task_dir):
+        return load_task_from_disk(task.name, task_dir, target, space_level, task_hash, load)
+
+    # Check the kernels of the cached graphs
+    reuse_kernels = use_cache and option.get_reuse_graph_kernels()
+    if reuse_kernels and reuse_graph_kernel(task, task_hash, task_dir, target, space_level):
+        return load_task_from_disk(task.name, task_dir, target, space_level, task_hash, load)
 
     # Compile the task from scratch
-    return compile_task_from_scratch(task, target, task_string, task_dir, space_level, load)
+    return compile_task_from_scratch(task, target, task_hash, task_dir, space_level, load)
 
 
-def check_in_memory_cache(target, space_level, task_string, load):
+def check_in_memory_cache(target, space_level, task_hash, load):
     """Check if the task exists in the in-memory cache."""
-    if compiled_task_cache.contains(target, space_level, task_string):
-        return compiled_task_cache.get(target, space_level, task_string) if load else None
-    return None
+    compiled_task = compiled_task_cache.get(target, space_level, task_hash)
+    if compiled_task is not None and not _is_reusable_build(compiled_task.task_dir):
+        return None
+    return compiled_task if load else None
 
 
-def prepare_cache_paths(op_cache_dir, config_str, task: Task):
+def prepare_cache_paths(op_cache_dir, config_str, task: Task, task_hash: str):
     """Prepare paths for the task cache."""
-    task_hash = task.calculate_hash()
     task_dir = os.path.join(op_cache_dir, config_str, task.name, task_hash)
     version_path = os.path.join(task_dir, 'version.txt')
     return task_dir, version_path
@@ -275,43 +395,92 @@ def verify_disk_cache(version_path, task_dir):
     return version_matched and compiled_module_exists(task_dir)
 
 
-def load_task_from_disk(task_name, task_dir, target, space_level, task_string, load):
+def reuse_graph_kernel(task, task_hash, task_dir, target, space_level) -> bool:
+    """Copy the kernel of a cached graph that implements the same task to the operator cache."""
+    from hidet.drivers.build_graph import lookup_graph_kernel
+
+    kernel_dir = lookup_graph_kernel(task_hash, space_level, target)
+    if kernel_dir is None or not _is_reusable_build(kernel_dir):
+        counters['graph_kernels']['miss'] += 1
+        return False
+    logger.debug(f"Reuse {target} task {green(task.signature())} from cached graph kernel: \n{cyan(kernel_dir)}")
+    shutil.copytree(kernel_dir, task_dir, dirs_exist_ok=True)
+    counters['graph_kernels']['hit'] += 1
+    return True
+
+
+def load_task_from_index(task_dir, index_entry, target, space_level, task_hash, load):
+    """
+    Load a task from the disk cache with the meta data recorded in the index.
+
+    Returns whether the indexed task is still in the disk cache, and the loaded task (None if load is False).
+    """
+    try:
+        if load:
+            compiled_task = load_compiled_task(task_dir, index_entry)
+        else:
+            os.stat(os.path.join(task_dir, 'lib.so'))
+            compiled_task = None
+    except (OSError, CompiledModuleLoadError):
+        # the task directory has been removed or corrupted since the task was indexed
+        remove_task_index([task_dir])
+        counters['cache_index']['stale'] += 1
+        return False, None
+    touch_cache_entry(task_dir)
+    counters['cache_index']['hit'] += 1
+    if compiled_task is not None:
+        compiled_task_cache.add(target, space_level, task_hash, compiled_task)
+    return True, compiled_task
+
+
+def load_task_from_disk(task_name, task_dir, target, space_level, task_hash, load):
     """Load a task from the disk cache."""
     logger.debug(f"Load cached task binary {green(task_name)} from path: \n{cyan(os.path.join(task_dir, 'lib.so'))}")
+    touch_cache_entry(task_dir)
+    if option.get_cache_index():
+        update_task_index(task_dir)
     if load:
         compiled_task = load_compiled_task(task_dir)
-        compiled_task_cache.add(target, space_level, task_string, compiled_task)
+        compiled_task_cache.add(target, space_level, task_hash, compiled_task)
         return compiled_task
     return None
 
 
-def compile_task_from_scratch(task, target, task_string, task_dir, space_level, load):
+def compile_task_from_scratch(task, target, task_hash, task_dir, space_level, load):
     """Compile the task from scratch."""
     logger.info(f"Compiling {target} task {green(task.signature())}...")
 
-    # Prepare task directory
+    # Prepare task directory, which is pinned to keep it from being evicted while it is being built
     os.makedirs(task_dir, exist_ok=True)
-    write_task_files(task, task_string, task_dir)
+    pin_cache_entry(task_dir)
+    try:
+        write_task_files(task, task_dir)
 
-    # Implement task to IRModule candidates
-    candidates = task.implement(target=target, working_dir=task_dir)
+        # Implement task to IRModule candidates
+        candidates = task.implement(target=target, working_dir=task_dir)
 
-    # Generate metadata and build modules
-    generate_meta_data(task, task_dir, target, len(candidates))
-    build_task_module(task, candidates, task_dir, target)
+        # Generate metadata and build modules
+        generate_meta_data(task, task_dir, target, len(candidates))
+        build_task_module(task, candidates, task_dir, target)
+    finally:
+        unpin_cache_entry(task_dir)
+    touch_cache_entry(task_dir)
+    if option.get_cache_operator() and option.get_cache_index():
+        update_task_index(task_dir)
+    maybe_evict_cache()
 
     # Load and cache the compiled task
     if load:
         compiled_task = load_compiled_task(task_dir)
-        compiled_task_cache.add(target, space_level, task_string, compiled_task)
+        compiled_task_cache.add(target, space_level, task_hash, compiled_task)
         return compiled_task
     return None
 
 
-def write_task_files(task, task_string, task_dir):
+def write_task_files(task, task_dir):
     """Write task information and version files."""
     with open(os.path.join(task_dir, 'task.txt'), 'w') as f:
-        f.write(task_string)
+        f.write(str(task))
     try:
         hidet.save_task(task, os.path.join(task_dir, 'task.pickle'))
     except Exception:  # pylint: disable=broad-except, unused-variable
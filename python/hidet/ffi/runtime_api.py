@@ -9,12 +9,15 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-from typing import Union
-from ctypes import c_void_p, c_char_p, c_uint64, c_int32, c_bool, c_size_t
+from typing import Union, Dict, Sequence, Tuple
+from ctypes import c_void_p, c_char_p, c_uint64, c_int32, c_int64, c_bool, c_size_t
 from hidet.cuda import Stream
 from .ffi import get_func
 from .array import Array
 
+# the index of the memory planner of each device kind, as used by the launch function of the graph module
+MEMORY_PLANNER_INDEX = {'cpu': 0, 'cuda': 1, 'hip': 2}
+
 
 class RuntimeAPI:
     _set_current_cuda_stream = get_func('set_cuda_stream', [c_void_p], None)
@@ -29,12 +32,17 @@ class RuntimeAPI:
     _reset_symbol_table = get_func('reset_symbol_table', [], None)
     _get_symbol_value = get_func('get_symbol_value', [c_char_p], c_int32)
     _set_symbol_value = get_func('set_symbol_value', [c_char_p, c_int32], None)
+    _register_symbol = get_func('register_symbol', [c_char_p], c_int32)
+    _set_symbol_values = get_func('set_symbol_values', [c_int32, c_void_p, c_void_p], None)
+    _get_symbol_values = get_func('get_symbol_values', [c_int32, c_void_p, c_void_p], None)
     _get_ptr_symbol_value = get_func('get_ptr_symbol_value', [c_char_p], c_void_p)
     _set_ptr_symbol_value = get_func('set_ptr_symbol_value', [c_char_p, c_void_p], None)
     _request_cuda_workspace = get_func('request_cuda_workspace', [c_size_t, c_bool], c_void_p)
     _set_nccl_comms = get_func('set_nccl_comms', [c_int32, c_void_p], None)
     _get_use_torch_stream = get_func('get_use_torch_cuda_stream', [], c_bool)
     _use_torch_cuda_stream = get_func('use_torch_cuda_stream', [c_bool], None)
+    _memory_planner_get_stats = get_func('memory_planner_get_stats', [c_int32, c_void_p], None)
+    _memory_planner_reset_stats = get_func('memory_planner_reset_stats', [c_int32], None)
 
     @staticmethod
     def set_current_cuda_stream(stream: Union[Stream, int]) -> None:
@@ -89,6 +97,15 @@ class RuntimeAPI:
         name = name.encode('utf-8')
         RuntimeAPI._set_symbol_value(name, value)
 
+    @staticmethod
+    def register_symbol(name: str) -> int:
+        name = name.encode('utf-8')
+        return RuntimeAPI._register_symbol(name)
+
+    @staticmethod
+    def symbol_slots(names: Sequence[str]) -> 'SymbolSlots':
+        return SymbolSlots(names)
+
     @staticmethod
     def get_ptr_symbol_value(name: str) -> int:
         name = name.encode('utf-8')
@@ -117,5 +134,64 @@ class RuntimeAPI:
         p = RuntimeAPI._request_cuda_workspace(nbytes, require_clean)
         return p if p else None
 
+    @staticmethod
+    def get_memory_planner_stats(device: str) -> Dict[str, Union[int, float]]:
+        """
+        Get the statistics of the runtime memory planner used by the dynamic-shape graphs launched on this thread.
+
+        Parameters
+        ----------
+        device: str
+            The device kind of the workspace, 'cpu', 'cuda' or 'hip'.
+
+        Returns
+        -------
+        ret: Dict[str, Union[int, float]]
+            The statistics, with the following keys:
+
+            - peak: the peak workspace size since the last reset, in bytes.
+            - peak_used: the bytes held by live tensors when the peak was reached.
+            - fragmentation: the fraction of the peak workspace not held by live tensors.
+            - reserved: the current workspace size, in bytes.
+            - used: the bytes currently held by live tensors.
+            - num_free_regions: the number of free regions below the current workspace size.
+            - largest_free_region: the size of the largest of these free regions, in bytes.
+            - num_allocations: the number of allocations since the last reset.
+        """
+        stats = (c_int64 * 7)()
+        RuntimeAPI._memory_planner_get_stats(MEMORY_PLANNER_INDEX[device], stats)
+        keys = ['peak', 'peak_used', 'reserved', 'used', 'num_free_regions', 'largest_free_region', 'num_allocations']
+        ret: Dict[str, Union[int, float]] = dict(zip(keys, stats))
+        ret['fragmentation'] = 1.0 - ret['peak_used'] / ret['peak'] if ret['peak'] > 0 else 0.0
+        return ret
+
+    @staticmethod
+    def reset_memory_planner_stats(device: str) -> None:
+        RuntimeAPI._memory_planner_reset_stats(MEMORY_PLANNER_INDEX[device])
+
+
+class SymbolSlots:
+    """
+    A group of integer symbols registered in the runtime symbol table, whose values are set or read in one call.
+
+    Parameters
+    ----------
+    names: Sequence[str]
+        The names of the symbols.
+    """
+
+    def __init__(self, names: Sequence[str]):
+        self.names: Tuple[str, ...] = tuple(names)
+        self.slots = (c_int32 * len(self.names))(*[RuntimeAPI.register_symbol(name) for name in self.names])
+        self.values = (c_int32 * len(self.names))()
+
+    def set_values(self, values: Sequence[int]) -> None:
+        self.values[:] = values
+        RuntimeAPI._set_symbol_values(len(self.names), self.slots, self.values)  # pylint: disable=protected-access
+
+    def get_values(self) -> Tuple[int, ...]:
+        RuntimeAPI._get_symbol_values(len(self.names), self.slots, self.values)  # pylint: disable=protected-access
+        return tuple(self.values)
+
 
 runtime_api = RuntimeAPI()
@@ -11,13 +11,15 @@
 # limitations under the License.
 import os
 import logging
-from typing import Optional, Tuple, Dict
+from typing import Optional, Tuple
 from hashlib import sha256
 from hidet.graph.flow_graph import FlowGraph
-from hidet.option import get_cache_dir
+from hidet.option import get_cache_dir, get_compiled_graph_cache_capacity
 from hidet.utils.counters import counters
 from hidet.runtime.compiled_graph import CompiledGraph, load_compiled_graph, save_compiled_graph
 from hidet.utils.cache_utils import clear_cache_dir
+from hidet.utils.cache_manager import touch_cache_entry
+from hidet.utils.structure import LRUCache
 from hidet.distributed import is_initialized, get_default_group
 
 logger = logging.getLogger(__name__)
@@ -43,18 +45,33 @@ def compute_flow_graph_hash(fg: FlowGraph, kwargs) -> str:
     return sha256(flow_graph_detail.encode()).hexdigest()[:32]
 
 
+def _compiled_graph_nbytes(compiled_graph: CompiledGraph) -> int:
+    nbytes = sum(w.nbytes for w in compiled_graph.weights)
+    for workspace in [compiled_graph.cpu_workspace, compiled_graph.cuda_workspace, compiled_graph.hip_workspace]:
+        if workspace is not None:
+            nbytes += workspace.num_bytes
+    return nbytes
+
+
 class CompiledGraphInMemoryCache:
+    """
+    The in-memory cache of the compiled graphs, bounded by hidet.option.compiled_graph_cache_capacity by the number of
+    graphs and the bytes of their weights and workspace. The hits, misses and evictions are counted in
+    hidet.utils.counters.counters['compiled_graph_cache'].
+    """
+
     def __init__(self):
-        self.cached: Dict[str, CompiledGraph] = {}
+        self.cached: LRUCache[str, CompiledGraph] = LRUCache('compiled_graph_cache', nbytes=_compiled_graph_nbytes)
 
     def contains(self, key: str) -> bool:
         return key in self.cached
 
-    def get(self, key: str) -> Tuple[str, Optional[CompiledGraph]]:
-        return self.cached.get(key) if key in self.cached else None
+    def get(self, key: str) -> Optional[CompiledGraph]:
+        return self.cached.get(key)
 
     def add(self, key: str, compiled_graph: CompiledGraph):
-        self.cached[key] = compiled_graph
+        capacity, max_bytes = get_compiled_graph_cache_capacity()
+        self.cached.put(key, compiled_graph, capacity=capacity, max_bytes=max_bytes)
 
     def clear(self):
         self.cached.clear()
@@ -102,6 +119,7 @@ def flow_graph_lookup_graph(key: str) -> Optional[CompiledGraph]:
     cache_dir_for_key = flow_graph_get_cache_dir_for_key(key)
     if not os.path.isdir(cache_dir_for_key):
         return None
+    touch_cache_entry(cache_dir_for_key)
     cached_files = os.listdir(cache_dir_for_key)
     # there should be exactly one file if this key directory exists
     # one FlowGraph maps to one CompiledGraph
@@ -14,9 +14,31 @@ from hidet.ir.node import Node
 from hidet.utils import same_list
 
 
+# The stack of lists that record the functors created while it is not empty. It is used by the compile profiler
+# (see hidet.transforms.instruments.CompileProfileInstrument) to measure the memo sizes of the functors used by a pass.
+_functor_trackers: List[List['BaseFunctor']] = []
+
+
+def push_functor_tracker():
+    _functor_trackers.append([])
+
+
+def pop_functor_tracker() -> List['BaseFunctor']:
+    """
+    Stop recording the functors created since the matching push_functor_tracker(), and return them. The functors are
+    also reported to the enclosing tracker, if any.
+    """
+    functors = _functor_trackers.pop()
+    if _functor_trackers:
+        _functor_trackers[-1].extend(functors)
+    return functors
+
+
 class BaseFunctor:
     def __init__(self, use_memo=True):
         self.memo = {} if use_memo else None
+        if _functor_trackers:
+            _functor_trackers[-1].append(self)
 
     def __call__(self, node: Any):
         return self.visit(node)
@@ -106,6 +106,7 @@ class IRModule(Node):
         from hashlib import sha256
         from hidet.drivers import build_ir_module
         from hidet.runtime import load_compiled_module
+        from hidet.utils.cache_manager import touch_cache_entry
         import hidet.utils
 
         hash_dir = sha256(str(self).encode()).hexdigest()[:16]
@@ -119,4 +120,5 @@ class IRModule(Node):
             target = 'cpu'
 
         build_ir_module(self, output_dir, target=target)
+        touch_cache_entry(output_dir)
         return load_compiled_module(output_dir)
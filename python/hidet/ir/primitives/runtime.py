@@ -41,6 +41,11 @@ def register_functions():
     register_primitive_function(
         name='get_symbol_value', func_or_type=FuncType([string_type()], int32), codegen_name='get_symbol_value'
     )
+    register_primitive_function(
+        name='get_symbol_slot_value',
+        func_or_type=FuncType([string_type()], int32),
+        codegen_name='get_symbol_slot_value',
+    )
     register_primitive_function(
         name='set_symbol_value', func_or_type=FuncType([string_type(), int32], void), codegen_name='set_symbol_value'
     )
@@ -96,6 +101,16 @@ def get_symbol_value(name: Union[str, Expr]) -> int32:
     return call_primitive_func('get_symbol_value', [name])
 
 
+def get_symbol_slot_value(name: Union[str, Expr]) -> int32:
+    """
+    Get the value of an integer symbol through its slot in the runtime symbol table.
+
+    The slot of the symbol is registered the first time the call is executed, and the following executions read the
+    symbol table directly, without looking up the symbol by its name.
+    """
+    return call_primitive_func('get_symbol_slot_value', [name])
+
+
 def set_symbol_value(name: Union[str, Expr], value: Union[int, Expr]):
     return call_primitive_func('set_symbol_value', [name, value])
 
@@ -117,6 +117,7 @@ class Task(Node):
         self.assertions: List[Tuple[Expr, Optional[str]]] = getattr(self, 'assertions', [])
         self.share_map: Dict[int, int] = share_map
         self.str = None
+        self.hash = None
 
         from hidet.ir.tools import collect
 
@@ -343,7 +344,21 @@ class Task(Node):
             return pickle.load(f)
 
     def calculate_hash(self, len: int = 16) -> str:
-        return sha256(str(self).encode()).hexdigest()[:len]
+        """
+        Calculate the hash of the task, which is used as the key of the operator cache.
+
+        The hash is the structural hash of the task (see :class:`hidet.ir.tools.hasher.StructuralHash`), which is
+        stable across processes and much cheaper than printing the task. The printed text of the task is hashed
+        instead if the task contains nodes that are not supported by the structural hash.
+        """
+        if getattr(self, 'hash', None) is None:
+            from hidet.ir.tools import structural_hash
+
+            try:
+                self.hash = structural_hash(self)
+            except (NotImplementedError, ValueError):
+                self.hash = sha256(str(self).encode()).hexdigest()
+        return self.hash[:len]
 
     def __str__(self):
         if self.str is None:
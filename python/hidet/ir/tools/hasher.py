@@ -9,14 +9,17 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-from typing import Union, Tuple, Dict
+from typing import Union, Tuple, Dict, List, Any
+from hashlib import sha256
+
+import numpy as np
 
 from hidet.ir import Node
 from hidet.ir.dialects.pattern import PlaceholderExpr
 from hidet.ir.expr import Var, Constant, Add, Sub, Multiply, Div, Mod, FloorDiv, Neg, LessThan, LessEqual
 from hidet.ir.expr import NotEqual, Equal, IfThenElse, LogicalAnd, LogicalOr, LogicalNot, BitwiseAnd, BitwiseOr
 from hidet.ir.expr import BitwiseNot, BitwiseXor, LeftShift, RightShift
-from hidet.ir.expr import TensorSlice, TensorElement, Cast, Dereference, Address, Reference, Call, Let
+from hidet.ir.expr import TensorSlice, TensorElement, Cast, Dereference, Address, Reference, Call, Let, SymbolVar
 from hidet.ir.type import (
     OpaqueType,
     ReferenceType,
@@ -28,8 +31,11 @@ from hidet.ir.type import (
     StringType,
 )
 from hidet.ir.type import ArrayType, FuncType
+from hidet.ir.compute import TensorInput, ScalarInput, GridCompute, ReduceCompute, ArgReduceCompute
+from hidet.ir.layout import RowMajorLayout
+from hidet.ir.task import Task
 from hidet.ir.utils.hash_sum import HashSum
-from hidet.ir.functors import ExprFunctor, TypeFunctor, BaseFunctor
+from hidet.ir.functors import ExprFunctor, TypeFunctor, ComputeFunctor, BaseFunctor
 
 
 class ExprHash(ExprFunctor, TypeFunctor, BaseFunctor):
@@ -177,3 +183,215 @@ class ExprHash(ExprFunctor, TypeFunctor, BaseFunctor):
 
     def visit_OpaqueType(self, t: OpaqueType):
         return self(t.cpp_name) + hash(OpaqueType)
+
+
+class StructuralHash(ComputeFunctor, ExprFunctor, TypeFunctor, BaseFunctor):
+    """
+    Hash a task or an expression by its structure.
+
+    Different from :class:`ExprHash`, whose hash depends on the identity of the nodes and the python hash seed and is
+    only meaningful within one process, the structural hash only depends on the structure of the nodes. It is stable
+    across processes, and is much cheaper than hashing the printed text of the node. Each node is hashed to the sha256
+    digest of its kind and the digests of its children. The variables (and the input tensors and scalars) are hashed
+    by the order they are first visited, thus their hints and the names of the compute nodes do not affect the hash.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.num_vars: int = 0
+
+    def hash(self, node) -> str:
+        self.memo.clear()
+        self.num_vars = 0
+        return self(node).hex()
+
+    @staticmethod
+    def digest(kind: str, *children: bytes) -> bytes:
+        # the children are digests with fixed length, thus the concatenation is unambiguous
+        sha = sha256(kind.encode())
+        for child in children:
+            sha.update(child)
+        return sha.digest()
+
+    def new_var_index(self) -> bytes:
+        self.num_vars += 1
+        return self.visit(self.num_vars - 1)
+
+    def visit(self, node):
+        # BaseFunctor.visit memoizes the tuples by value, but (1,) == (True,) == (1.0,), and the lists and dicts by
+        # id, which is reused by the temporary containers once they are freed, thus do not memoize them
+        if isinstance(node, tuple):
+            return self.visit_Tuple(node)
+        if isinstance(node, list):
+            return self.visit_List(node)
+        if isinstance(node, dict):
+            return self.visit_Dict(node)
+        return super().visit(node)
+
+    def visit_PyConstant(self, c: Union[str, int, float, None]):
+        # hash(1) == hash(1.0) == hash(True), thus distinguish the python constants by their types
+        return self.digest(type(c).__name__, repr(c).encode())
+
+    def visit_Tuple(self, tp: Tuple):
+        return self.digest('tuple', *[self(v) for v in tp])
+
+    def visit_List(self, lst: List):
+        return self.digest('list', *[self(v) for v in lst])
+
+    def visit_Dict(self, d: Dict):
+        return self.digest('dict', *[self(k) + self(v) for k, v in d.items()])
+
+    def visit_NotDispatchedNode(self, n: Node):
+        raise NotImplementedError('Node {} is not supported for structural hashing.'.format(type(n).__name__))
+
+    def hash_text(self, obj: Any) -> bytes:
+        # the nodes that are not supported by the functors (e.g., the layouts and task attributes) are hashed by text
+        return self.visit(str(obj))
+
+    def visit_Task(self, task: Task):
+        return self.digest(
+            'Task',
+            self(task.name),
+            self(task.inputs),
+            self(task.outputs),
+            self({k: str(v) for k, v in task.attrs.items()}),
+            self([(expr, msg) for expr, msg in task.assertions]),
+            self([(tensor, im.axes, im.indices) for tensor, im in task.inverse_map.items()]),
+            self(task.share_map),
+        )
+
+    def visit_ScalarInput(self, node: ScalarInput):
+        return self.digest('ScalarInput', self.new_var_index(), self(node.dtype))
+
+    def visit_TensorInput(self, node: TensorInput):
+        return self.digest('TensorInput', self.new_var_index(), self(node.ttype))
+
+    def visit_GridCompute(self, node: GridCompute):
+        layout = self.hash_text(node.layout) if node.layout is not None else self(None)
+        return self.digest('GridCompute', self(node.shape), self(node.axes), self(node.value), layout)
+
+    def visit_ReduceCompute(self, node: ReduceCompute):
+        return self.digest(
+            'ReduceCompute',
+            self(node.shape),
+            self(node.axes),
+            self(node.value),
+            self.hash_text(node.reduce_operation),
+            self(node.accumulate_dtype),
+        )
+
+    def visit_ArgReduceCompute(self, node: ArgReduceCompute):
+        return self.digest(
+            'ArgReduceCompute',
+            self(node.extent),
+            self(node.axis),
+            self(node.value),
+            self.hash_text(node.reduce_operation),
+            self(node.index_dtype),
+        )
+
+    def visit_Var(self, e: Var):
+        if isinstance(e, SymbolVar):
+            return self.digest('SymbolVar', self(e.name), self(e.type))
+        # the name of a variable is used directly in codegen (e.g., the primitive functions), thus it is hashed
+        return self.digest('Var', self.new_var_index(), self(e.name), self(e.type))
+
+    def visit_Constant(self, e: Constant):
+        if isinstance(e.value, np.ndarray):
+            value = self.digest('ndarray', self(str(e.value.dtype)), self(e.value.shape), e.value.tobytes())
+        else:
+            value = self(e.value)
+        return self.digest('Constant', value, self(e.type))
+
+    def _visit_unary(self, e):
+        return self.digest(type(e).__name__, self(e.a))
+
+    def _visit_binary(self, e):
+        return self.digest(type(e).__name__, self(e.a), self(e.b))
+
+    visit_Add = visit_Sub = visit_Multiply = visit_Div = visit_Mod = visit_FloorDiv = _visit_binary
+    visit_LessThan = visit_LessEqual = visit_NotEqual = visit_Equal = _visit_binary
+    visit_And = visit_Or = visit_BitwiseAnd = visit_BitwiseOr = visit_BitwiseXor = _visit_binary
+    visit_LeftShift = visit_RightShift = _visit_binary
+    visit_Neg = visit_Not = visit_BitwiseNot = _visit_unary
+
+    def visit_IfThenElse(self, e: IfThenElse):
+        return self.digest('IfThenElse', self(e.cond), self(e.then_expr), self(e.else_expr))
+
+    def visit_TensorElement(self, e: TensorElement):
+        return self.digest('TensorElement', self(e.base), self(e.indices), self(e.protected))
+
+    def visit_TensorSlice(self, e: TensorSlice):
+        return self.digest('TensorSlice', self(e.base), self(e.indices), self(e.starts), self(e.ends))
+
+    def visit_Cast(self, e: Cast):
+        return self.digest('Cast', self(e.expr), self(e.target_type))
+
+    def visit_Dereference(self, e: Dereference):
+        return self.digest('Dereference', self(e.expr))
+
+    def visit_Address(self, e: Address):
+        return self.digest('Address', self(e.expr))
+
+    def visit_Reference(self, e: Reference):
+        return self.digest('Reference', self(e.expr))
+
+    def visit_Call(self, e: Call):
+        return self.digest('Call', self(e.func_var), self(e.args))
+
+    def visit_Let(self, e: Let):
+        return self.digest('Let', self(e.var), self(e.value), self(e.body))
+
+    def visit_PlaceholderExpr(self, e: PlaceholderExpr):
+        raise NotImplementedError('The pattern expressions are not supported for structural hashing.')
+
+    def visit_DataType(self, t: DataType):
+        return self.digest('DataType', self(t.name))
+
+    def visit_TensorType(self, t: TensorType):
+        if t.layout is None or isinstance(t.layout, RowMajorLayout):
+            layout = self(None)
+        else:
+            layout = self.hash_text(t.layout)
+        return self.digest('TensorType', self(t.dtype), self(t.shape), layout)
+
+    def visit_PointerType(self, t: PointerType):
+        return self.digest('PointerType', self(t.base_type))
+
+    def visit_TensorPointerType(self, t: TensorPointerType):
+        return self.digest('TensorPointerType', self(t.tensor_type))
+
+    def visit_ReferenceType(self, t: ReferenceType):
+        return self.digest('ReferenceType', self(t.base_type))
+
+    def visit_VoidType(self, t: VoidType):
+        return self.digest('VoidType')
+
+    def visit_StringType(self, t: StringType):
+        return self.digest('StringType')
+
+    def visit_ArrayType(self, t: ArrayType):
+        return self.digest('ArrayType', self(t.base_type), self(t.size))
+
+    def visit_FuncType(self, t: FuncType):
+        return self.digest('FuncType', self(t.param_types), self(t.ret_type))
+
+    def visit_OpaqueType(self, t: OpaqueType):
+        return self.digest('OpaqueType', self(t.cpp_name))
+
+
+def structural_hash(node: Union[Task, Node]) -> str:
+    """
+    Get the structural hash of a task or an expression.
+
+    Parameters
+    ----------
+    node: Union[Task, Node]
+        The task or expression to hash.
+
+    Returns
+    -------
+    ret: str
+        The hex digest of the structural hash. See :class:`StructuralHash` for details.
+    """
+    return StructuralHash().hash(node)
@@ -16,6 +16,36 @@ import os
 import subprocess
 import tomlkit
 
+# the options of the kernel caches and the build pipeline, exposed as hidet.option.<name>
+from hidet.build_option import register_build_options
+from hidet.build_option import (  # pylint: disable=unused-import
+    tuning_budget,
+    get_tuning_budget,
+    cache_index,
+    get_cache_index,
+    reuse_graph_kernels,
+    get_reuse_graph_kernels,
+    cache_compiled_objects,
+    get_cache_compiled_objects,
+    precompiled_header,
+    get_precompiled_header,
+    cache_size_limit,
+    get_cache_size_limit,
+    compiled_task_cache_capacity,
+    get_compiled_task_cache_capacity,
+    compiled_graph_cache_capacity,
+    get_compiled_graph_cache_capacity,
+    persistent_worker_pool,
+    get_persistent_worker_pool,
+    nested_parallel_limit,
+    get_nested_parallel_limit,
+    unity_build,
+    get_unity_build,
+    get_unity_build_max_candidates,
+    compile_profile,
+    get_compile_profile,
+)
+
 
 class OptionRegistry:
     registered_options: Dict[str, OptionRegistry] = {}
@@ -83,7 +113,12 @@ def create_toml_doc() -> tomlkit.TOMLDocument:
                 toml_doc.add(tomlkit.comment(v.description))
                 if v.choices is not None:
                     toml_doc.add(tomlkit.comment(f'  choices: {v.choices}'))
-                if isinstance(v.default_value, (bool, int, float, str)):
+                if v.default_value is None or (
+                    isinstance(v.default_value, Tuple) and any(item is None for item in v.default_value)
+                ):
+                    # toml can not represent None, leave the option unset
+                    toml_doc.add(tomlkit.comment(f'{k} = {v.default_value}'))
+                elif isinstance(v.default_value, (bool, int, float, str)):
                     toml_doc.add(k, v.default_value)
                 elif isinstance(v.default_value, Tuple):
                     # represent tuples are toml arrays, do not allow python lists are default values to avoid ambiguity
@@ -319,6 +354,13 @@ def register_hidet_options():
         default_value=96,
         description='The number of worker processes of the compile server.',
     )
+    register_option(
+        name='compile_server.nested_parallel_limit',
+        type_hint='int',
+        default_value=3,
+        description='The maximum number of builds that can use nested (second level) parallelism at the same time '
+        'when the compile server is enabled.',
+    )
     register_option(
         name='cuda.arch',
         type_hint='str',
@@ -414,6 +456,8 @@ def register_hidet_options():
         description='Applicable when using torch.compile only. Use `example_inputs` shapes instead of fx.graph shapes.',
     )
 
+    register_build_options()
+
     # Load hidet config
     config_file_path = os.path.join(os.path.expanduser('~'), '.config', 'hidet', 'hidet.toml')
     if os.path.exists(config_file_path):
@@ -1491,6 +1535,32 @@ class compile_server:
         """
         return OptionContext.current().get_option('compile_server.num_workers')
 
+    @staticmethod
+    def nested_parallel_limit(limit: int = 3):
+        """
+        Set the maximum number of builds that can use the nested (second level) parallelism at the same time when
+        the compile server is enabled.
+
+        Parameters
+        ----------
+        limit: int
+            The maximum number of builds that can use the nested parallelism at the same time.
+        """
+        OptionContext.current().set_option('compile_server.nested_parallel_limit', limit)
+
+    @staticmethod
+    def get_nested_parallel_limit() -> int:
+        """
+        Get the maximum number of builds that can use the nested (second level) parallelism at the same time when
+        the compile server is enabled.
+
+        Returns
+        -------
+        ret: int
+            The maximum number of builds that can use the nested parallelism at the same time.
+        """
+        return OptionContext.current().get_option('compile_server.nested_parallel_limit')
+
 
 class internal:
     """
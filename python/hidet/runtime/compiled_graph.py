@@ -9,13 +9,23 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-from typing import List, Optional, Tuple, Dict, Any, Callable, Union
+from typing import List, Optional, Tuple, Dict, Any, Callable, Union, Deque
 import zipfile
+import struct
 import os
 import json
+import time
+import ctypes
+import functools
+import collections
+import contextlib
+import threading
+import queue
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 import warnings
 import tempfile
+import shutil
 
 from tabulate import tabulate
 import numpy
@@ -25,17 +35,39 @@ from hidet.ffi.array import Array
 from hidet.ir.type import void_p, data_type
 from hidet.ir.dtypes import i32, i64
 from hidet.runtime.device import Device
-from hidet.runtime.compiled_module import CompiledModule
-from hidet.runtime.compiled_task import CompiledTask, TensorSignature, _check_inputs
+from hidet.runtime.compiled_module import CompiledModule, compiled_module_exists
+from hidet.runtime.compiled_task import CompiledTask, preload_compiled_tasks, TensorSignature, _check_inputs
+from hidet.runtime.compiled_task import compiled_task_cache
 from hidet.runtime.storage import Storage
 from hidet.ffi import runtime_api
 from hidet.utils.py import prod, median
 from hidet.utils.trace_utils import TraceEventEmitter
+from hidet.utils.cache_manager import pin_cache_entry, unpin_cache_entry, touch_cache_entry, add_cache_entry_referrer
 from hidet.runtime.utils.dispatch_table import GraphIntervalDispatchTable, GraphPointsDispatchTable
 
 ModelExecutionHook = Callable[[int, List['Tensor'], List['Tensor']], None]
 global_cuda_workspace: Optional[Storage] = None
 
+# the weights are saved as a json index (weights.json) and a single raw blob (weights.bin), where each weight starts
+# at an offset aligned to WEIGHTS_ALIGNMENT. The blob is stored uncompressed and page-aligned in the zip file, so that
+# it can be memory-mapped directly from the zip file without extracting or copying it.
+WEIGHTS_INDEX = 'weights.json'
+WEIGHTS_BLOB = 'weights.bin'
+WEIGHTS_ALIGNMENT = 64
+WEIGHTS_BLOB_ALIGNMENT = 4096
+# the chunk size used to copy the memory-mapped weights to the device
+WEIGHTS_COPY_CHUNK_BYTES = 64 * 1024 * 1024
+# the chunk size used to stream the files and weights to the zip file when saving a compiled graph
+SAVE_CHUNK_BYTES = 16 * 1024 * 1024
+# the types of entries in the saved compiled graph, each type can be compressed with its own method
+SAVE_ENTRY_TYPES = ['weights', 'modules', 'metadata']
+# the manifest of the files extracted from a compiled graph archive to its cache directory
+MANIFEST_NAME = '.manifest.json'
+# the references of the kernels that are not embedded in the compiled graph archive but shared via the operator cache
+SHARED_KERNELS_NAME = 'shared_kernels.json'
+# the files and directories updated at runtime (e.g., by tuning the dynamic shapes), not verified by the manifest
+RUNTIME_MUTABLE_FILES = ['dispatch_table.txt', 'candidates.json', 'reports']
+
 
 class ExternalStorage(Storage):
     def __init__(self, device: str, addr: int, num_bytes: int):
@@ -69,6 +101,187 @@ class GraphExecution:
     tensor_device: List[str]
 
 
+class StaticCallPlan:
+    """
+    The precomputed plan to run a compiled graph whose shapes are all static.
+
+    The plan resolves everything about a call that does not depend on the input tensors once: the recipe to create
+    (or forward) each output, the signatures to check the inputs against, the workspace sizes and the kernel array
+    of the dispatch table. A call then only checks the inputs, creates the outputs (or takes them from the caller or
+    the output ring of the graph) and passes the addresses of the tensors to the launch function of the graph module.
+
+    The plan is also used to place the outputs of the first call, which is interpreted, to the caller-provided output
+    tensors, thus it can be created before the kernels are dispatched.
+
+    Parameters
+    ----------
+    graph: CompiledGraph
+        The compiled graph with static shapes, its weights set and its kernels dispatched.
+    """
+
+    # the kinds of output recipes
+    INPUT = 0  # the graph returns an input tensor
+    WEIGHT = 1  # the graph returns a weight tensor
+    ALIAS = 2  # the graph returns the same tensor as a previous output
+    NEW = 3  # the output tensor is created
+    SHARE = 4  # the output tensor shares the storage with an input tensor
+
+    def __init__(self, graph: 'CompiledGraph'):
+        import torch
+        from hidet.graph.tensor import Tensor
+        from hidet.graph.frontend.torch.utils import dtype_to_torch
+
+        self.graph: CompiledGraph = graph
+        # resolve the classes and functions used by each call once
+        self.tensor_cls = Tensor
+        self.torch_empty = torch.empty
+        exe = graph.graph_execution
+
+        def signature(sig: TensorSignature):
+            # the (device kind, dtype, torch dtype, shape) of a tensor, used to check the tensors quickly
+            dtype = data_type(sig.dtype)
+            return sig.device.partition(':')[0], dtype, dtype_to_torch(dtype), tuple(int(d) for d in sig.shape)
+
+        self.input_signatures: List[Tuple[str, Any, Any, Tuple[int, ...]]] = [signature(s) for s in graph.meta.inputs]
+
+        # the recipe of each output: (kind, argument)
+        self.output_recipes: List[Tuple[int, Any]] = []
+        exec_idx_to_output_idx: Dict[int, int] = {}
+        for output_index, (exec_idx, sig) in enumerate(zip(exe.outputs_index, graph.meta.outputs)):
+            shape = [int(d) for d in sig.shape]
+            dtype = data_type(sig.dtype)
+            device = hidet.runtime.device.device(sig.device)
+            if exec_idx in exe.inputs_index:
+                recipe = (self.INPUT, exe.inputs_index.index(exec_idx))
+            elif exec_idx in exe.weights_index:
+                recipe = (self.WEIGHT, exe.weights_index.index(exec_idx))
+            elif exec_idx in exec_idx_to_output_idx:
+                recipe = (self.ALIAS, exec_idx_to_output_idx[exec_idx])
+            elif output_index in graph.meta.share_map:
+                recipe = (self.SHARE, (graph.meta.share_map[output_index], shape, dtype, device))
+            else:
+                torch_args = {'size': shape, 'dtype': dtype_to_torch(dtype), 'device': torch.device(sig.device)}
+                recipe = (self.NEW, (shape, dtype.nbytes * prod(shape), dtype, device, torch_args))
+            if recipe[0] in (self.SHARE, self.NEW):
+                exec_idx_to_output_idx[exec_idx] = output_index
+            self.output_recipes.append(recipe)
+
+        # the outputs created by the graph, only these outputs can be provided by the caller or recycled
+        self.new_output_indices: List[int] = [i for i, (kind, _) in enumerate(self.output_recipes) if kind == self.NEW]
+        self.new_output_signatures = [signature(graph.meta.outputs[i]) for i in self.new_output_indices]
+
+        # the kernel array of the dispatch table, resolved on the first run and kept alive by the dispatch table
+        self.kernel_array_addr: Optional[int] = None
+
+    def tensor_matches(self, sig, tensor) -> bool:
+        device_kind, dtype, torch_dtype, shape = sig
+        if isinstance(tensor, self.tensor_cls):
+            return tensor.device.kind == device_kind and tensor.dtype == dtype and tensor.shape == shape
+        return tensor.device.type == device_kind and tensor.dtype == torch_dtype and tuple(tensor.shape) == shape
+
+    def inputs_match(self, inputs) -> bool:
+        if len(inputs) != len(self.input_signatures):
+            return False
+        return all(self.tensor_matches(sig, tensor) for sig, tensor in zip(self.input_signatures, inputs))
+
+    def output_buffers(self, outputs) -> List[Any]:
+        """
+        Check the caller-provided outputs, and get the tensors to use as the outputs created by the graph.
+        """
+        if len(outputs) != len(self.output_recipes):
+            raise ValueError('Expect {} outputs, got {}.'.format(len(self.output_recipes), len(outputs)))
+        buffers = []
+        for output_index, sig in zip(self.new_output_indices, self.new_output_signatures):
+            tensor = outputs[output_index]
+            if tensor is not None:
+                if not isinstance(tensor, self.tensor_cls) and not tensor.is_contiguous():
+                    raise ValueError('Expect output {} to be contiguous.'.format(output_index))
+                if not self.tensor_matches(sig, tensor):
+                    raise ValueError(
+                        'Expect output {} to be a tensor on {} with dtype {} and shape {}, got {}.'.format(
+                            output_index, sig[0], sig[1].name, list(sig[3]), tensor
+                        )
+                    )
+            buffers.append(tensor)
+        return buffers
+
+    def copy_to_outputs(self, results, outputs) -> List[Any]:
+        """
+        Copy the results of a call to the caller-provided outputs.
+        """
+        Tensor = self.tensor_cls
+        ret = list(results)
+        for output_index, buffer in zip(self.new_output_indices, self.output_buffers(outputs)):
+            if buffer is not None:
+                dst = buffer.torch() if isinstance(buffer, Tensor) else buffer
+                src = results[output_index]
+                dst.copy_(src.torch() if isinstance(src, Tensor) else src)
+                ret[output_index] = buffer
+        for output_index, (kind, arg) in enumerate(self.output_recipes):
+            if kind == self.ALIAS:
+                ret[output_index] = ret[arg]
+        return ret
+
+    def create_outputs(self, inputs, output_to_torch_tensor: bool, buffers: Optional[List[Any]] = None):
+        Tensor = self.tensor_cls
+        graph = self.graph
+        outputs = []
+        new_index = 0
+        for kind, arg in self.output_recipes:
+            if kind == self.NEW:
+                shape, nbytes, dtype, device, torch_args = arg
+                buffer = buffers[new_index] if buffers is not None else None
+                new_index += 1
+                if buffer is not None:
+                    outputs.append(buffer)
+                elif output_to_torch_tensor:
+                    outputs.append(self.torch_empty(**torch_args))
+                else:
+                    storage = Storage.new(device, nbytes)
+                    outputs.append(Tensor(shape=shape, dtype=dtype, device=device, storage=storage))
+            elif kind == self.INPUT:
+                outputs.append(inputs[arg])
+            elif kind == self.WEIGHT:
+                outputs.append(graph.weights_torch[arg] if output_to_torch_tensor else graph.weights[arg])
+            elif kind == self.ALIAS:
+                outputs.append(outputs[arg])
+            else:
+                input_index, shape, dtype, device = arg
+                if output_to_torch_tensor:
+                    outputs.append(inputs[input_index].view(shape))
+                else:
+                    storage = inputs[input_index].storage
+                    outputs.append(Tensor(shape=shape, dtype=dtype, device=device, storage=storage))
+        return outputs
+
+    def run(self, inputs, output_to_torch_tensor: bool, outputs=None):
+        Tensor = self.tensor_cls
+        graph = self.graph
+        if hidet.option.get_runtime_check() and not self.inputs_match(inputs):
+            # report the mismatch with the detailed message
+            _check_inputs(graph.meta.inputs, inputs)
+
+        if outputs is not None:
+            buffers = self.output_buffers(outputs)
+        else:
+            # reuse the released outputs in the output ring of the graph, if any
+            free_outputs = graph._free_outputs[output_to_torch_tensor]  # pylint: disable=protected-access
+            buffers = free_outputs.popleft() if len(free_outputs) > 0 else None
+        outputs = self.create_outputs(inputs, output_to_torch_tensor, buffers)
+        graph._prepare_workspace()  # pylint: disable=protected-access
+
+        if self.kernel_array_addr is None:
+            self.kernel_array_addr = graph.dispatch_table[()].data_ptr()
+        args = [*inputs, *outputs]
+        cargs = [arg.storage.addr if isinstance(arg, Tensor) else arg.data_ptr() for arg in args]
+        cargs.append(self.kernel_array_addr)
+        graph._launch.call_converted(cargs, args)  # pylint: disable=protected-access
+
+        global global_cuda_workspace
+        global_cuda_workspace = None
+        return outputs
+
+
 class CompiledGraph:
     """
     A compiled graph that can be directly called in Python.
@@ -133,6 +346,7 @@ class CompiledGraph:
 
         # runtime state
         self.working_dir: str = hidet.utils.cache_file('graphs', self.meta.graph_hash)
+        pin_cache_entry(self.working_dir)
         self.dispatch_table_path = hidet.utils.cache_file('graphs', self.meta.graph_hash, 'dispatch_table.txt')
         self._dispatch_table: Union[GraphPointsDispatchTable, GraphIntervalDispatchTable] = (
             self._construct_dispatch_table()
@@ -140,6 +354,11 @@ class CompiledGraph:
         self.cpu_workspace: Optional[Storage] = None
         self.cuda_workspace: Optional[Storage] = None
         self.hip_workspace: Optional[Storage] = None
+        # the plan of the calls with static shapes, created on the first call that takes the fast path
+        self._call_plan: Optional[StaticCallPlan] = None
+        # the output ring: the released outputs that can be reused, for hidet (False) and torch (True) outputs
+        self._output_ring_size: int = 0
+        self._free_outputs: Dict[bool, Deque[List[Any]]] = {False: collections.deque(), True: collections.deque()}
 
         if len(self.weights) == len(graph_execution.weights_index):
             # the weights are already loaded, initialize the graph directly
@@ -160,6 +379,11 @@ class CompiledGraph:
                 f.write(state)
             self.__dict__.update(load_compiled_graph(temp_file.name).__dict__)
 
+    def __del__(self):
+        # allow the graph directory to be evicted once the compiled graph is released
+        if getattr(self, 'working_dir', None) is not None:
+            unpin_cache_entry(self.working_dir)
+
     def __str__(self):
         """
         Get the basic information of this compiled graph.
@@ -220,6 +444,7 @@ class CompiledGraph:
             self.is_dynamic = True
         else:
             self.is_dynamic = False
+        self._symbol_slots = runtime_api.symbol_slots([name for name, _ in self.dynamic_dims])
 
     def _init_compiled_graph(self):
         # initialize weights
@@ -242,11 +467,10 @@ class CompiledGraph:
         return GraphPointsDispatchTable(self)
 
     def _update_symbol_dims(self, inputs) -> Tuple[int, ...]:
-        symbol_dims = []
-        for name, (tensor_index, dim_index) in self.dynamic_dims:
-            symbol_dims.append(inputs[tensor_index].shape[dim_index])
-            runtime_api.set_symbol_value(name, symbol_dims[-1])
-        return tuple(symbol_dims)
+        symbol_dims = tuple(inputs[tensor_index].shape[dim_index] for _, (tensor_index, dim_index) in self.dynamic_dims)
+        if symbol_dims:
+            self._symbol_slots.set_values(symbol_dims)
+        return symbol_dims
 
     def _create_outputs(self, inputs, output_to_torch_tensor):
         from torch import empty as torch_empty
@@ -321,11 +545,13 @@ class CompiledGraph:
             self._set_workspace(0, self.cpu_workspace.addr)
 
         global global_cuda_workspace
-        if global_cuda_workspace is not None and global_cuda_workspace.nbytes < required_cuda_workspace:
-            global_cuda_workspace = None
-        if global_cuda_workspace is None:
-            global_cuda_workspace = torch.empty(required_cuda_workspace, dtype=torch.uint8, device='cuda')
-        self._set_workspace(1, global_cuda_workspace.data_ptr())
+        if required_cuda_workspace > 0:
+            # the graphs without cuda kernels (e.g., cpu graphs) do not need the cuda workspace
+            if global_cuda_workspace is not None and global_cuda_workspace.nbytes < required_cuda_workspace:
+                global_cuda_workspace = None
+            if global_cuda_workspace is None:
+                global_cuda_workspace = torch.empty(required_cuda_workspace, dtype=torch.uint8, device='cuda')
+            self._set_workspace(1, global_cuda_workspace.data_ptr())
 
         if hidet.hip.available() and (
             self.hip_workspace is None or self.hip_workspace.num_bytes < required_hip_workspace
@@ -333,7 +559,12 @@ class CompiledGraph:
             self.hip_workspace = Storage.new('hip', required_hip_workspace)
             self._set_workspace(2, self.hip_workspace.addr)
 
-    def _run_fast_path(self, inputs, symbol_dims: Tuple[int, ...], output_to_torch_tensor):
+    def _run_fast_path(self, inputs, symbol_dims: Tuple[int, ...], output_to_torch_tensor, outputs=None):
+        if not self.is_dynamic:
+            # all the later calls with static shapes go through the precomputed plan
+            self._call_plan = StaticCallPlan(self)
+            return self._call_plan.run(inputs, output_to_torch_tensor, outputs)
+
         # create output tensors
         outputs = self._create_outputs(inputs, output_to_torch_tensor)
 
@@ -406,6 +637,20 @@ class CompiledGraph:
     def get_cache_dir(self):
         return hidet.utils.cache_dir('graphs', self.meta.graph_hash)
 
+    def preload(self, num_threads: Optional[int] = None):
+        """
+        Load the kernels of the compiled graph in parallel threads.
+
+        The kernels of a loaded compiled graph (see :func:`load_compiled_graph`) are loaded on their first use. Call
+        this method to load all of them ahead of time, e.g., before serving the first request.
+
+        Parameters
+        ----------
+        num_threads: Optional[int]
+            The number of threads to use. None to use the default number of threads of ThreadPoolExecutor.
+        """
+        preload_compiled_tasks(self.compiled_tasks, num_threads)
+
     @property
     def dispatch_table(self):
         if self._dispatch_table is None:
@@ -414,6 +659,7 @@ class CompiledGraph:
 
     def clear_dispatch_table(self):
         self._dispatch_table = None
+        self._call_plan = None
 
     def set_weights(self, weights):
         """
@@ -445,9 +691,11 @@ class CompiledGraph:
                     'Expect weight {} to be on device {}, got {}.'.format(idx, expected_device, weight.device)
                 )
         self.weights = weights
+        self.weights_torch = [w.torch() for w in weights]
+        self._call_plan = None
         self._init_compiled_graph()
 
-    def run_async(self, inputs, output_to_torch_tensor=False):
+    def run_async(self, inputs, output_to_torch_tensor=False, outputs=None):
         """
         Run the model asynchronously.
 
@@ -456,11 +704,26 @@ class CompiledGraph:
         inputs: Sequence[hidet.Tensor]
             The input tensors.
 
+        output_to_torch_tensor: bool
+            Whether to create the output tensors as torch tensors.
+
+        outputs: Optional[Sequence[Optional[Union[hidet.Tensor, torch.Tensor]]]]
+            The caller-provided tensors to store the outputs, one for each output of the graph, only supported for
+            the graphs with static shapes. The provided tensors must be contiguous and match the shapes, dtypes and
+            devices of the outputs. The outputs that are the inputs or weights of the graph, or share the storage
+            with the inputs, are not written by the graph, and their provided tensors are ignored. An output given
+            as None is created as usual.
+
         Returns
         -------
         ret: List[hidet.Tensor]
             The output tensors.
         """
+        if self._call_plan is not None:
+            return self._call_plan.run(inputs, output_to_torch_tensor, outputs)
+        if outputs is not None and self.is_dynamic:
+            raise ValueError('The caller-provided outputs are only supported for the graphs with static shapes.')
+
         if hidet.option.get_runtime_check():
             _check_inputs(self.meta.inputs, inputs)
         if len(self.weights) != len(self.graph_execution.weights_index):
@@ -472,9 +735,54 @@ class CompiledGraph:
             res = self._run_slow_path(inputs, symbol_dims)
             if output_to_torch_tensor:
                 res = [tensor.torch() if isinstance(tensor, hidet.Tensor) else tensor for tensor in res]
+            if outputs is not None:
+                res = StaticCallPlan(self).copy_to_outputs(res, outputs)
             return res
 
-        return self._run_fast_path(inputs, symbol_dims, output_to_torch_tensor)
+        return self._run_fast_path(inputs, symbol_dims, output_to_torch_tensor, outputs)
+
+    def set_output_ring(self, size: int):
+        """
+        Set the size of the output ring of the graph.
+
+        When the size is positive, the outputs released by :meth:`release_outputs` are kept in a ring of at most
+        `size` sets of outputs, and reused by the following calls instead of allocating new output tensors. Only the
+        graphs with static shapes use the ring. Set the size to 0 to disable the ring and drop the kept outputs.
+
+        Parameters
+        ----------
+        size: int
+            The maximum number of released sets of outputs to keep.
+        """
+        if size < 0:
+            raise ValueError('Expect a non-negative size of the output ring, got {}.'.format(size))
+        self._output_ring_size = size
+        for free_outputs in self._free_outputs.values():
+            while len(free_outputs) > size:
+                free_outputs.pop()
+
+    def release_outputs(self, outputs):
+        """
+        Declare that the outputs of a previous call are no longer used by the caller.
+
+        When the output ring is enabled (see :meth:`set_output_ring`), the tensors created for these outputs are put
+        into the ring and reused as the outputs of a following call, otherwise this method does nothing. The caller
+        must not access the released tensors any more, and must release the outputs of a call at most once. For the
+        outputs on cuda devices, the caller should make sure the work using them has been finished or will be
+        ordered before the following calls on the same stream.
+
+        Parameters
+        ----------
+        outputs: Sequence[Union[hidet.Tensor, torch.Tensor]]
+            The outputs returned by a previous call of this graph.
+        """
+        plan = self._call_plan
+        if self._output_ring_size == 0 or plan is None or len(plan.new_output_indices) == 0:
+            return
+        buffers = [outputs[i] for i in plan.new_output_indices]
+        free_outputs = self._free_outputs[not isinstance(buffers[0], hidet.Tensor)]
+        if len(free_outputs) < self._output_ring_size and all(buffers[0] is not b[0] for b in free_outputs):
+            free_outputs.append(buffers)
 
     def cuda_graph(self, *args):
         """
@@ -588,7 +896,14 @@ class CompiledGraph:
 
         return HipGraph(f_create_inputs, f_run, ref_objs=[self])
 
-    def save(self, path: str, save_dispatch_table: bool = False):
+    def save(
+        self,
+        path: str,
+        save_dispatch_table: bool = False,
+        compression: Union[str, Dict[str, str]] = 'store',
+        num_workers: int = 1,
+        share_kernels: bool = False,
+    ):
         """
         Save the compiled graph to disk.
 
@@ -603,14 +918,219 @@ class CompiledGraph:
 
         save_dispatch_table:
             Whether to save the dispatch table to disk. See `save_compiled_graph` for details.
+
+        compression: Union[str, Dict[str, str]]
+            The compression of the entries in the saved file. See `save_compiled_graph` for details.
+
+        num_workers: int
+            The number of threads used to read the entries. See `save_compiled_graph` for details.
+
+        share_kernels: bool
+            Whether to reference the kernels in the operator cache instead of embedding them. See
+            `save_compiled_graph` for details.
         """
-        save_compiled_graph(self, path, save_dispatch_table)
+        save_compiled_graph(
+            self,
+            path,
+            save_dispatch_table=save_dispatch_table,
+            compression=compression,
+            num_workers=num_workers,
+            share_kernels=share_kernels,
+        )
+
 
+def _align(offset: int, alignment: int) -> int:
+    return (offset + alignment - 1) // alignment * alignment
 
-def save_compiled_graph(model: CompiledGraph, file: str, save_dispatch_table: bool = False, save_weights: bool = True):
+
+class _ZipEntry:
+    def __init__(
+        self, name: str, compress_type: int, chunks: List[Callable[[], Any]], file_size: int, alignment: int = 0
+    ):
+        self.name: str = name
+        self.compress_type: int = compress_type
+        # each chunk is a function that returns the next bytes-like object of the entry
+        self.chunks: List[Callable[[], Any]] = chunks
+        self.file_size: int = file_size
+        # if not zero, the data of the entry starts at an offset aligned to it in the zip file (requires ZIP_STORED)
+        self.alignment: int = alignment
+
+    def zip_info(self, offset: int) -> zipfile.ZipInfo:
+        zinfo = zipfile.ZipInfo(self.name, date_time=time.localtime(time.time())[:6])
+        zinfo.compress_type = self.compress_type
+        zinfo.external_attr = 0o600 << 16
+        zinfo.file_size = self.file_size
+        if self.alignment > 0:
+            # pad the local file header with an extra field so that the data of the entry starts at an aligned offset
+            # the local file header contains 30 fixed bytes, the file name, the zip64 extra field (20 bytes) and our
+            # padding field (at least 4 bytes)
+            header_bytes = 30 + len(self.name.encode('utf-8')) + 20 + 4
+            padding = -(offset + header_bytes) % self.alignment
+            zinfo.extra = struct.pack('<HH', 0xD935, padding) + bytes(padding)
+        return zinfo
+
+
+def _bytes_entry(name: str, data: bytes, compress_type: int) -> _ZipEntry:
+    return _ZipEntry(name, compress_type, chunks=[lambda: data], file_size=len(data))
+
+
+def _file_entry(name: str, file_path: str, compress_type: int) -> _ZipEntry:
+    def read_chunk(offset: int):
+        with open(file_path, 'rb') as f:
+            f.seek(offset)
+            return f.read(SAVE_CHUNK_BYTES)
+
+    file_size = os.path.getsize(file_path)
+    offsets = range(0, file_size, SAVE_CHUNK_BYTES)
+    return _ZipEntry(name, compress_type, [functools.partial(read_chunk, offset) for offset in offsets], file_size)
+
+
+def _dir_entries(dir_path: str, dir_in_zip: str, compress_type: int) -> List[_ZipEntry]:
+    entries = []
+    for root, _, files in os.walk(dir_path):
+        for file in files:
+            file_path = os.path.join(root, file)
+            file_in_zip = os.path.join(dir_in_zip, os.path.relpath(file_path, dir_path))
+            entries.append(_file_entry(file_in_zip, file_path, compress_type))
+    return entries
+
+
+def _weight_chunks(weight: 'Tensor') -> List[Callable[[], Any]]:
+    nbytes = int(weight.nbytes)
+
+    def read_chunk(offset: int):
+        size = min(SAVE_CHUNK_BYTES, nbytes - offset)
+        if weight.device.is_cpu():
+            return (ctypes.c_char * size).from_address(weight.storage.addr + offset)
+        # stage the chunk of the device weight in host memory
+        buffer = numpy.empty([size], dtype=numpy.uint8)
+        memcpy = hidet.cuda.memcpy if weight.device.is_cuda() else hidet.hip.memcpy
+        with weight.device:
+            memcpy(buffer.ctypes.data, weight.storage.addr + offset, size)
+        return buffer
+
+    return [functools.partial(read_chunk, offset) for offset in range(0, nbytes, SAVE_CHUNK_BYTES)]
+
+
+def _weights_entries(weights: List['Tensor'], compression: Dict[str, int]) -> List[_ZipEntry]:
+    index = []
+    chunks = []
+    offset = 0
+    for weight in weights:
+        if not (weight.device.is_cpu() or weight.device.is_cuda() or weight.device.is_hip()):
+            weight = weight.cpu()
+        padding = _align(offset, WEIGHTS_ALIGNMENT) - offset
+        if padding > 0:
+            chunks.append(functools.partial(bytes, padding))
+        offset += padding
+        shape = [int(d) for d in weight.shape]
+        index.append({'dtype': weight.dtype.name, 'shape': shape, 'offset': offset, 'nbytes': int(weight.nbytes)})
+        chunks.extend(_weight_chunks(weight))
+        offset += int(weight.nbytes)
+    index_bytes = json.dumps({'alignment': WEIGHTS_ALIGNMENT, 'weights': index}, indent=4).encode('utf-8')
+    return [
+        _bytes_entry(WEIGHTS_INDEX, index_bytes, compression['metadata']),
+        _ZipEntry(WEIGHTS_BLOB, compression['weights'], chunks, file_size=offset, alignment=WEIGHTS_BLOB_ALIGNMENT),
+    ]
+
+
+def _iter_chunks(entries: List[_ZipEntry], num_workers: int):
+    chunks = (chunk for entry in entries for chunk in entry.chunks)
+    if num_workers <= 1:
+        for chunk in chunks:
+            yield chunk()
+        return
+    # read the chunks ahead in worker threads while the current chunk is compressed and written, and bound the number
+    # of chunks in flight to bound the memory usage
+    with ThreadPoolExecutor(max_workers=num_workers) as executor:
+        pending = collections.deque()
+        for chunk in chunks:
+            pending.append(executor.submit(chunk))
+            if len(pending) >= 2 * num_workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def _write_entries(zf: zipfile.ZipFile, entries: List[_ZipEntry], num_workers: int):
+    chunks = _iter_chunks(entries, num_workers)
+    for entry in entries:
+        # zip.open(..., force_zip64=True) is required for >4GB entries, and the aligned entries always use zip64 to
+        # get a predictable size of the local file header
+        force_zip64 = entry.alignment > 0 or entry.file_size * 1.05 > zipfile.ZIP64_LIMIT
+        with zf.open(entry.zip_info(zf.fp.tell()), 'w', force_zip64=force_zip64) as f:
+            for _ in entry.chunks:
+                f.write(next(chunks))
+
+
+def _resolve_compression(compression: Union[str, Dict[str, str]]) -> Dict[str, int]:
+    compress_types = {'store': zipfile.ZIP_STORED, 'deflate': zipfile.ZIP_DEFLATED}
+    if isinstance(compression, str):
+        compression = {entry_type: compression for entry_type in SAVE_ENTRY_TYPES}
+    for entry_type, method in compression.items():
+        if entry_type not in SAVE_ENTRY_TYPES:
+            raise ValueError(
+                'Unknown entry type {}, candidates: {}.'.format(repr(entry_type), ', '.join(SAVE_ENTRY_TYPES))
+            )
+        if method not in compress_types:
+            raise ValueError(
+                'Unknown compression {}, candidates: {}.'.format(repr(method), ', '.join(compress_types.keys()))
+            )
+    return {entry_type: compress_types[compression.get(entry_type, 'store')] for entry_type in SAVE_ENTRY_TYPES}
+
+
+def _shared_kernel_ref(task_dir: str) -> Optional[Dict[str, Any]]:
+    # the kernels in the operator cache are at <cache_dir>/ops/<target>_space_<space>/<task name>/<task hash>
+    # (see hidet.drivers.build_task), other kernels (e.g., those of a loaded compiled graph) can not be shared
+    ops_dir = os.path.abspath(os.path.join(hidet.option.get_cache_dir(), 'ops'))
+    parts = os.path.relpath(os.path.abspath(task_dir), ops_dir).split(os.sep)
+    if len(parts) != 3 or parts[0] == os.pardir or '_space_' not in parts[0]:
+        return None
+    target, space = parts[0].rsplit('_space_', 1)
+    return {'target': target, 'space': int(space), 'name': parts[1], 'task_hash': parts[2]}
+
+
+def _load_shared_kernel(ref: Dict[str, Any]) -> CompiledTask:
+    # the compiled task is shared with the other graphs (and tasks built in this process) via the compiled task cache
+    target, space, task_hash = ref['target'], ref['space'], ref['task_hash']
+    compiled_task = compiled_task_cache.get(target, space, task_hash)
+    if compiled_task is not None:
+        return compiled_task
+    task_dir = os.path.join(
+        hidet.option.get_cache_dir(), 'ops', '{}_space_{}'.format(target, space), ref['name'], task_hash
+    )
+    version_path = os.path.join(task_dir, 'version.txt')
+    version = None
+    if os.path.exists(version_path):
+        with open(version_path, 'r') as f:
+            version = f.read().strip()
+    if version != hidet.__version__ or not compiled_module_exists(task_dir):
+        raise RuntimeError(
+            'The shared kernel {} is not found in the operator cache: {}. The compiled graph saved with '
+            'share_kernels=True can only be loaded with the operator cache that contains its kernels.'.format(
+                ref['name'], task_dir
+            )
+        )
+    compiled_task = CompiledTask(task_dir=task_dir, lazy=True)
+    compiled_task_cache.add(target, space, task_hash, compiled_task)
+    return compiled_task
+
+
+def save_compiled_graph(
+    model: CompiledGraph,
+    file: str,
+    save_dispatch_table: bool = False,
+    save_weights: bool = True,
+    compression: Union[str, Dict[str, str]] = 'store',
+    num_workers: int = 1,
+    share_kernels: bool = False,
+):
     """
     Save the compiled graph to disk.
 
+    The files and weights are streamed to the zip file chunk by chunk, thus the peak memory usage does not grow with
+    the size of the model.
+
     Parameters
     ----------
     model: CompiledGraph
@@ -634,9 +1154,73 @@ def save_compiled_graph(model: CompiledGraph, file: str, save_dispatch_table: bo
         weights separately. This is useful when we want to save the weights separately.
 
         Default: True
+
+    compression: Union[str, Dict[str, str]]
+        The compression of the entries, either 'store' (no compression) or 'deflate'. It can be a single method for
+        all entries, or a dict that maps the entry types to the methods, where the entry types are 'weights' (the
+        weights blob), 'modules' (the compiled graph module and kernels) and 'metadata' (the others). The entry types
+        not in the dict are stored. The weights can only be memory-mapped when loading if they are stored.
+
+        Default: 'store'
+
+    num_workers: int
+        The number of threads used to read the files and copy the weights to host memory ahead of writing them. When
+        it is 1, the entries are read in the calling thread.
+
+        Default: 1
+
+    share_kernels: bool
+        Whether to reference the kernels in the operator cache by their task hashes instead of embedding them in the
+        saved file, where only the kernels that are not in the operator cache are embedded. This saves the disk space
+        when many variants of a model (e.g., batch sizes and precisions) share most of their kernels, and the loaded
+        graphs share the loaded kernels in memory. The saved file can only be loaded with an operator cache that
+        contains the referenced kernels, e.g., on the same machine or with a shared cache directory. The saved file
+        is recorded in the referenced kernels, and the cache eviction (see hidet.option.cache_size_limit) keeps the
+        kernels referenced by the saved files that still exist. Moving the saved file or cleaning the operator cache
+        manually still breaks it, in which case it should be saved again without sharing its kernels.
+
+        Default: False
     """
     from hidet.utils.dataclass import asdict
 
+    compress_types = _resolve_compression(compression)
+
+    entries: List[_ZipEntry] = []
+
+    # meta info
+    meta_bytes = json.dumps(asdict(model.meta), indent=4).encode('utf-8')
+    entries.append(_bytes_entry('meta.json', meta_bytes, compress_types['metadata']))
+
+    # save the modules
+    entries.extend(_dir_entries(model.graph_module.module_dir, 'graph_module/', compress_types['modules']))
+
+    # save weights
+    if save_weights:
+        entries.extend(_weights_entries(model.weights, compress_types))
+
+    # save the kernels (i.e., compiled tasks)
+    shared_kernels: Dict[str, Dict[str, Any]] = {}
+    for i, compiled_task in enumerate(model.compiled_tasks):
+        ref = _shared_kernel_ref(compiled_task.task_dir) if share_kernels else None
+        if ref is not None:
+            shared_kernels[str(i)] = ref
+        else:
+            entries.extend(_dir_entries(compiled_task.task_dir, 'kernels/{}/'.format(i), compress_types['modules']))
+    if len(shared_kernels) > 0:
+        shared_bytes = json.dumps(shared_kernels, indent=4).encode('utf-8')
+        entries.append(_bytes_entry(SHARED_KERNELS_NAME, shared_bytes, compress_types['metadata']))
+
+    # save graph execution
+    ge_bytes = json.dumps(asdict(model.graph_execution), indent=4).encode('utf-8')
+    entries.append(_bytes_entry('graph_execution.json', ge_bytes, compress_types['metadata']))
+
+    # save dispatch table file
+    if save_dispatch_table and os.path.exists(model.dispatch_table_path):
+        entries.append(_file_entry('dispatch_table.txt', model.dispatch_table_path, compress_types['metadata']))
+
+    # save graph string
+    entries.append(_bytes_entry('graph_string.txt', model.graph_string.encode('utf-8'), compress_types['metadata']))
+
     dirname = os.path.dirname(file)
     os.makedirs(dirname, exist_ok=True)
 
@@ -644,66 +1228,185 @@ def save_compiled_graph(model: CompiledGraph, file: str, save_dispatch_table: bo
         temp_path = temp_file.name
 
         with zipfile.ZipFile(temp_path, 'w') as zf:
-
-            def _save_under(dir_path: str, dir_in_zip: str, exclude: Optional[List[str]] = None):
-                for root, _, files in os.walk(dir_path):
-                    for file in files:
-                        file_path = os.path.join(root, file)
-                        file_in_zip = os.path.join(dir_in_zip, os.path.relpath(file_path, dir_path))
-                        with zf.open(file_in_zip, 'w') as f1:
-                            if exclude and file in exclude:
-                                continue
-                            with open(file_path, 'rb') as f2:
-                                f1.write(f2.read())
-
-            # meta info
-            with zf.open('meta.json', 'w') as f:
-                meta_bytes = json.dumps(asdict(model.meta), indent=4).encode('utf-8')
-                f.write(meta_bytes)
-
-            # save the modules
-            _save_under(model.graph_module.module_dir, 'graph_module/')
-
-            # save weights
-            if save_weights:
-                # zip.open(..., force_zip64=True) is required for >4GB weights
-                with zf.open('weights.npz', 'w', force_zip64=True) as f:
-                    numpy.savez(f, *[weight.cpu().numpy() for weight in model.weights])
-
-            # save the kernels (i.e., compiled tasks)
-            for i, compiled_task in enumerate(model.compiled_tasks):
-                _save_under(compiled_task.task_dir, 'kernels/{}/'.format(i))
-
-            # save graph execution
-            with zf.open('graph_execution.json', 'w') as f:
-                ge_bytes = json.dumps(asdict(model.graph_execution), indent=4).encode('utf-8')
-                f.write(ge_bytes)
-
-            # save dispatch table file
-            if save_dispatch_table and os.path.exists(model.dispatch_table_path):
-                with zf.open('dispatch_table.txt', 'w') as f:
-                    with open(model.dispatch_table_path, 'rb') as f2:
-                        f.write(f2.read())
-
-            # save graph string
-            with zf.open('graph_string.txt', 'w') as f:
-                f.write(model.graph_string.encode('utf-8'))
+            _write_entries(zf, entries, num_workers)
 
     os.rename(temp_path, file)
 
+    # keep the shared kernels from being evicted while the saved file exists
+    for i in shared_kernels:
+        add_cache_entry_referrer(model.compiled_tasks[int(i)].task_dir, file)
+
+
+def _map_weights_blob(path: str) -> Optional[numpy.ndarray]:
+    # map the weights blob into memory as a writable copy-on-write uint8 array
+    if os.path.isdir(path):
+        blob_path = os.path.join(path, WEIGHTS_BLOB)
+        if not os.path.exists(blob_path):
+            return None
+        offset, nbytes = 0, os.path.getsize(blob_path)
+    else:
+        blob_path = path
+        with zipfile.ZipFile(path, 'r') as zf:
+            if WEIGHTS_BLOB not in zf.namelist():
+                return None
+            zinfo = zf.getinfo(WEIGHTS_BLOB)
+            if zinfo.compress_type != zipfile.ZIP_STORED:
+                # the blob has been compressed (e.g., the file is re-packed by other tools), read it to memory
+                return numpy.frombuffer(bytearray(zf.read(WEIGHTS_BLOB)), dtype=numpy.uint8)
+        with open(path, 'rb') as f:
+            f.seek(zinfo.header_offset)
+            header = f.read(30)
+        name_length, extra_length = struct.unpack('<HH', header[26:30])
+        offset, nbytes = zinfo.header_offset + 30 + name_length + extra_length, zinfo.file_size
+    if nbytes == 0:
+        return numpy.empty([0], dtype=numpy.uint8)
+    return numpy.memmap(blob_path, dtype=numpy.uint8, mode='c', offset=offset, shape=(nbytes,))
+
+
+def _copy_to_device(tensor: 'Tensor', device: str) -> 'Tensor':
+    # copy the memory-mapped weight to the device chunk by chunk, so that only a bounded part of the weight needs to
+    # be paged in and staged by the driver at a time
+    dst = hidet.empty(tensor.shape, tensor.dtype, device=device)
+    if not (dst.device.is_cuda() or dst.device.is_hip()):
+        return tensor.to(device=device)
+    memcpy = hidet.cuda.memcpy if dst.device.is_cuda() else hidet.hip.memcpy
+    with dst.device:
+        for offset in range(0, tensor.nbytes, WEIGHTS_COPY_CHUNK_BYTES):
+            nbytes = min(WEIGHTS_COPY_CHUNK_BYTES, tensor.nbytes - offset)
+            memcpy(dst.storage.addr + offset, tensor.storage.addr + offset, nbytes)
+    return dst
+
+
+def _load_weights(path: str, index: Dict[str, Any], tensor_devices: List[str]) -> List['Tensor']:
+    from hidet.graph.tensor import Tensor, from_numpy
+
+    blob = _map_weights_blob(path)
+    if blob is None:
+        raise RuntimeError('Can not find {} in {}.'.format(WEIGHTS_BLOB, path))
+    if blob.ctypes.data % index['alignment'] != 0:
+        # the blob is not aligned in the file, copy it to aligned memory
+        blob = numpy.array(blob)
+    weights = []
+    for entry, device in zip(index['weights'], tensor_devices):
+        offset, nbytes = entry['offset'], entry['nbytes']
+        raw = from_numpy(blob[offset : offset + nbytes])
+        weight = Tensor(shape=entry['shape'], dtype=entry['dtype'], device='cpu', storage=raw.storage)
+        if hidet.runtime.device.instantiate_device(device).is_cpu():
+            weights.append(weight)
+        else:
+            weights.append(_copy_to_device(weight, device))
+    return weights
+
+
+def _is_runtime_mutable(name: str) -> bool:
+    # the runtime mutable files of the graph (e.g., dispatch_table.txt) and of its kernels (kernels/<i>/...)
+    parts = name.split('/')
+    if parts[0] == 'kernels' and len(parts) >= 3:
+        parts = parts[2:]
+    return parts[0] in RUNTIME_MUTABLE_FILES
+
+
+def _verify_manifest(cache_dir: str, manifest: Dict[str, List[int]]) -> bool:
+    # check that the cache directory has been extracted from an archive with the same members, by comparing the
+    # recorded manifest and the sizes of the extracted files, without reading their contents
+    try:
+        with open(os.path.join(cache_dir, MANIFEST_NAME), 'r') as f:
+            if json.load(f) != manifest:
+                return False
+        return all(
+            os.path.getsize(os.path.join(cache_dir, name)) == size
+            for name, (size, _) in manifest.items()
+            if not _is_runtime_mutable(name)
+        )
+    except (OSError, ValueError):
+        return False
+
+
+def _checked_member_path(cache_dir: str, name: str) -> str:
+    # the members of the archive must be extracted inside the cache directory
+    target_path = os.path.abspath(os.path.join(cache_dir, name))
+    if not target_path.startswith(os.path.abspath(cache_dir) + os.sep):
+        raise ValueError('Invalid member path in compiled graph archive: {}'.format(name))
+    return target_path
+
 
-def load_compiled_graph(path: str) -> CompiledGraph:
+def _extract_graph(path: str, members: List[zipfile.ZipInfo], cache_dir: str, num_workers: Optional[int]):
+    """
+    Extract the given members of the compiled graph archive to the cache directory in parallel threads.
+
+    The manifest of the extracted members (their sizes and crc32 checksums recorded in the archive) is written after
+    all the members have been extracted, and the extraction is skipped when the cache directory already matches it.
+    """
+    manifest = {info.filename: [info.file_size, info.CRC] for info in members if not info.is_dir()}
+    target_paths = {name: _checked_member_path(cache_dir, name) for name in manifest}
+    if _verify_manifest(cache_dir, manifest):
+        return
+
+    # remove the stale manifest first, so that an interrupted extraction is not considered complete
+    manifest_path = os.path.join(cache_dir, MANIFEST_NAME)
+    if os.path.exists(manifest_path):
+        os.remove(manifest_path)
+    # create the directories ahead, ZipFile.extract(...) would race on creating them in parallel threads
+    for target_path in target_paths.values():
+        os.makedirs(os.path.dirname(target_path), exist_ok=True)
+
+    with contextlib.ExitStack() as stack:
+        # zip files are not safe to be read concurrently, each thread takes its own handle from the idle ones
+        idle_archives: queue.SimpleQueue = queue.SimpleQueue()
+        stack_lock = threading.Lock()
+
+        def extract(name: str):
+            try:
+                zf = idle_archives.get_nowait()
+            except queue.Empty:
+                with stack_lock:
+                    zf = stack.enter_context(zipfile.ZipFile(path, 'r'))
+            # extract to a temporary file and then replace the target, because the target might be a shared library
+            # that has been loaded by this process, and overwriting it in place would corrupt the loaded library
+            target_path = target_paths[name]
+            with zf.open(name, 'r') as src:
+                with tempfile.NamedTemporaryFile(dir=os.path.dirname(target_path), delete=False) as dst:
+                    shutil.copyfileobj(src, dst, SAVE_CHUNK_BYTES)
+            os.replace(dst.name, target_path)
+            idle_archives.put(zf)
+
+        with ThreadPoolExecutor(max_workers=num_workers) as executor:
+            # consume the results to propagate the exceptions raised in the threads
+            list(executor.map(extract, manifest.keys()))
+
+    # the graph might have been extracted from another archive with shared kernels before
+    if SHARED_KERNELS_NAME not in manifest and os.path.exists(os.path.join(cache_dir, SHARED_KERNELS_NAME)):
+        os.remove(os.path.join(cache_dir, SHARED_KERNELS_NAME))
+
+    with tempfile.NamedTemporaryFile('w', dir=cache_dir, delete=False) as f:
+        json.dump(manifest, f)
+    os.replace(f.name, manifest_path)
+
+
+def load_compiled_graph(path: str, num_workers: Optional[int] = None, preload: bool = False) -> CompiledGraph:
     """
     Load a compiled graph from disk.
 
     The compiled graph is saved with zip format. The path can be either a single file to the zip file, or a directory
     that contains the contents of the zip file.
 
+    When loading from a zip file, its contents (except the weights) are extracted to the cache directory of the graph
+    in parallel threads. A manifest of the extracted files is kept in the cache directory, so that a graph that has
+    been extracted before is verified by comparing the manifest and the file sizes instead of extracted again.
+
     Parameters
     ----------
     path: str
         The path to load the compiled graph (can be either a single file or a directory).
 
+    num_workers: Optional[int]
+        The number of threads used to extract the files, parse the meta data of the kernels and load the kernels
+        (when preload is True). None to use the default number of threads of ThreadPoolExecutor.
+
+    preload: bool
+        Whether to load the kernels immediately. Otherwise, the kernels are loaded on their first use, or by
+        :meth:`CompiledGraph.preload`.
+
     Returns
     -------
     ret: CompiledGraph
@@ -716,21 +1419,17 @@ def load_compiled_graph(path: str) -> CompiledGraph:
             # load meta data
             with zf.open('meta.json', 'r') as f:
                 meta_data: GraphMetaData = from_dict(GraphMetaData, json.load(f))
+            members: List[zipfile.ZipInfo] = zf.infolist()
 
-            # extract all files except weights
-            files_to_extract: List[str] = zf.namelist()
-            if 'weights.npz' in files_to_extract:
-                files_to_extract.remove('weights.npz')
-            cache_dir = hidet.utils.cache_dir('graphs', meta_data.graph_hash)
-            if not os.path.exists(os.path.join(cache_dir, 'graph_string.txt')):
-                # only extract files if the graph_string.txt is not in the cache
-                # here 'graph_string.txt' is just the last file we usually save to disk, we use it as a flag
-                # to indicate whether the graph is already in the cache
-                zf.extractall(cache_dir, files_to_extract)
-
-            graph_path = cache_dir
+        # extract all files except weights
+        members = [info for info in members if info.filename not in ['weights.npz', WEIGHTS_INDEX, WEIGHTS_BLOB]]
+        cache_dir = hidet.utils.cache_dir('graphs', meta_data.graph_hash)
+        _extract_graph(path, members, cache_dir, num_workers)
+
+        graph_path = cache_dir
     else:
         graph_path = path
+    touch_cache_entry(graph_path)
 
     # load meta data
     with open(os.path.join(graph_path, 'meta.json'), 'r') as f:
@@ -750,7 +1449,21 @@ def load_compiled_graph(path: str) -> CompiledGraph:
                 device = graph_execution.tensor_device[graph_execution.weights_index[weight_idx]]
                 weights.append(hidet.asarray(numpy.load(npy_file), device=device))
 
-    if os.path.exists(os.path.join(graph_path, 'weights.npz')):
+    weights_index: Optional[Dict[str, Any]] = None
+    if os.path.exists(os.path.join(graph_path, WEIGHTS_INDEX)):
+        with open(os.path.join(graph_path, WEIGHTS_INDEX), 'r') as f:
+            weights_index = json.load(f)
+    elif os.path.isfile(path):
+        with zipfile.ZipFile(path, 'r') as zf:
+            if WEIGHTS_INDEX in zf.namelist():
+                with zf.open(WEIGHTS_INDEX, 'r') as f:
+                    weights_index = json.load(f)
+
+    if weights_index is not None:
+        # the weights are memory-mapped and wrapped as cpu tensors without copying
+        tensor_devices = [graph_execution.tensor_device[idx] for idx in graph_execution.weights_index]
+        weights = _load_weights(path if os.path.isfile(path) else graph_path, weights_index, tensor_devices)
+    elif os.path.exists(os.path.join(graph_path, 'weights.npz')):
         with zipfile.ZipFile(os.path.join(graph_path, 'weights.npz'), 'r') as npz:
             load_weights_from_npz(npz)
     elif os.path.isfile(path):
@@ -764,7 +1477,21 @@ def load_compiled_graph(path: str) -> CompiledGraph:
 
     # load kernels (i.e., compiled tasks)
     num_kernels = meta_data.num_kernels
-    compiled_tasks = [CompiledTask(task_dir=os.path.join(graph_path, 'kernels', str(i))) for i in range(num_kernels)]
+    shared_kernels: Dict[str, Dict[str, Any]] = {}
+    if os.path.exists(os.path.join(graph_path, SHARED_KERNELS_NAME)):
+        with open(os.path.join(graph_path, SHARED_KERNELS_NAME), 'r') as f:
+            shared_kernels = json.load(f)
+    # the kernels are loaded on their first use, or by CompiledGraph.preload()
+    with ThreadPoolExecutor(max_workers=num_workers) as executor:
+        compiled_tasks: List[CompiledTask] = list(
+            executor.map(
+                lambda i: CompiledTask(task_dir=os.path.join(graph_path, 'kernels', str(i)), lazy=True),
+                [i for i in range(num_kernels) if str(i) not in shared_kernels],
+            )
+        )
+    for i in range(num_kernels):
+        if str(i) in shared_kernels:
+            compiled_tasks.insert(i, _load_shared_kernel(shared_kernels[str(i)]))
 
     # load graph module
     graph_module = CompiledModule(module_dir=os.path.join(graph_path, 'graph_module'))
@@ -776,4 +1503,7 @@ def load_compiled_graph(path: str) -> CompiledGraph:
     # construct the compiled graph
     ret = CompiledGraph(meta_data, graph_module, weights, compiled_tasks, graph_execution, graph_string)
 
+    if preload:
+        ret.preload(num_threads=num_workers)
+
     return ret
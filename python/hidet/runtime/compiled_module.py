@@ -9,7 +9,7 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-from typing import Dict, Optional, Callable, Sequence
+from typing import Dict, Optional, Callable, Sequence, Any
 import os
 import pickle
 import time
@@ -67,12 +67,34 @@ class CompiledFunction:
         ret: Optional[Union[int, float, bool]]
             The return value of the function.
         """
-        from hidet.ffi.ffi import BackendException, get_last_error
-
         cargs = []
         for typ, arg in zip(self.param_types, args):
             cargs.append(to_ctypes_arg(hidet_type=typ, obj=arg))
 
+        return self.call_converted(cargs, args)
+
+    def call_converted(self, cargs: Sequence[Any], args: Sequence[Any]):
+        """
+        Call the compiled function with the arguments that have already been converted to ctypes values.
+
+        This skips the conversion in :meth:`__call__`, for the callers that convert the arguments themselves on their
+        hot path (e.g., :class:`hidet.runtime.CompiledGraph` with static shapes).
+
+        Parameters
+        ----------
+        cargs: Sequence[Any]
+            The converted arguments, see :func:`hidet.ffi.convert.to_ctypes_arg`.
+
+        args: Sequence[Any]
+            The original arguments, only used to report the error.
+
+        Returns
+        -------
+        ret: Optional[Union[int, float, bool]]
+            The return value of the function.
+        """
+        from hidet.ffi.ffi import BackendException, get_last_error
+
         val = self.ctypes_func(*cargs)
         ret = from_ctypes_return(hidet_type=self.ret_type, val=val)
 
@@ -129,18 +151,25 @@ class CompiledFunction:
         results: List[float]
             The measured time in milliseconds (we have len(results) == repeat)).
         """
-        from hidet.cuda import current_stream
+        from hidet.cuda import available, current_stream
+
+        # the cpu functions run synchronously, and there is no stream to wait for on the hosts without cuda
+        stream = current_stream() if available() else None
+
+        def synchronize():
+            if stream is not None:
+                stream.synchronize()
 
         for _ in range(warmup):
             self(*args)
 
         results = []
         for _ in range(repeat):
-            current_stream().synchronize()
+            synchronize()
             start = time.time()
             for _ in range(number):
                 self(*args)
-            current_stream().synchronize()
+            synchronize()
             end = time.time()
             results.append((end - start) / number * 1000)
 
@@ -187,6 +216,10 @@ class CompiledModule:
     module_dir: str
         The directory of the module.
 
+    func_types: Optional[Dict[str, FuncType]]
+        The types of the functions in the module. If not given, they are loaded from `func_types.pickle` in the module
+        directory.
+
     Attributes
     ----------
     module_dir: str
@@ -199,14 +232,14 @@ class CompiledModule:
         The functions in the module.
     """
 
-    def __init__(self, module_dir: str):
+    def __init__(self, module_dir: str, func_types: Optional[Dict[str, FuncType]] = None):
         """
         Construct a compiled module.
 
         """
         self.module_dir: str = module_dir
         self.shared_library: SharedLibrary = self._load_shared_library()
-        self.functions: Dict[str, CompiledFunction] = self._load_functions()
+        self.functions: Dict[str, CompiledFunction] = self._load_functions(func_types)
 
     def __call__(self, *args):
         """
@@ -248,12 +281,13 @@ class CompiledModule:
             raise CompiledModuleLoadError('Shared library {} does not exist.'.format(lib_path))
         return SharedLibrary(lib_path)
 
-    def _load_functions(self):
-        func_types_path = os.path.join(self.module_dir, 'func_types.pickle')
-        if not os.path.exists(func_types_path):
-            raise CompiledModuleLoadError('Function types {} does not exist.'.format(func_types_path))
-        with open(func_types_path, 'rb') as f:
-            func_types: Dict[str, FuncType] = pickle.load(f)
+    def _load_functions(self, func_types: Optional[Dict[str, FuncType]]):
+        if func_types is None:
+            func_types_path = os.path.join(self.module_dir, 'func_types.pickle')
+            if not os.path.exists(func_types_path):
+                raise CompiledModuleLoadError('Function types {} does not exist.'.format(func_types_path))
+            with open(func_types_path, 'rb') as f:
+                func_types = pickle.load(f)
         functions: Dict[str, CompiledFunction] = {}
         for name, func_type in func_types.items():
             functions[name] = CompiledFunction(
@@ -331,7 +365,7 @@ class CompiledModule:
         return self['launch'].profile(*args, warmup=warmup, number=number, repeat=repeat)
 
 
-def load_compiled_module(module_dir: str) -> CompiledModule:
+def load_compiled_module(module_dir: str, func_types: Optional[Dict[str, FuncType]] = None) -> CompiledModule:
     """
     Load a compiled module from the given directory.
 
@@ -340,12 +374,15 @@ def load_compiled_module(module_dir: str) -> CompiledModule:
     module_dir: str
         The directory of the module.
 
+    func_types: Optional[Dict[str, FuncType]]
+        The types of the functions in the module. If not given, they are loaded from the module directory.
+
     Returns
     -------
     module: CompiledModule
         The compiled module.
     """
-    return CompiledModule(module_dir)
+    return CompiledModule(module_dir, func_types)
 
 
 def compiled_module_exists(module_dir: str) -> bool:
@@ -9,15 +9,22 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-from typing import List, Dict, Tuple, Union, Optional, Iterable
+from typing import List, Dict, Union, Optional, Iterable, Sequence
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 import os
 import json
+import pickle
+import threading
 from collections import namedtuple
 from hidet.runtime.compiled_module import CompiledModule, CompiledFunction, load_compiled_module
 from hidet.ir.dtypes import i32
+from hidet.ir.type import FuncType
 from hidet.ffi.array import Array
 from hidet.runtime.utils.dispatch_table import DispatchTable, IntervalsDispachTable, PointsDispachTable
+from hidet.utils.cache_manager import pin_cache_entry, unpin_cache_entry
+from hidet.utils.cache_index import TaskIndexEntry
+from hidet.utils.structure import LRUCache
 
 
 @dataclass
@@ -63,19 +70,43 @@ class CompiledTask:
     ----------
     task_dir: str
         The directory of the compiled task.
+
+    meta_data: Optional[TaskMetaData]
+        The meta data of the task. If not given, it is loaded from `meta.json` in the task directory.
+
+    func_types: Optional[Dict[str, FuncType]]
+        The types of the functions in the task module. If not given, they are loaded from the task directory.
+
+    lazy: bool
+        Whether to defer loading the shared library, resolving the candidates and constructing the dispatch table to
+        the first time they are used (or :meth:`preload` is called). Otherwise, they are loaded immediately.
     """
 
-    def __init__(self, task_dir: str):
+    def __init__(
+        self,
+        task_dir: str,
+        meta_data: Optional[TaskMetaData] = None,
+        func_types: Optional[Dict[str, FuncType]] = None,
+        lazy: bool = False,
+    ):
         self.task_dir: str = task_dir
-        self.meta_data: TaskMetaData = self._load_meta_data()
-        self.task_module: CompiledModule = load_compiled_module(task_dir)
-        self.candidates: List[CompiledFunction] = [
-            self.task_module['launch_{}'.format(i)] for i in range(self.meta_data.num_candidates)
-        ]
-        self.dispatch_table: DispatchTable = self.construct_dispatch_table()
+        pin_cache_entry(task_dir)
+        self.meta_data: TaskMetaData = meta_data if meta_data is not None else self._load_meta_data()
+
+        self._func_types: Optional[Dict[str, FuncType]] = func_types
+        self._lock = threading.Lock()
+        self._task_module: Optional[CompiledModule] = None
+        self._candidates: Optional[List[CompiledFunction]] = None
+        self._dispatch_table: Optional[DispatchTable] = None
+        self._get_input_shape: Optional[CompiledFunction] = None
+        self._get_output_shape: Optional[CompiledFunction] = None
 
-        self._get_input_shape = self.task_module['get_input_shape']
-        self._get_output_shape = self.task_module['get_output_shape']
+        if not lazy:
+            self.preload()
+
+    def __del__(self):
+        # allow the task directory to be evicted once the compiled task is released
+        unpin_cache_entry(self.task_dir)
 
     def __call__(self, *args):
         """
@@ -98,6 +129,46 @@ class CompiledTask:
         else:
             return outs
 
+    @property
+    def task_module(self) -> CompiledModule:
+        if self._task_module is None:
+            self.preload()
+        return self._task_module
+
+    @property
+    def candidates(self) -> List[CompiledFunction]:
+        if self._candidates is None:
+            self.preload()
+        return self._candidates
+
+    @property
+    def dispatch_table(self) -> DispatchTable:
+        if self._dispatch_table is None:
+            self.preload()
+        return self._dispatch_table
+
+    def is_loaded(self) -> bool:
+        return self._task_module is not None
+
+    def preload(self):
+        """
+        Load the shared library of the task, resolve its candidates and construct its dispatch table, if they have
+        not been loaded yet. It is safe to call this method from multiple threads.
+        """
+        if self._task_module is not None:
+            return
+        with self._lock:
+            if self._task_module is not None:
+                return
+            task_module = load_compiled_module(self.task_dir, self._func_types)
+            self._candidates = [task_module['launch_{}'.format(i)] for i in range(self.meta_data.num_candidates)]
+            self._get_input_shape = task_module['get_input_shape']
+            self._get_output_shape = task_module['get_output_shape']
+            self._dispatch_table = self.construct_dispatch_table()
+            # mark the task as loaded after all the members are initialized
+            self._task_module = task_module
+            self._func_types = None
+
     def _load_meta_data(self) -> TaskMetaData:
         from hidet.utils.dataclass import from_dict
 
@@ -146,6 +217,8 @@ class CompiledTask:
     def create_outputs(self, inputs):
         import hidet
 
+        if self._task_module is None:
+            self.preload()
         outputs = []
 
         for idx, sig in enumerate(self.meta_data.outputs):
@@ -254,7 +327,7 @@ class CompiledTask:
         return candidate.profile(*args, warmup=warmup, number=number, repeat=repeat)
 
 
-def load_compiled_task(compiled_task_dir: str) -> CompiledTask:
+def load_compiled_task(compiled_task_dir: str, index_entry: Optional[TaskIndexEntry] = None) -> CompiledTask:
     """
     Load a compiled task from the given directory.
 
@@ -263,32 +336,72 @@ def load_compiled_task(compiled_task_dir: str) -> CompiledTask:
     compiled_task_dir: str
         The directory of the compiled task.
 
+    index_entry: Optional[TaskIndexEntry]
+        The entry of the task in the index of the operator cache (see :mod:`hidet.utils.cache_index`). If given, the
+        meta data and function types of the task are taken from the entry instead of the files in the directory.
+
     Returns
     -------
     ret: CompiledTask
         The loaded compiled task.
     """
-    return CompiledTask(compiled_task_dir)
+    if index_entry is None:
+        return CompiledTask(compiled_task_dir)
+    from hidet.utils.dataclass import from_dict
+
+    meta_data = from_dict(TaskMetaData, index_entry.meta)
+    func_types = pickle.loads(index_entry.func_types)
+    return CompiledTask(compiled_task_dir, meta_data, func_types)
+
+
+def preload_compiled_tasks(compiled_tasks: Sequence[CompiledTask], num_threads: Optional[int] = None):
+    """
+    Load the given compiled tasks that are not loaded yet in parallel threads.
+
+    Parameters
+    ----------
+    compiled_tasks: Sequence[CompiledTask]
+        The compiled tasks to load.
+
+    num_threads: Optional[int]
+        The number of threads to use. None to use the default number of threads of ThreadPoolExecutor.
+    """
+    compiled_tasks = [compiled_task for compiled_task in compiled_tasks if not compiled_task.is_loaded()]
+    if len(compiled_tasks) == 0:
+        return
+    with ThreadPoolExecutor(max_workers=num_threads) as executor:
+        # consume the results to propagate the exceptions raised in the threads
+        list(executor.map(lambda compiled_task: compiled_task.preload(), compiled_tasks))
 
 
-CompiledTaskKey = namedtuple('CompiledTaskKey', ['device', 'space', 'task_str'])
+CompiledTaskKey = namedtuple('CompiledTaskKey', ['device', 'space', 'task_hash'])
 
 
 class CompiledTaskCache:
+    """
+    The in-memory cache of the compiled tasks, bounded by hidet.option.compiled_task_cache_capacity. The hits, misses
+    and evictions are counted in hidet.utils.counters.counters['compiled_task_cache'].
+    """
+
     def __init__(self):
-        self.cached: Dict[Tuple[str, int, str], CompiledTask] = {}
+        self.cached: LRUCache[CompiledTaskKey, CompiledTask] = LRUCache('compiled_task_cache')
 
-    def contains(self, device_type: str, space: int, task_str: str) -> bool:
-        key = CompiledTaskKey(device_type, space, task_str)
+    def contains(self, device_type: str, space: int, task_hash: str) -> bool:
+        key = CompiledTaskKey(device_type, space, task_hash)
         return key in self.cached
 
-    def get(self, device_type: str, space: int, task_str: str) -> Optional[CompiledTask]:
-        key = CompiledTaskKey(device_type, space, task_str)
-        return self.cached.get(key) if key in self.cached else None
+    def get(self, device_type: str, space: int, task_hash: str) -> Optional[CompiledTask]:
+        key = CompiledTaskKey(device_type, space, task_hash)
+        return self.cached.get(key)
+
+    def add(self, device_type: str, space: int, task_hash: str, compiled_task: CompiledTask):
+        from hidet import option
+
+        key = CompiledTaskKey(device_type, space, task_hash)
+        self.cached.put(key, compiled_task, capacity=option.get_compiled_task_cache_capacity())
 
-    def add(self, device_type: str, space: int, task_str: str, compiled_task: CompiledTask):
-        key = CompiledTaskKey(device_type, space, task_str)
-        self.cached[key] = compiled_task
+    def clear(self):
+        self.cached.clear()
 
 
 compiled_task_cache = CompiledTaskCache()
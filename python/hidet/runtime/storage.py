@@ -11,8 +11,8 @@
 # limitations under the License.
 from __future__ import annotations
 import gc
-from typing import Callable, Dict, List, Optional, Union
-from collections import defaultdict
+import bisect
+from typing import Callable, Dict, List, Optional, Tuple, Union
 import hidet.cuda
 from hidet.cuda.stream import Stream
 import hidet.hip
@@ -376,68 +376,255 @@ class Storage:
         return Storage._convert(self, self.device, non_blocking=True, stream=stream, copy=True)
 
 
+class _Segment:
+    """A contiguous region allocated from the memory api, split into blocks."""
+
+    __slots__ = ('addr', 'nbytes', 'is_small')
+
+    def __init__(self, addr: int, nbytes: int, is_small: bool):
+        self.addr: int = addr
+        self.nbytes: int = nbytes
+        self.is_small: bool = is_small
+
+
+class _Block:
+    """A block of a segment, linked with its neighbors in the segment to coalesce the free blocks."""
+
+    __slots__ = ('segment', 'addr', 'nbytes', 'is_free', 'prev', 'next')
+
+    def __init__(self, segment: _Segment, addr: int, nbytes: int):
+        self.segment: _Segment = segment
+        self.addr: int = addr
+        self.nbytes: int = nbytes
+        self.is_free: bool = False
+        self.prev: Optional[_Block] = None
+        self.next: Optional[_Block] = None
+
+
 class MemoryPool:
+    """
+    A caching memory pool.
+
+    The pool allocates segments from the memory api and splits them into blocks. The requests are rounded up to a
+    multiple of `block_size`, and belong to one of two size classes: the small requests (no more than
+    SMALL_REQUEST_SIZE) share segments of SMALL_SEGMENT_SIZE, and each large request gets a segment rounded up to a
+    multiple of LARGE_SEGMENT_ROUND. A request is served by the smallest cached free block of its size class that is
+    large enough (best-fit), which is split when the remainder is large enough to serve other requests. A freed block
+    is coalesced with its free neighbors in the same segment.
+
+    When the cached (reserved) free memory exceeds `max_reserve_size`, the segments that are entirely free are
+    released, the largest first, until the reserved memory is within the limit.
+
+    Parameters
+    ----------
+    memory_api: MemoryAPI
+        The memory api to allocate the segments.
+
+    block_size: int
+        The granularity of the allocations in bytes.
+
+    max_reserve_size: int
+        The maximum number of bytes of the cached free memory.
+    """
+
+    SMALL_REQUEST_SIZE = 1024**2
+    SMALL_SEGMENT_SIZE = 2 * 1024**2
+    LARGE_SEGMENT_ROUND = 2 * 1024**2
+
     def __init__(self, memory_api: MemoryAPI, block_size: int, max_reserve_size: int):
         self.memory_api: MemoryAPI = memory_api
         self.block_size: int = block_size
         self.max_reserve_size: int = max_reserve_size
         self.reserved_size: int = 0
-        self.active_blocks = 0
-        self.memory_blocks: Dict[int, List[Storage]] = defaultdict(list)
+        self.active_blocks: Dict[int, _Block] = {}
+        self.segments: Dict[int, _Segment] = {}
+        # the free blocks of the small and large size classes, sorted by (nbytes, addr)
+        self.free_blocks: Dict[bool, List[Tuple[int, int]]] = {True: [], False: []}
+        self.free_block_of: Dict[int, _Block] = {}
+        # the free blocks that span their entire segments, which can be released by trim, keyed by their addresses
+        self.free_segment_blocks: Dict[int, _Block] = {}
+
+        # statistics
+        self.num_requests: int = 0
+        self.num_hits: int = 0
+        self.num_trimmed_segments: int = 0
+        self.active_size: int = 0
+        self.peak_active_size: int = 0
+
+    def _round(self, nbytes: int) -> int:
+        return max((nbytes + self.block_size - 1) // self.block_size, 1) * self.block_size
+
+    def _insert_free_block(self, block: _Block):
+        block.is_free = True
+        bisect.insort(self.free_blocks[block.segment.is_small], (block.nbytes, block.addr))
+        self.free_block_of[block.addr] = block
+        if block.prev is None and block.next is None:
+            self.free_segment_blocks[block.addr] = block
+
+    def _remove_free_block(self, block: _Block):
+        free_list = self.free_blocks[block.segment.is_small]
+        del free_list[bisect.bisect_left(free_list, (block.nbytes, block.addr))]
+        del self.free_block_of[block.addr]
+        self.free_segment_blocks.pop(block.addr, None)
+        block.is_free = False
+
+    def _find_free_block(self, nbytes: int, is_small: bool) -> Optional[_Block]:
+        free_list = self.free_blocks[is_small]
+        idx = bisect.bisect_left(free_list, (nbytes, 0))
+        if idx == len(free_list):
+            return None
+        block = self.free_block_of[free_list[idx][1]]
+        self._remove_free_block(block)
+        self.reserved_size -= block.nbytes
+        return block
+
+    def _new_segment(self, nbytes: int, is_small: bool) -> Optional[_Block]:
+        if is_small:
+            segment_size = self.SMALL_SEGMENT_SIZE
+        else:
+            rounds = (nbytes + self.LARGE_SEGMENT_ROUND - 1) // self.LARGE_SEGMENT_ROUND
+            segment_size = rounds * self.LARGE_SEGMENT_ROUND
+        addr = self.memory_api.malloc(segment_size)
+        if addr == 0:
+            return None
+        segment = _Segment(addr, segment_size, is_small)
+        self.segments[addr] = segment
+        return _Block(segment, addr, segment_size)
+
+    def _split(self, block: _Block, nbytes: int):
+        remaining = block.nbytes - nbytes
+        min_remaining = self.block_size if block.segment.is_small else self.SMALL_REQUEST_SIZE + 1
+        if remaining < min_remaining:
+            return
+        rest = _Block(block.segment, block.addr + nbytes, remaining)
+        rest.prev, rest.next = block, block.next
+        if block.next is not None:
+            block.next.prev = rest
+        block.next = rest
+        block.nbytes = nbytes
+        self._insert_free_block(rest)
+        self.reserved_size += remaining
 
     def malloc(self, nbytes: int) -> Storage:
-        allocated = (nbytes + self.block_size - 1) // self.block_size * self.block_size
-        block_list = self.memory_blocks[allocated]
-        if len(block_list) > 0:
-            storage = block_list.pop()
-            addr = storage.addr
-            self.reserved_size -= storage.num_bytes
+        allocated = self._round(nbytes)
+        is_small = allocated <= self.SMALL_REQUEST_SIZE
+        self.num_requests += 1
+        block = self._find_free_block(allocated, is_small)
+        if block is not None:
+            self.num_hits += 1
         else:
-            addr = self.memory_api.malloc(allocated)
-            if addr == 0 and allocated != 0:
+            block = self._new_segment(allocated, is_small)
+            if block is None:
                 # out of memory
                 gc.collect()
                 self.clear()
-                addr = self.memory_api.malloc(allocated)
-                if addr == 0:
+                block = self._new_segment(allocated, is_small)
+                if block is None:
                     raise MemoryError(
                         f'Can not allocate {nbytes2str(allocated, True)} from {self.memory_api.device} device. '
                         + self.status(color=True)
                     )
-        return Storage(device=self.memory_api.device, addr=addr, num_bytes=allocated, free_handler=self.free)
+        self._split(block, allocated)
+        self.active_blocks[block.addr] = block
+        self.active_size += block.nbytes
+        self.peak_active_size = max(self.peak_active_size, self.active_size)
+        return Storage(device=self.memory_api.device, addr=block.addr, num_bytes=block.nbytes, free_handler=self.free)
 
     def free(self, storage: Storage):
-        self.memory_blocks[storage.num_bytes].append(storage)
-        self.reserved_size += storage.num_bytes
-        if self.reserved_size > self.max_reserve_size:
-            self.clear()
+        block = self.active_blocks.pop(storage.addr)
+        self.active_size -= block.nbytes
+        self.reserved_size += block.nbytes
+        # coalesce with the free neighbors
+        for neighbor in [block.prev, block.next]:
+            if neighbor is not None and neighbor.is_free:
+                self._remove_free_block(neighbor)
+                if neighbor is block.prev:
+                    block.addr, block.prev = neighbor.addr, neighbor.prev
+                    if block.prev is not None:
+                        block.prev.next = block
+                else:
+                    block.next = neighbor.next
+                    if block.next is not None:
+                        block.next.prev = block
+                block.nbytes += neighbor.nbytes
+        self._insert_free_block(block)
+        if self.reserved_size > self.max_reserve_size and self.free_segment_blocks:
+            self.trim(self.max_reserve_size)
+
+    def trim(self, max_reserve_size: int = 0, _is_exiting=is_exiting):
+        """
+        Release the entirely free segments, the largest first, until the reserved memory is within the given size.
 
-    def clear(self, _is_exiting=is_exiting):
+        Parameters
+        ----------
+        max_reserve_size: int
+            The number of bytes of the reserved memory to keep.
+        """
         if _is_exiting():
             return
-        if hidet.cuda.available():
-            hidet.cuda.synchronize()
-        for block_list in self.memory_blocks.values():
-            for storage in block_list:
-                self.memory_api.free(storage.addr)
-                storage.addr = 0
-        self.memory_blocks.clear()
-        self.reserved_size = 0
-        if hidet.cuda.available():
+        free_segments = sorted(self.free_segment_blocks.values(), key=lambda block: block.nbytes, reverse=True)
+        synchronized = False
+        for block in free_segments:
+            if self.reserved_size <= max_reserve_size:
+                break
+            if not synchronized and hidet.cuda.available():
+                hidet.cuda.synchronize()
+                synchronized = True
+            self._remove_free_block(block)
+            self.reserved_size -= block.nbytes
+            del self.segments[block.segment.addr]
+            self.memory_api.free(block.segment.addr)
+            self.num_trimmed_segments += 1
+        if synchronized:
             hidet.cuda.synchronize()
 
+    def clear(self, _is_exiting=is_exiting):
+        """
+        Release all the entirely free segments.
+        """
+        self.trim(0, _is_exiting)
+
+    def stats(self) -> Dict[str, Union[int, float]]:
+        """
+        Get the statistics of the memory pool.
+
+        Returns
+        -------
+        ret: Dict[str, Union[int, float]]
+            The statistics: the number of bytes that are allocated from the memory api ('allocated'), in use
+            ('active'), cached ('reserved'), the peak of them ('peak', 'peak_active'), the number of segments
+            ('segments'), the largest free block ('largest_free'), the fraction of the reserved memory outside the
+            largest free block ('fragmentation'), and the fraction of requests served by the cached blocks ('hit_rate').
+        """
+        largest_free = max([free_list[-1][0] for free_list in self.free_blocks.values() if free_list], default=0)
+        return {
+            'allocated': self.memory_api.allocated,
+            'peak': self.memory_api.peak_allocated,
+            'reserved': self.reserved_size,
+            'active': self.active_size,
+            'peak_active': self.peak_active_size,
+            'segments': len(self.segments),
+            'largest_free': largest_free,
+            'fragmentation': 1.0 - largest_free / self.reserved_size if self.reserved_size > 0 else 0.0,
+            'hit_rate': self.num_hits / self.num_requests if self.num_requests > 0 else 0.0,
+        }
+
     def status(self, color=False) -> str:
-        allocated = self.memory_api.allocated
-        peak_allocated = self.memory_api.peak_allocated
+        stats = self.stats()
         items = [
-            ['Allocated', allocated],
-            ['Peak', peak_allocated],
-            ['Reserved', self.reserved_size],
-            ['Active', allocated - self.reserved_size],
+            ['Allocated', stats['allocated']],
+            ['Peak', stats['peak']],
+            ['Reserved', stats['reserved']],
+            ['Active', stats['active']],
+            ['Peak active', stats['peak_active']],
+            ['Largest free', stats['largest_free']],
         ]
         lines = [
             'Status of {} memory pool'.format(self.memory_api.device),
             *['{:>12}: {}'.format(name, nbytes2str(nbytes, color)) for name, nbytes in items],
+            '{:>12}: {}'.format('Segments', stats['segments']),
+            '{:>12}: {:.1%}'.format('Fragment', stats['fragmentation']),
+            '{:>12}: {:.1%}'.format('Hit rate', stats['hit_rate']),
         ]
         return '\n'.join(lines)
 
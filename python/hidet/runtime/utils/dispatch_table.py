@@ -53,6 +53,7 @@ class DispatchTable:
         self.task_dir: str = task_dir
         self.symbols: List[str] = symbols
         self.name: str = name
+        self._symbol_slots = runtime_api.symbol_slots(symbols)
 
     def pick_best_candidate(self, inputs: List['Tensor'], outputs: List['Tensor']) -> int:
         """
@@ -91,6 +92,7 @@ class DispatchTable:
         candidates_json_path = os.path.join(self.task_dir, 'candidates.json')
         if not os.path.exists(candidates_json_path):
             return
+        self._record_plateau_skipped(candidates_json_path, key, latencies)
 
         report_dir = os.path.join(self.task_dir, report_path)
         os.makedirs(report_dir, exist_ok=True)
@@ -117,6 +119,38 @@ class DispatchTable:
         with open(out_path, 'w') as rf:
             rf.write(tabulate(candidate_lines, headers=headers, tablefmt='plain'))
 
+    def _record_plateau_skipped(self, candidates_json_path: str, key: Tuple[int, ...], latencies: List[float]):
+        """
+        Records the candidates that are not benchmarked for a specific key because the tuning plateau (see
+        :func:`hidet.option.tuning_budget`) was reached before them. Their latencies are infinite.
+
+        Parameters
+        ----------
+        candidates_json_path : str
+            Path to the candidates.json file of the task.
+        key : Tuple[int, ...]
+            Key representing runtime symbol values.
+        latencies : List[float]
+            Latency measurements (ms) for each candidate.
+        """
+        skipped = [i for i, latency in enumerate(latencies) if latency == float('inf')]
+        if not skipped:
+            return
+        with open(candidates_json_path, 'r') as f:
+            candidates_json = json.load(f)
+        entry = {
+            'symbols': {sym_name: int(sym_val) for sym_val, sym_name in zip(key, self.symbols)},
+            'candidates': skipped,
+        }
+        plateau_skipped = candidates_json.setdefault('plateau_skipped', [])
+        if entry in plateau_skipped:
+            return
+        plateau_skipped.append(entry)
+        tmp_path = '{}.{}.tmp'.format(candidates_json_path, os.getpid())
+        with open(tmp_path, 'w') as f:
+            json.dump(candidates_json, f, indent=2)
+        os.replace(tmp_path, candidates_json_path)
+
 
 class IntervalsDispachTable(DispatchTable):
     """
@@ -447,7 +481,7 @@ class PointsDispachTable(DispatchTable):
         """
         Returns current runtime symbol values as a tuple.
         """
-        return tuple(runtime_api.get_symbol_value(sym) for sym in self.symbols)
+        return self._symbol_slots.get_values()
 
     def _load(self):
         """
@@ -488,6 +522,23 @@ class PointsDispachTable(DispatchTable):
                 fw.write(line)
 
 
+def graph_kernel_array(graph: 'CompiledGraph', best_candidates: List[int]) -> Array:
+    """
+    Create the array of the function pointers of the best candidates of the kernels in the compiled graph.
+
+    The kernels of a loaded compiled graph are loaded lazily, load all of them in parallel before resolving the
+    function pointers.
+    """
+    from hidet.runtime.compiled_task import preload_compiled_tasks
+
+    preload_compiled_tasks(graph.compiled_tasks)
+    kernel_array = Array(void_p, len(graph.compiled_tasks))
+    for task_idx, best_candidate in enumerate(best_candidates):
+        candidate = graph.compiled_tasks[task_idx].candidates[best_candidate]
+        kernel_array[task_idx] = ctypes_func_pointer(candidate.ctypes_func)
+    return kernel_array
+
+
 class GraphIntervalDispatchTable:
     """
     A dispatch table for a compiled graph that uses per-integer lookup.
@@ -511,8 +562,10 @@ class GraphIntervalDispatchTable:
         self.dispatch_table: List[Dict[str, Any]] = []
         self.dispatch_table_path = graph.dispatch_table_path
         self.compiled_graph: CompiledGraph = graph
+        # best candidates -> kernel array, shared by the entries with the same best candidates
+        self.kernel_arrays: Dict[Tuple[int, ...], Array] = {}
 
-        # Load any existing dispatch table from disk (reconstructing kernel arrays).
+        # Load any existing dispatch table from disk (the kernel arrays are created on first use).
         self.load()
 
         # If dispatch table is empty, build it.
@@ -537,10 +590,13 @@ class GraphIntervalDispatchTable:
         """
         assert len(symbol_val) == 1
         idx = symbol_val[0]
-        if idx < len(self.dispatch_table):
-            return self.dispatch_table[idx]["kernel_array"]
-        else:
-            return self.dispatch_table[-1]["kernel_array"]
+        entry = self.dispatch_table[idx] if idx < len(self.dispatch_table) else self.dispatch_table[-1]
+        if "kernel_array" not in entry:
+            key = tuple(entry["best_candidates"])
+            if key not in self.kernel_arrays:
+                self.kernel_arrays[key] = graph_kernel_array(self.compiled_graph, entry["best_candidates"])
+            entry["kernel_array"] = self.kernel_arrays[key]
+        return entry["kernel_array"]
 
     def __contains__(self, _):
         """
@@ -617,9 +673,7 @@ class GraphIntervalDispatchTable:
                     if idx in index2tensor:
                         del index2tensor[idx]
 
-            kernel_array = Array(void_p, len(graph.compiled_tasks))
-            for task_idx, bc in enumerate(best_candidates):
-                kernel_array[task_idx] = ctypes_func_pointer(graph.compiled_tasks[task_idx].candidates[bc].ctypes_func)
+            kernel_array = graph_kernel_array(graph, best_candidates)
 
             for val in range(interval_beg, interval_end + 1):
                 self.dispatch_table[val] = {"best_candidates": best_candidates, "kernel_array": kernel_array}
@@ -647,8 +701,8 @@ class GraphIntervalDispatchTable:
 
     def load(self):
         """
-        Loads dispatch_table from the JSON file if available, and recreates
-        the array of kernel pointers for each entry.
+        Loads dispatch_table from the JSON file if available. The array of
+        kernel pointers of each entry is recreated on its first use.
         """
         path = self.dispatch_table_path
         if not os.path.exists(path):
@@ -664,12 +718,7 @@ class GraphIntervalDispatchTable:
             if best_candidates is None:
                 self.dispatch_table.append({})
             else:
-                kernel_array = Array(void_p, len(self.compiled_graph.compiled_tasks))
-                for task_idx, bc in enumerate(best_candidates):
-                    kernel_array[task_idx] = ctypes_func_pointer(
-                        self.compiled_graph.compiled_tasks[task_idx].candidates[bc].ctypes_func
-                    )
-                self.dispatch_table.append({"best_candidates": best_candidates, "kernel_array": kernel_array})
+                self.dispatch_table.append({"best_candidates": best_candidates})
 
         max_split = option.internal.dispatch_table.get_split_points()[-1]
 
@@ -698,6 +747,8 @@ class GraphPointsDispatchTable:
         from hidet.runtime.compiled_graph import CompiledGraph
 
         self.dispatch_table: Dict[Tuple[int, ...], Array] = {}
+        # the best candidates loaded from disk, whose kernel arrays are created on first use
+        self.loaded_candidates: Dict[Tuple[int, ...], List[int]] = {}
         self.dispatch_table_path = graph.dispatch_table_path
         self.compiled_graph: CompiledGraph = graph
 
@@ -718,6 +769,9 @@ class GraphPointsDispatchTable:
             An array of function pointers, where each pointer is the best candidate
             for its associated compiled task.
         """
+        if symbol_dims in self.loaded_candidates:
+            best_candidates = self.loaded_candidates.pop(symbol_dims)
+            self.dispatch_table[symbol_dims] = graph_kernel_array(self.compiled_graph, best_candidates)
         return self.dispatch_table[symbol_dims]
 
     def __contains__(self, symbol_dims):
@@ -734,7 +788,7 @@ class GraphPointsDispatchTable:
         bool
             True if an entry exists; False otherwise.
         """
-        return symbol_dims in self.dispatch_table
+        return symbol_dims in self.dispatch_table or symbol_dims in self.loaded_candidates
 
     def update_symbol_table(self, symbol_dims: Tuple[int, ...], best_candidates: List[int]):
         """
@@ -747,12 +801,7 @@ class GraphPointsDispatchTable:
         best_candidates : List[int]
             Indices of the best schedule (candidate) for each compiled task in the graph.
         """
-        kernel_array = Array(void_p, len(self.compiled_graph.compiled_tasks))
-        for task_idx, best_candidate in enumerate(best_candidates):
-            kernel_array[task_idx] = ctypes_func_pointer(
-                self.compiled_graph.compiled_tasks[task_idx].candidates[best_candidate].ctypes_func
-            )
-        self.dispatch_table[symbol_dims] = kernel_array
+        self.dispatch_table[symbol_dims] = graph_kernel_array(self.compiled_graph, best_candidates)
 
         with FileLock(self.dispatch_table_path + '.lock'):
             if not os.path.exists(self.dispatch_table_path):
@@ -789,13 +838,11 @@ class GraphPointsDispatchTable:
                     items = [int(item) for item in items]
                     symbol_dims = items[: len(graph.dynamic_dims)]
                     schedule_indices = items[len(graph.dynamic_dims) :]
-                    kernel_array = Array(void_p, len(graph.compiled_tasks))
-                    for task_idx, (compiled_task, sch_idx) in enumerate(zip(graph.compiled_tasks, schedule_indices)):
-                        if not 0 <= sch_idx < len(compiled_task.candidates):
+                    for compiled_task, sch_idx in zip(graph.compiled_tasks, schedule_indices):
+                        if not 0 <= sch_idx < compiled_task.meta_data.num_candidates:
                             raise RuntimeError(
                                 'Invalid schedule index {} for compiled task at {}'.format(
                                     sch_idx, compiled_task.task_dir
                                 )
                             )
-                        kernel_array[task_idx] = ctypes_func_pointer(compiled_task.candidates[sch_idx].ctypes_func)
-                    self.dispatch_table[tuple(symbol_dims)] = kernel_array
+                    self.loaded_candidates[tuple(symbol_dims)] = schedule_indices
@@ -13,7 +13,7 @@ from typing import Sequence
 from hidet.ir.module import IRModule
 
 from .base import Pass, FunctionPass, SequencePass, RepeatFunctionPass, PassContext
-from .instruments import PassInstrument, SaveIRInstrument, ProfileInstrument
+from .instruments import PassInstrument, SaveIRInstrument, ProfileInstrument, CompileProfileInstrument
 
 from .attach_hash_to_signature import attach_hash_to_signature
 from .unify_global_objects import unify_global_objects_pass
@@ -37,7 +37,7 @@ def is_required_letstmt(stmt: LetStmt):
     return (
         len(stmt.bind_values) != 0
         and all(hasattr(bv, 'func_var') for bv in stmt.bind_values)
-        and all(bv.func_var.name == 'get_symbol_value' for bv in stmt.bind_values)
+        and all(bv.func_var.name in ['get_symbol_value', 'get_symbol_slot_value'] for bv in stmt.bind_values)
     )
 
 
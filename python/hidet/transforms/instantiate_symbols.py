@@ -18,7 +18,7 @@ from hidet.ir.module import IRModule
 from hidet.ir.dtypes import int32
 from hidet.ir.functors import IRRewriter
 from hidet.ir.primitives import is_primitive_function
-from hidet.ir.primitives.runtime import get_symbol_value, get_ptr_symbol_value
+from hidet.ir.primitives.runtime import get_symbol_slot_value, get_ptr_symbol_value
 from hidet.ir.stmt import LaunchKernelStmt
 from hidet.ir.tools import collect
 from hidet.ir.utils.call_graph import CallGraph
@@ -98,7 +98,7 @@ class InstantiateSymbolsRewriter(IRRewriter):
                 symbol_values = []
                 for symbol in ordered_symbols:
                     if symbol.type.is_data_type() and symbol.type == int32:
-                        symbol_values.append(get_symbol_value(symbol.name))
+                        symbol_values.append(get_symbol_slot_value(symbol.name))
                     elif symbol.type.is_pointer():
                         symbol_values.append(cast(get_ptr_symbol_value(symbol.name), dtype=symbol.type))
                     else:
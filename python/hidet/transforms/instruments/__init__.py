@@ -12,3 +12,4 @@
 from .base import PassInstrument
 from .profile_instrument import ProfileInstrument
 from .save_ir_instrument import SaveIRInstrument
+from .compile_profile_instrument import CompileProfileInstrument
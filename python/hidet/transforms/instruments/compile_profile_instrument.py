@@ -0,0 +1,182 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from typing import Optional, Dict, List, Any, Sequence, Tuple
+import os
+import json
+import time
+
+from hidet.ir.module import IRModule
+from hidet.ir.functors.base_functor import BaseFunctor, BaseRewriter, push_functor_tracker, pop_functor_tracker
+
+from .base import PassInstrument
+
+
+def count_visited_nodes(functors: Sequence[BaseFunctor]) -> Tuple[Optional[int], Optional[int]]:
+    """
+    Count the nodes visited by a pass and the distinct nodes they are rewritten to, from the memo of the functor
+    of the pass with the largest memo (usually, the one that traverses the whole module). Thus, the nodes are counted
+    during the traversal of the pass itself. Returns (None, None) if the pass does not use any memoized functor.
+    """
+    memos = [(f, f.memo) for f in functors if f.memo]
+    if len(memos) == 0:
+        return None, None
+    functor, memo = max(memos, key=lambda item: len(item[1]))
+    if isinstance(functor, BaseRewriter):
+        return len(memo), len({id(v) for v in memo.values()})
+    return len(memo), len(memo)
+
+
+class CompileProfileInstrument(PassInstrument):
+    """
+    Record the wall time, the number of IR nodes before and after (see :func:`count_visited_nodes`), and the memo
+    sizes of the functors of each pass.
+
+    The record of each lowered module is appended to the json file `log_file`, which contains a list of records.
+    See :func:`write_compile_profile_report` to aggregate the records.
+    """
+
+    def __init__(self, log_file: str):
+        dirname = os.path.dirname(log_file)
+        os.makedirs(dirname, exist_ok=True)
+        self.log_file: str = log_file
+        self.passes: List[Dict[str, Any]] = []
+        self.stack: List[Dict[str, Any]] = []
+        self.start_time: float = 0.0
+
+    def before_all_passes(self, ir_module: IRModule):
+        self.passes.clear()
+        self.start_time = time.time()
+
+    def before_pass(self, pass_name: str, ir_module: IRModule):
+        push_functor_tracker()
+        self.stack.append({'pass': pass_name, 'start': time.time()})
+
+    def after_pass(self, pass_name: str, ir_module: IRModule):
+        end = time.time()
+        functors = pop_functor_tracker()
+        record = self.stack.pop()
+        record['time'] = end - record.pop('start')
+        record['nodes_before'], record['nodes_after'] = count_visited_nodes(functors)
+        record['memo_entries'] = sum(len(f.memo) for f in functors if f.memo is not None)
+        record['depth'] = len(self.stack)
+        self.passes.append(record)
+
+    def after_all_passes(self, ir_module: IRModule):
+        record = {
+            'module': ir_module.namespace,
+            'output_dir': os.path.dirname(self.log_file),
+            'timestamp': time.time(),
+            'total_time': time.time() - self.start_time,
+            'passes': list(self.passes),
+        }
+        records = load_compile_profiles(self.log_file)
+        records.append(record)
+        with open(self.log_file, 'w') as f:
+            json.dump(records, f)
+
+
+def load_compile_profiles(log_file: str) -> List[Dict[str, Any]]:
+    """
+    Load the records written by :class:`CompileProfileInstrument`. Returns an empty list if the file does not exist.
+    """
+    if not os.path.exists(log_file):
+        return []
+    with open(log_file, 'r') as f:
+        try:
+            return json.load(f)
+        except json.JSONDecodeError:
+            return []
+
+
+def merge_compile_profiles(src_files: Sequence[str], dst_file: str):
+    """
+    Append the records in the `src_files` to `dst_file`.
+    """
+    records = load_compile_profiles(dst_file)
+    for src_file in src_files:
+        records.extend(load_compile_profiles(src_file))
+    with open(dst_file, 'w') as f:
+        json.dump(records, f)
+
+
+def write_compile_profile_report(records: List[Dict[str, Any]], out_dir: str, top_modules: int = 20):
+    """
+    Aggregate the records of the lowered modules by pass, and write the report to `compile_profile.json` and
+    `compile_profile.txt` in `out_dir`. The passes are sorted by their total time in descending order.
+    """
+    from tabulate import tabulate
+
+    per_pass: Dict[str, Dict[str, Any]] = {}
+    for record in records:
+        for p in record['passes']:
+            if p['depth'] > 0:
+                # nested passes are included in the time of the enclosing pass
+                continue
+            stat = per_pass.setdefault(
+                p['pass'],
+                {'pass': p['pass'], 'count': 0, 'total_time': 0.0, 'max_time': 0.0, 'node_delta': 0, 'max_memo': 0},
+            )
+            stat['count'] += 1
+            stat['total_time'] += p['time']
+            stat['max_time'] = max(stat['max_time'], p['time'])
+            if p['nodes_before'] is not None and p['nodes_after'] is not None:
+                stat['node_delta'] += p['nodes_after'] - p['nodes_before']
+            stat['max_memo'] = max(stat['max_memo'], p['memo_entries'])
+    pass_stats = sorted(per_pass.values(), key=lambda s: s['total_time'], reverse=True)
+    module_stats = sorted(
+        (
+            {
+                'module': r['module'],
+                'output_dir': r['output_dir'],
+                'total_time': r['total_time'],
+                'max_nodes': max((p['nodes_after'] or 0 for p in r['passes']), default=0),
+            }
+            for r in records
+        ),
+        key=lambda s: s['total_time'],
+        reverse=True,
+    )
+
+    os.makedirs(out_dir, exist_ok=True)
+    with open(os.path.join(out_dir, 'compile_profile.json'), 'w') as f:
+        json.dump({'passes': pass_stats, 'modules': module_stats, 'records': records}, f, indent=2)
+    with open(os.path.join(out_dir, 'compile_profile.txt'), 'w') as f:
+        total = sum(s['total_time'] for s in pass_stats)
+        f.write('lowered {} modules in {:.3f} seconds\n\n'.format(len(records), total))
+        f.write(
+            tabulate(
+                [
+                    [
+                        s['pass'],
+                        s['count'],
+                        '{:.3f}'.format(s['total_time']),
+                        '{:.1f}%'.format(100 * s['total_time'] / total if total > 0 else 0.0),
+                        '{:.3f}'.format(s['max_time']),
+                        s['node_delta'],
+                        s['max_memo'],
+                    ]
+                    for s in pass_stats
+                ],
+                headers=['pass', 'count', 'total (s)', 'ratio', 'max (s)', 'node delta', 'max memo'],
+            )
+        )
+        f.write('\n\nslowest modules:\n')
+        f.write(
+            tabulate(
+                [
+                    [s['module'], '{:.3f}'.format(s['total_time']), s['max_nodes'], s['output_dir']]
+                    for s in module_stats[:top_modules]
+                ],
+                headers=['module', 'total (s)', 'max nodes', 'output dir'],
+            )
+        )
+        f.write('\n')
@@ -17,7 +17,7 @@ from tqdm import tqdm
 import hidet
 import hidet.cuda
 from hidet.utils import green, gc_disabled
-from hidet.option import is_fix_gpu_frequency_for_tuning
+from hidet.option import is_fix_gpu_frequency_for_tuning, get_tuning_budget
 from .gpu_freq import GPUSetFrequencyForBenchmarking
 from .utils import create_event, sync, get_empty_kernel_cpu_time_ns, _benchmark_func_internal
 from .utils import get_event_time_accuracy_ms, get_cuda_event_duration
@@ -212,13 +212,28 @@ def _find_best_candidate(candidates: List[Callable[..., None]], pbar, *args):
     num_candidates = len(candidates)
     candidates_data = [CandidateData(idx=idx) for idx, _ in enumerate(candidates)]
     repeats = (7, 31)
+    plateau = get_tuning_budget()[2]
     for cur_repeat in repeats:
+        best_median, num_not_improved = float('inf'), 0
         for idx, cand in enumerate(candidates):
             if candidates_data[idx].in_game:
                 lats = benchmark_func(cand, *args, warmup=3, number=None, repeat=cur_repeat, median=False)
                 candidates_data[idx].latencies = lats
                 pbar.update(1)
 
+                # in the first round, stop when the best latency has not been improved by the last `plateau`
+                # candidates, and drop the candidates that have not been benchmarked yet
+                if plateau is not None and cur_repeat == repeats[0]:
+                    if np.median(lats) < best_median:
+                        best_median, num_not_improved = np.median(lats), 0
+                    else:
+                        num_not_improved += 1
+                    if num_not_improved >= plateau:
+                        for skipped in candidates_data[idx + 1 :]:
+                            skipped.in_game = False
+                            skipped.median = float('inf')
+                        break
+
         for cand in candidates_data:
             if cand.in_game:
                 cand.median = np.median(cand.latencies)
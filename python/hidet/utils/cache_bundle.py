@@ -0,0 +1,284 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Export and import the operator cache as a single relocatable archive (a cache bundle).
+
+A bundle is a zip file that contains the task directories of the operator cache under ``ops/`` and an ``index.json``
+that records, for each task, its location relative to the cache directory, the hidet version and target it was built
+with, the architecture and the (path-normalized) compilation command, and the sha256 digest of each file. Importing a
+bundle validates the entries against the local hidet version and architecture and the digests, skips the entries that
+already exist in the local cache, and installs the remaining ones atomically.
+"""
+from typing import List, Dict, Optional, Sequence, Any
+import os
+import re
+import json
+import shutil
+import hashlib
+import logging
+import zipfile
+import tempfile
+
+import hidet.option
+
+logger = logging.Logger(__name__)
+logger.setLevel(logging.INFO)
+logger.addHandler(logging.StreamHandler())
+
+BUNDLE_INDEX_NAME = 'index.json'
+BUNDLE_FORMAT_VERSION = 1
+
+
+def _file_digest(path: str) -> str:
+    sha = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
+def _read_text(path: str) -> Optional[str]:
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r') as f:
+        return f.read().strip()
+
+
+def _parse_arch(target: str, command: str) -> Optional[str]:
+    patterns = {'cuda': r'code=(sm_\d+)', 'hip': r'--offload-arch=(\w+)', 'cpu': r'-march=(\S+)'}
+    if target not in patterns:
+        return None
+    matched = re.search(patterns[target], command)
+    return matched.group(1) if matched else None
+
+
+def _local_arch(target: str) -> Optional[str]:
+    try:
+        if target == 'cuda':
+            return hidet.option.cuda.get_arch()
+        elif target == 'hip':
+            return hidet.option.hip.get_arch()
+        elif target == 'cpu':
+            return hidet.option.cpu.get_arch()
+    except Exception:  # pylint: disable=broad-except
+        # the device or the compiler is not available on this machine
+        pass
+    return None
+
+
+def _valid_task_dirs(ops_dir: str, targets: Optional[Sequence[str]]) -> List[str]:
+    from hidet.runtime.compiled_module import compiled_module_exists
+
+    task_dirs = []
+    for root, dirs, files in os.walk(ops_dir):
+        if 'version.txt' not in files:
+            continue
+        # do not descend into the sub-directories of a task (e.g., the candidates kept for debugging)
+        dirs.clear()
+        meta_path = os.path.join(root, 'meta.json')
+        if _read_text(os.path.join(root, 'version.txt')) != hidet.__version__ or not os.path.exists(meta_path):
+            continue
+        if not compiled_module_exists(root):
+            continue
+        if targets is not None:
+            with open(meta_path, 'r') as f:
+                if json.load(f)['target'] not in targets:
+                    continue
+        task_dirs.append(root)
+    return sorted(task_dirs)
+
+
+def export_cache_bundle(bundle_path: str, targets: Optional[Sequence[str]] = None) -> int:
+    """
+    Export the operators in the operator cache to a cache bundle.
+
+    Only the operators built by the current hidet version are exported.
+
+    Parameters
+    ----------
+    bundle_path: str
+        The path of the bundle to create. By convention, the path ends with '.zip'.
+    targets: Optional[Sequence[str]]
+        Only export the operators built for these targets (e.g., 'cuda', 'cpu'). None to export all of them.
+
+    Returns
+    -------
+    ret: int
+        The number of exported operators.
+    """
+    cache_dir = hidet.option.get_cache_dir()
+    ops_dir = os.path.join(cache_dir, 'ops')
+    entries: List[Dict[str, Any]] = []
+    dirname = os.path.dirname(os.path.abspath(bundle_path))
+    os.makedirs(dirname, exist_ok=True)
+    with tempfile.NamedTemporaryFile(dir=dirname, delete=False) as temp_file:
+        temp_path = temp_file.name
+    try:
+        with zipfile.ZipFile(temp_path, 'w', compression=zipfile.ZIP_DEFLATED) as zf:
+            for task_dir in _valid_task_dirs(ops_dir, targets):
+                relpath = os.path.relpath(task_dir, cache_dir)
+                with open(os.path.join(task_dir, 'meta.json'), 'r') as f:
+                    meta = json.load(f)
+                command = (_read_text(os.path.join(task_dir, 'compile.sh')) or '').replace(task_dir, '<task_dir>')
+                files = {}
+                for root, _, names in os.walk(task_dir):
+                    for name in names:
+                        path = os.path.join(root, name)
+                        file_relpath = os.path.relpath(path, task_dir)
+                        files[file_relpath] = _file_digest(path)
+                        zf.write(path, arcname=os.path.join(relpath, file_relpath))
+                entries.append(
+                    {
+                        'path': relpath,
+                        'name': meta['name'],
+                        'hash': os.path.basename(task_dir),
+                        'target': meta['target'],
+                        'arch': _parse_arch(meta['target'], command),
+                        'hidet_version': hidet.__version__,
+                        'compile_command': command,
+                        'files': files,
+                    }
+                )
+            index = {'format_version': BUNDLE_FORMAT_VERSION, 'hidet_version': hidet.__version__, 'entries': entries}
+            zf.writestr(BUNDLE_INDEX_NAME, json.dumps(index, indent=2))
+        os.replace(temp_path, bundle_path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+    return len(entries)
+
+
+def read_cache_bundle_index(bundle_path: str) -> Dict[str, Any]:
+    """
+    Read the index of a cache bundle.
+
+    Parameters
+    ----------
+    bundle_path: str
+        The path of the bundle.
+
+    Returns
+    -------
+    ret: Dict[str, Any]
+        The index of the bundle, see :func:`export_cache_bundle`.
+    """
+    with zipfile.ZipFile(bundle_path, 'r') as zf:
+        with zf.open(BUNDLE_INDEX_NAME, 'r') as f:
+            return json.load(f)
+
+
+def _checked_relpath(path: str, kind: str) -> str:
+    # the paths in the index of a bundle must stay inside the directory they are extracted to
+    relpath = os.path.normpath(path)
+    if os.path.isabs(relpath) or relpath in (os.curdir, os.pardir) or relpath.startswith(os.pardir + os.sep):
+        raise ValueError('Invalid {} path in cache bundle: {}'.format(kind, path))
+    return relpath
+
+
+def import_cache_bundle(bundle_path: str, force: bool = False) -> Dict[str, int]:
+    """
+    Import the operators in a cache bundle into the operator cache.
+
+    The entries built by a different hidet version are always skipped, and the entries built for a different
+    architecture than the one configured on this machine are skipped unless `force` is set. The entries that already
+    exist in the local cache are skipped. The paths in the bundle must be relative paths inside the operator cache.
+    The digest of each extracted file is verified, and each entry is installed atomically, so that a corrupted bundle
+    never leaves a partial task in the cache.
+
+    Parameters
+    ----------
+    bundle_path: str
+        The path of the bundle.
+    force: bool
+        Whether to import the entries with mismatched architecture.
+
+    Returns
+    -------
+    ret: Dict[str, int]
+        The number of entries that are 'imported', 'existing' (already in the cache), 'incompatible' (hidet version
+        or architecture mismatch) and 'corrupted' (digest mismatch).
+    """
+    from hidet.drivers.build_task import verify_disk_cache
+
+    cache_dir = hidet.option.get_cache_dir()
+    stats = {'imported': 0, 'existing': 0, 'incompatible': 0, 'corrupted': 0}
+    local_arch: Dict[str, Optional[str]] = {}
+    with zipfile.ZipFile(bundle_path, 'r') as zf:
+        with zf.open(BUNDLE_INDEX_NAME, 'r') as f:
+            index = json.load(f)
+        if index['format_version'] != BUNDLE_FORMAT_VERSION:
+            raise ValueError(
+                'Unsupported cache bundle format version {}, expect {}.'.format(
+                    index['format_version'], BUNDLE_FORMAT_VERSION
+                )
+            )
+        for entry in index['entries']:
+            relpath = _checked_relpath(entry['path'], 'entry')
+            if not relpath.startswith('ops' + os.sep):
+                raise ValueError('Invalid entry path in cache bundle: {}'.format(entry['path']))
+            for file_relpath in entry['files']:
+                _checked_relpath(file_relpath, 'file')
+            task_dir = os.path.join(cache_dir, relpath)
+            if verify_disk_cache(os.path.join(task_dir, 'version.txt'), task_dir):
+                stats['existing'] += 1
+                continue
+
+            if entry['target'] not in local_arch:
+                local_arch[entry['target']] = _local_arch(entry['target'])
+            arch = local_arch[entry['target']]
+            version_matched = entry['hidet_version'] == hidet.__version__
+            arch_matched = entry['arch'] is None or arch is None or entry['arch'] == arch
+            # the operator cache only loads the tasks built by the same version, even when forced
+            if not version_matched or (not arch_matched and not force):
+                logger.warning(
+                    'Skip %s built by hidet %s for %s, the local hidet is %s for %s.',
+                    relpath,
+                    entry['hidet_version'],
+                    entry['arch'],
+                    hidet.__version__,
+                    arch,
+                )
+                stats['incompatible'] += 1
+                continue
+
+            # extract to a temporary directory next to the task directory, then move it into place
+            parent_dir = os.path.dirname(task_dir)
+            os.makedirs(parent_dir, exist_ok=True)
+            temp_dir = tempfile.mkdtemp(dir=parent_dir, prefix='.import_')
+            try:
+                corrupted = False
+                for file_relpath, digest in entry['files'].items():
+                    dst_path = os.path.join(temp_dir, file_relpath)
+                    os.makedirs(os.path.dirname(dst_path), exist_ok=True)
+                    with zf.open('/'.join([entry['path'], file_relpath]), 'r') as src, open(dst_path, 'wb') as dst:
+                        shutil.copyfileobj(src, dst)
+                    if _file_digest(dst_path) != digest:
+                        corrupted = True
+                        break
+                if corrupted:
+                    logger.warning('Skip %s, the content does not match its digest.', relpath)
+                    stats['corrupted'] += 1
+                    continue
+                if os.path.exists(task_dir):
+                    # an incomplete or outdated entry
+                    shutil.rmtree(task_dir, ignore_errors=True)
+                try:
+                    os.rename(temp_dir, task_dir)
+                except OSError:
+                    # another process has installed the same entry concurrently
+                    stats['existing'] += 1
+                    continue
+                stats['imported'] += 1
+            finally:
+                if os.path.exists(temp_dir):
+                    shutil.rmtree(temp_dir, ignore_errors=True)
+    return stats
@@ -0,0 +1,166 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+The index of the operator cache.
+
+Loading a task from the operator cache needs to check its ``version.txt`` and ``lib.so``, and read its ``meta.json``
+and ``func_types.pickle``, which are many small file operations per task and dominate the warm start time on network
+file systems. The index is a sqlite database at ``<cache_dir>/ops/.index.sqlite`` that records, for each compiled
+task ``ops/<target>_space_<n>/<task name>/<task hash>``, the hidet version it was built with, its meta data and its
+function types. The entry of a task is written in a single transaction after the task has been built (or verified
+on disk), and is consulted before the files of the task.
+
+An index entry might be stale when the task directory has been removed by other means than
+:func:`hidet.utils.cache_manager.evict_cache`. In that case, loading the task fails and the caller removes the entry
+with :func:`remove_task_index` and falls back to the files.
+"""
+from typing import Dict, Tuple, Optional, Any, Sequence
+import os
+import json
+import sqlite3
+import logging
+import threading
+
+import hidet.option
+
+logger = logging.Logger(__name__)
+logger.setLevel(logging.INFO)
+logger.addHandler(logging.StreamHandler())
+
+INDEX_NAME = '.index.sqlite'
+
+_lock = threading.Lock()
+
+# (pid, index path) -> (connection, inode of the index file)
+_connections: Dict[Tuple[int, str], Tuple[sqlite3.Connection, int]] = {}
+
+
+class TaskIndexEntry:
+    def __init__(self, meta: Dict[str, Any], func_types: bytes):
+        self.meta: Dict[str, Any] = meta
+        self.func_types: bytes = func_types
+
+
+def _split_task_dir(task_dir: str) -> Tuple[str, str]:
+    # task_dir: <ops dir>/<target>_space_<n>/<task name>/<task hash>
+    task_dir = os.path.abspath(task_dir)
+    ops_dir = os.path.dirname(os.path.dirname(os.path.dirname(task_dir)))
+    return os.path.join(ops_dir, INDEX_NAME), os.path.relpath(task_dir, ops_dir)
+
+
+def _connect(index_path: str, create: bool) -> Optional[sqlite3.Connection]:
+    try:
+        inode = os.stat(index_path).st_ino
+    except FileNotFoundError:
+        inode = None
+    key = (os.getpid(), index_path)
+    if key in _connections:
+        conn, cached_inode = _connections[key]
+        if inode == cached_inode:
+            return conn
+        # the index has been removed (e.g., by 'hidet cache clear') or replaced since it was opened
+        del _connections[key]
+        conn.close()
+    if inode is None and not create:
+        return None
+    os.makedirs(os.path.dirname(index_path), exist_ok=True)
+    conn = sqlite3.connect(index_path, timeout=60, check_same_thread=False)
+    with conn:
+        conn.execute(
+            'CREATE TABLE IF NOT EXISTS tasks (key TEXT PRIMARY KEY, version TEXT, meta TEXT, func_types BLOB)'
+        )
+    _connections[key] = (conn, os.stat(index_path).st_ino)
+    return conn
+
+
+def lookup_task_index(task_dir: str) -> Optional[TaskIndexEntry]:
+    """
+    Look up the compiled task in the index of the operator cache.
+
+    Parameters
+    ----------
+    task_dir: str
+        The directory of the task in the operator cache.
+
+    Returns
+    -------
+    ret: Optional[TaskIndexEntry]
+        The entry of the task, or None if the task built by the current hidet version is not in the index.
+    """
+    index_path, key = _split_task_dir(task_dir)
+    try:
+        with _lock:
+            conn = _connect(index_path, create=False)
+            if conn is None:
+                return None
+            row = conn.execute(
+                'SELECT meta, func_types FROM tasks WHERE key = ? AND version = ?', (key, hidet.__version__)
+            ).fetchone()
+    except sqlite3.Error as e:
+        logger.warning('Failed to read the operator cache index %s: %s', index_path, e)
+        return None
+    if row is None:
+        return None
+    return TaskIndexEntry(meta=json.loads(row[0]), func_types=row[1])
+
+
+def update_task_index(task_dir: str):
+    """
+    Record the compiled task in the index of the operator cache.
+
+    The task directory must contain a compiled task built by the current hidet version.
+
+    Parameters
+    ----------
+    task_dir: str
+        The directory of the task in the operator cache.
+    """
+    index_path, key = _split_task_dir(task_dir)
+    with open(os.path.join(task_dir, 'meta.json'), 'r') as f:
+        meta = f.read()
+    with open(os.path.join(task_dir, 'func_types.pickle'), 'rb') as f:
+        func_types = f.read()
+    try:
+        with _lock:
+            conn = _connect(index_path, create=True)
+            with conn:
+                conn.execute(
+                    'INSERT OR REPLACE INTO tasks (key, version, meta, func_types) VALUES (?, ?, ?, ?)',
+                    (key, hidet.__version__, meta, sqlite3.Binary(func_types)),
+                )
+    except sqlite3.Error as e:
+        logger.warning('Failed to update the operator cache index %s: %s', index_path, e)
+
+
+def remove_task_index(task_dirs: Sequence[str]):
+    """
+    Remove the compiled tasks from the index of the operator cache.
+
+    Parameters
+    ----------
+    task_dirs: Sequence[str]
+        The directories of the tasks in the operator cache.
+    """
+    keys_by_index: Dict[str, list] = {}
+    for task_dir in task_dirs:
+        index_path, key = _split_task_dir(task_dir)
+        keys_by_index.setdefault(index_path, []).append((key,))
+    for index_path, keys in keys_by_index.items():
+        try:
+            with _lock:
+                conn = _connect(index_path, create=False)
+                if conn is None:
+                    continue
+                with conn:
+                    conn.executemany('DELETE FROM tasks WHERE key = ?', keys)
+        except sqlite3.Error as e:
+            logger.warning('Failed to update the operator cache index %s: %s', index_path, e)
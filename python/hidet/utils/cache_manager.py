@@ -0,0 +1,356 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Size-bounded least-recently-used eviction of the on-disk cache.
+
+The cache directory contains the following kinds of entries, each of which can be removed independently:
+
+- ``ops/<target>_space_<n>/<task name>/<task hash>``: the compiled operators.
+- ``graphs/<graph hash>``: the compiled graphs.
+- ``flowgraph/<key>``: the flow graph cache of the torch frontend.
+- ``ir_modules/<hash>``: the compiled ir modules (e.g., the graph modules).
+- ``objects/<key[:2]>/<key><ext>``: the content-addressed compiled objects.
+
+The last access time of an entry is the latest modification time of its directory (or file) and everything under
+it. It is updated by :func:`touch_cache_entry` whenever the entry is loaded, and by every file written into the entry
+while it is being built (e.g., the candidates of an operator), so that a build in another process keeps its entry
+alive. The entries accessed within the last ``min_age`` seconds and the entries pinned by :func:`pin_cache_entry`
+(e.g., the tasks being built and the compiled tasks and graphs alive in any process) are never evicted. A pinned
+directory holds a shared lock on its ``.pin`` file, which the eviction in other processes respects; the lock is
+released when the entry is unpinned or the process exits, so the kernels of a lazily loaded graph are kept for as
+long as the graph is alive, not only for ``min_age`` seconds after it was loaded.
+
+The compiled graphs saved with ``share_kernels=True`` reference the operators in ``ops/`` instead of embedding them.
+Each referenced operator records the paths of the saved files in its ``referrers.txt`` (see
+:func:`add_cache_entry_referrer`), and is never evicted while any of these files exists.
+"""
+from typing import Dict, List, Optional, Tuple, Union
+import os
+import re
+import time
+import shutil
+import logging
+import threading
+import fcntl
+
+import hidet.option
+from hidet.utils.cache_index import remove_task_index
+
+logger = logging.Logger(__name__)
+logger.setLevel(logging.INFO)
+logger.addHandler(logging.StreamHandler())
+
+# the interval between two automatic evictions, in seconds
+AUTO_EVICT_INTERVAL = 600
+
+# the entries accessed within this period are considered in use, in seconds
+DEFAULT_MIN_AGE = 600
+
+# the file in an entry that lists the files referring to the entry, one absolute path per line
+REFERRERS_FILE = 'referrers.txt'
+
+# the file in a pinned directory, locked in shared mode by the processes that pin the directory
+PIN_FILE = '.pin'
+
+# the pinned paths and the number of times each of them is pinned
+_pinned_entries: Dict[str, int] = {}
+# the descriptors of the locked pin files of the pinned directories
+_pin_fds: Dict[str, int] = {}
+_pinned_lock = threading.Lock()
+
+
+class CacheEntry:
+    def __init__(self, kind: str, path: str, size: int, last_access: float):
+        self.kind: str = kind
+        self.path: str = path
+        self.size: int = size
+        self.last_access: float = last_access
+
+
+def parse_size(size: Union[int, str]) -> int:
+    """
+    Parse a size in bytes, like 1024, '512MiB', '100GB' or '1.5T'.
+    """
+    if isinstance(size, int):
+        return size
+    matched = re.fullmatch(r'\s*([0-9.]+)\s*([KMGTP]?)(i?B?)\s*', size, flags=re.IGNORECASE)
+    if matched is None:
+        raise ValueError('Can not parse the size: {}'.format(size))
+    number, unit, _ = matched.groups()
+    return int(float(number) * 1024 ** 'BKMGTP'.index(unit.upper() or 'B'))
+
+
+def _get_size_and_mtime(path: str) -> Tuple[int, float]:
+    stat = os.stat(path)
+    if os.path.isfile(path):
+        return stat.st_size, stat.st_mtime
+    size, mtime = 0, stat.st_mtime
+    for root, dirs, files in os.walk(path):
+        for is_file, names in [(False, dirs), (True, files)]:
+            for name in names:
+                try:
+                    stat = os.stat(os.path.join(root, name))
+                except OSError:
+                    # the file has been removed concurrently
+                    continue
+                mtime = max(mtime, stat.st_mtime)
+                if is_file:
+                    size += stat.st_size
+    return size, mtime
+
+
+def _lock_pin_file(path: str, exclusive: bool) -> Optional[int]:
+    # lock the pin file of the directory without blocking, return its descriptor, or None if it is locked by others
+    try:
+        fd = os.open(os.path.join(path, PIN_FILE), os.O_RDWR | os.O_CREAT)
+    except OSError:
+        return None
+    try:
+        fcntl.flock(fd, (fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH) | fcntl.LOCK_NB)
+    except OSError:
+        os.close(fd)
+        return None
+    return fd
+
+
+def pin_cache_entry(path: str):
+    """
+    Prevent the cache entry at the given path from being evicted, by this process and the other processes.
+
+    The pins are counted: the entry can be evicted again after each pin is released by :func:`unpin_cache_entry`.
+    """
+    path = os.path.abspath(path)
+    with _pinned_lock:
+        _pinned_entries[path] = _pinned_entries.get(path, 0) + 1
+        if path not in _pin_fds and os.path.isdir(path):
+            fd = _lock_pin_file(path, exclusive=False)
+            if fd is not None:
+                _pin_fds[path] = fd
+
+
+def unpin_cache_entry(path: str):
+    """
+    Release a pin of the cache entry at the given path, made by :func:`pin_cache_entry`.
+    """
+    path = os.path.abspath(path)
+    with _pinned_lock:
+        count = _pinned_entries.get(path, 0)
+        if count <= 1:
+            _pinned_entries.pop(path, None)
+            fd = _pin_fds.pop(path, None)
+            if fd is not None:
+                # closing the descriptor releases the lock
+                os.close(fd)
+        else:
+            _pinned_entries[path] = count - 1
+
+
+def touch_cache_entry(path: str):
+    """
+    Mark the cache entry at the given path as accessed now.
+    """
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+
+
+def add_cache_entry_referrer(path: str, referrer: str):
+    """
+    Keep the cache entry at the given path from being evicted while the referrer file exists.
+
+    Parameters
+    ----------
+    path: str
+        The path of the cache entry, e.g., the directory of a compiled task in the operator cache.
+    referrer: str
+        The path of the file that refers to the entry, e.g., a compiled graph saved with shared kernels.
+    """
+    referrer = os.path.abspath(referrer)
+    referrers_path = os.path.join(path, REFERRERS_FILE)
+    try:
+        if os.path.exists(referrers_path):
+            with open(referrers_path, 'r') as f:
+                if referrer in f.read().splitlines():
+                    return
+        with open(referrers_path, 'a') as f:
+            f.write(referrer + '\n')
+    except OSError as e:
+        logger.warning('Failed to record the referrer of cache entry %s: %s', path, e)
+
+
+def _is_referred(entry: CacheEntry) -> bool:
+    referrers_path = os.path.join(entry.path, REFERRERS_FILE)
+    if not os.path.isfile(referrers_path):
+        return False
+    try:
+        with open(referrers_path, 'r') as f:
+            return any(os.path.exists(referrer) for referrer in f.read().splitlines() if referrer)
+    except OSError:
+        return False
+
+
+def _is_pinned(entry: CacheEntry) -> bool:
+    with _pinned_lock:
+        pinned = list(_pinned_entries)
+    return any(path == entry.path or path.startswith(entry.path + os.sep) for path in pinned)
+
+
+def _list_dirs(path: str, depth: int) -> List[str]:
+    if depth == 0:
+        return [path]
+    if not os.path.isdir(path):
+        return []
+    ret = []
+    for entry in os.scandir(path):
+        if entry.is_dir() and not entry.name.startswith('.'):
+            ret.extend(_list_dirs(entry.path, depth - 1))
+    return ret
+
+
+def list_cache_entries(cache_dir: Optional[str] = None) -> List[CacheEntry]:
+    """
+    List the evictable entries in the cache directory.
+
+    Parameters
+    ----------
+    cache_dir: Optional[str]
+        The cache directory. None to use the current cache directory.
+
+    Returns
+    -------
+    ret: List[CacheEntry]
+        The entries in the cache directory.
+    """
+    if cache_dir is None:
+        cache_dir = hidet.option.get_cache_dir()
+    paths = []
+    for kind, depth in [('ops', 3), ('graphs', 1), ('flowgraph', 1), ('ir_modules', 1)]:
+        paths.extend((kind, path) for path in _list_dirs(os.path.join(cache_dir, kind), depth))
+    for path in _list_dirs(os.path.join(cache_dir, 'objects'), 1):
+        paths.extend(('objects', entry.path) for entry in os.scandir(path) if entry.is_file())
+
+    entries = []
+    for kind, path in paths:
+        try:
+            size, last_access = _get_size_and_mtime(path)
+        except OSError:
+            continue
+        entries.append(CacheEntry(kind, os.path.abspath(path), size, last_access))
+    return entries
+
+
+def _remove_entry(entry: CacheEntry, cache_dir: str):
+    if os.path.isdir(entry.path):
+        shutil.rmtree(entry.path, ignore_errors=True)
+    elif os.path.exists(entry.path):
+        os.remove(entry.path)
+    # remove the empty parent directories (e.g., ops/<target>_space_<n>/<task name>)
+    parent = os.path.dirname(entry.path)
+    while os.path.dirname(parent) != cache_dir and parent != cache_dir:
+        try:
+            os.rmdir(parent)
+        except OSError:
+            break
+        parent = os.path.dirname(parent)
+
+
+def evict_cache(
+    size_limit: Union[int, str], cache_dir: Optional[str] = None, min_age: float = DEFAULT_MIN_AGE, dry_run=False
+) -> List[CacheEntry]:
+    """
+    Evict the least-recently-used entries until the total size of the entries is within the limit.
+
+    Parameters
+    ----------
+    size_limit: Union[int, str]
+        The size limit of the cache in bytes, or a string like '100GiB'.
+    cache_dir: Optional[str]
+        The cache directory. None to use the current cache directory.
+    min_age: float
+        The entries accessed within the last `min_age` seconds are considered in use and are not evicted.
+    dry_run: bool
+        Only return the entries to evict without removing them.
+
+    Returns
+    -------
+    ret: List[CacheEntry]
+        The evicted entries.
+    """
+    if cache_dir is None:
+        cache_dir = hidet.option.get_cache_dir()
+    cache_dir = os.path.abspath(cache_dir)
+    size_limit = parse_size(size_limit)
+    entries = list_cache_entries(cache_dir)
+    total_size = sum(entry.size for entry in entries)
+    now = time.time()
+
+    evicted = []
+    for entry in sorted(entries, key=lambda e: e.last_access):
+        if total_size <= size_limit:
+            break
+        if _is_pinned(entry) or _is_referred(entry) or now - entry.last_access < min_age:
+            continue
+        # hold the pin file of the entry exclusively while removing it, it fails if other processes pin the entry
+        fd = None
+        if os.path.exists(os.path.join(entry.path, PIN_FILE)):
+            fd = _lock_pin_file(entry.path, exclusive=True)
+            if fd is None:
+                continue
+        try:
+            if not dry_run:
+                _remove_entry(entry, cache_dir)
+        finally:
+            if fd is not None:
+                os.close(fd)
+        total_size -= entry.size
+        evicted.append(entry)
+
+    if not dry_run:
+        remove_task_index([entry.path for entry in evicted if entry.kind == 'ops'])
+        # remove the flow graph entries that refer to an evicted compiled graph
+        graphs_dir = os.path.join(cache_dir, 'graphs')
+        for key_dir in _list_dirs(os.path.join(cache_dir, 'flowgraph'), 1):
+            names = os.listdir(key_dir)
+            if len(names) == 1 and re.fullmatch(r'[0-9a-f]+', names[0]):
+                if not os.path.exists(os.path.join(graphs_dir, names[0])):
+                    shutil.rmtree(key_dir, ignore_errors=True)
+    if evicted and total_size > size_limit:
+        logger.warning(
+            'The hidet cache is still %d bytes over the limit after eviction, the remaining entries are in use.',
+            total_size - size_limit,
+        )
+    return evicted
+
+
+def maybe_evict_cache():
+    """
+    Evict the cache when hidet.option.cache_size_limit is set, at most once every few minutes.
+    """
+    size_limit = hidet.option.get_cache_size_limit()
+    if size_limit is None:
+        return
+    cache_dir = hidet.option.get_cache_dir()
+    stamp_path = os.path.join(cache_dir, '.last_eviction')
+    if os.path.exists(stamp_path) and time.time() - os.path.getmtime(stamp_path) < AUTO_EVICT_INTERVAL:
+        return
+    os.makedirs(cache_dir, exist_ok=True)
+    with open(stamp_path, 'w'):
+        pass
+    evicted = evict_cache(size_limit, cache_dir)
+    if evicted:
+        logger.info(
+            'Evicted %d entries (%d bytes) from hidet cache %s.',
+            len(evicted),
+            sum(entry.size for entry in evicted),
+            cache_dir,
+        )
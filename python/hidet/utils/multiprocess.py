@@ -9,10 +9,11 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-from typing import Any, Sequence, Callable, Optional, Iterable
+from typing import Any, Sequence, Callable, Optional, Iterable, Dict, Tuple, List
+import atexit
 import multiprocessing
 from concurrent.futures import ProcessPoolExecutor, as_completed
-from hidet.option import compile_server, get_num_local_workers
+from hidet.option import compile_server, get_num_local_workers, get_nested_parallel_limit, get_persistent_worker_pool
 
 
 def get_parallel_num_workers(is_remote_allowed: bool) -> int:
@@ -50,13 +51,82 @@ def parallel_imap_1stlevel(func: Callable, jobs: Sequence[Any], is_remote_allowe
             yield func(job)
         return
 
+    # make sure the semaphores of the 2nd level exist before forking, so that all workers share them
+    _get_nested_semaphore(remote=False)
+    _get_nested_semaphore(remote=True)
+
+    if get_persistent_worker_pool():
+        from hidet.option import OptionContext
+
+        executor = _get_worker_pool(get_parallel_num_workers(is_remote_allowed))
+        option_stack = OptionContext.stack
+        submitted_jobs = [executor.submit(_run_with_options, func, option_stack, job) for job in jobs]
+        for completed_job in as_completed(submitted_jobs):
+            yield completed_job.result()
+        return
+
     with ProcessPoolExecutor(max_workers=num_workers) as executor:
         submitted_jobs = [executor.submit(func, job) for job in jobs]
         for completed_job in as_completed(submitted_jobs):
             yield completed_job.result()
 
 
+# PERSISTENT WORKER POOL FOR THE 1ST LEVEL
+# The worker processes are forked once (with hidet and its registries already imported in the parent process) and
+# reused by all following parallel builds. Since the workers do not see the option changes made in the parent process
+# after the fork, the option context stack is sent along with each job.
+_worker_pool: Optional[ProcessPoolExecutor] = None
+_worker_pool_config: Optional[Tuple[int, int, int]] = None
+
+
+def _warm_up_worker():
+    # import the modules used by the builds, in case they have not been imported by the parent process yet
+    import hidet.drivers  # pylint: disable=unused-import
+    import hidet.lang  # pylint: disable=unused-import
+    import hidet.transforms  # pylint: disable=unused-import
+
+
+def _run_with_options(func: Callable, option_stack: List[Any], job: Any) -> Any:
+    from hidet.option import OptionContext
+
+    OptionContext.stack = option_stack
+    return func(job)
+
+
+def _get_worker_pool(num_workers: int) -> ProcessPoolExecutor:
+    global _worker_pool, _worker_pool_config
+
+    config = (num_workers, get_nested_parallel_limit(), compile_server.get_nested_parallel_limit())
+    if _worker_pool is not None and _worker_pool_config != config:
+        shutdown_worker_pool()
+    if _worker_pool is None:
+        _worker_pool = ProcessPoolExecutor(
+            max_workers=num_workers, mp_context=multiprocessing.get_context('fork'), initializer=_warm_up_worker
+        )
+        _worker_pool_config = config
+    return _worker_pool
+
+
+def shutdown_worker_pool():
+    """
+    Shut down the persistent worker pool, if it has been created.
+
+    See :func:`hidet.option.persistent_worker_pool` for more details.
+    """
+    global _worker_pool, _worker_pool_config
+
+    if _worker_pool is not None:
+        _worker_pool.shutdown(wait=True)
+        _worker_pool = None
+        _worker_pool_config = None
+
+
+atexit.register(shutdown_worker_pool)
+
+
 # 2ND LEVEV PARALLELISATION IMPLEMENTATION
+# The 2nd level pools are not persistent: a new pool is forked for each call, so that the workers inherit the jobs
+# (IR modules and closures that are expensive or impossible to pickle) from the calling process.
 class JobQueue:
     def __init__(self, func, jobs: Sequence[Any] = tuple()):
         self.func: Callable = func
@@ -80,8 +150,18 @@ def _wrapped_func(job_index):
     return func(job)
 
 
-semaphore_local_compilation = multiprocessing.Semaphore(2)
-semaphore_remote_compilation = multiprocessing.Semaphore(3)
+# The semaphores bound the number of 1st level workers that run a 2nd level pool at the same time. They are created
+# in the parent process before the 1st level workers are forked, keyed by their limits given by the
+# `nested_parallel_limit` and `compile_server.nested_parallel_limit` options.
+_nested_semaphores: Dict[Tuple[bool, int], Any] = {}
+
+
+def _get_nested_semaphore(remote: bool):
+    limit = compile_server.get_nested_parallel_limit() if remote else get_nested_parallel_limit()
+    key = (remote, limit)
+    if key not in _nested_semaphores:
+        _nested_semaphores[key] = multiprocessing.Semaphore(limit)
+    return _nested_semaphores[key]
 
 
 def parallel_imap_2ndlevel(func: Callable, jobs: Sequence[Any], is_remote_allowed: bool = False) -> Iterable[Any]:
@@ -96,10 +176,7 @@ def parallel_imap_2ndlevel(func: Callable, jobs: Sequence[Any], is_remote_allowe
             yield func(job)
         return
 
-    if is_remote_allowed and compile_server.enabled():
-        semaphore = semaphore_remote_compilation
-    else:
-        semaphore = semaphore_local_compilation
+    semaphore = _get_nested_semaphore(remote=is_remote_allowed and compile_server.enabled())
 
     with semaphore:
         global _job_queue
@@ -11,9 +11,14 @@
 # limitations under the License.
 from __future__ import annotations
 
-from typing import TypeVar, Dict, List, Tuple, Callable
+from typing import TypeVar, Dict, List, Tuple, Callable, Optional, Generic, Hashable
+from collections import OrderedDict
+
+from hidet.utils.counters import counters
 
 GraphNode = TypeVar('GraphNode')
+Key = TypeVar('Key', bound=Hashable)
+Value = TypeVar('Value')
 
 
 class DirectedGraph:
@@ -157,3 +162,63 @@ class DirectedGraph:
             raise ValueError('Loop detected during generating topological order for a directed graph.')
 
         return order
+
+
+class LRUCache(Generic[Key, Value]):
+    """Least-recently-used cache.
+
+    The cache is bounded by the number of entries and, optionally, the total number of bytes of the entries. The
+    hits, misses and evictions are recorded in ``hidet.utils.counters.counters[name]``.
+
+    Parameters
+    ----------
+    name: str
+        The name of the cache, used as the key of the counters.
+
+    nbytes: Optional[Callable[[Value], int]]
+        The function to get the number of bytes held by an entry. It is evaluated when the cache is shrunk, because
+        the memory held by an entry may change after it is added (e.g., lazily allocated workspace).
+    """
+
+    def __init__(self, name: str, nbytes: Optional[Callable[[Value], int]] = None):
+        self.name: str = name
+        self.nbytes: Optional[Callable[[Value], int]] = nbytes
+        self.entries: OrderedDict[Key, Value] = OrderedDict()
+
+    def __contains__(self, key: Key) -> bool:
+        return key in self.entries
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def get(self, key: Key) -> Optional[Value]:
+        if key not in self.entries:
+            counters[self.name]['miss'] += 1
+            return None
+        counters[self.name]['hit'] += 1
+        self.entries.move_to_end(key)
+        return self.entries[key]
+
+    def put(self, key: Key, value: Value, capacity: Optional[int] = None, max_bytes: Optional[int] = None):
+        """Add an entry as the most recently used one, then evict the least recently used entries to fit the
+        capacity and max_bytes limits (None for no limit). The newly added entry is never evicted."""
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        self.shrink(capacity, max_bytes)
+
+    def shrink(self, capacity: Optional[int] = None, max_bytes: Optional[int] = None):
+        if capacity is not None:
+            while len(self.entries) > max(capacity, 1):
+                self._evict()
+        if max_bytes is not None and self.nbytes is not None:
+            total_bytes = sum(self.nbytes(value) for value in self.entries.values())
+            while total_bytes > max_bytes and len(self.entries) > 1:
+                total_bytes -= self.nbytes(self._evict())
+
+    def _evict(self) -> Value:
+        _, value = self.entries.popitem(last=False)
+        counters[self.name]['evict'] += 1
+        return value
+
+    def clear(self):
+        self.entries.clear()
@@ -0,0 +1,189 @@
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+#include <map>
+#include <set>
+#include <unordered_map>
+#include <utility>
+#include <vector>
+#include <hidet/runtime/logging.h>
+#include <hidet/runtime/memory_planner.h>
+
+static const int64_t alignment = 128;
+
+struct MemoryPlanner {
+    // the end of the allocated regions, all memory after it is free
+    int64_t top = 0;
+    // the free regions before top: start -> size, and (size, start)
+    std::map<int64_t, int64_t> free_by_start;
+    std::set<std::pair<int64_t, int64_t>> free_by_size;
+    // the allocated regions: start -> size
+    std::unordered_map<int64_t, int64_t> size_map;
+    int64_t used = 0;
+
+    // the statistics since the last reset, kept across re-initializations
+    int64_t peak = 0;
+    int64_t peak_used = 0;
+    int64_t num_allocations = 0;
+
+    void insert_free(int64_t start, int64_t size) {
+        free_by_start[start] = size;
+        free_by_size.insert({size, start});
+    }
+
+    void erase_free(std::map<int64_t, int64_t>::iterator it) {
+        free_by_size.erase({it->second, it->first});
+        free_by_start.erase(it);
+    }
+};
+
+// the planners are used by the launch functions running on the current thread
+static thread_local std::vector<MemoryPlanner> memory_planners;
+
+static MemoryPlanner &get_memory_planner(int idx) {
+    if (idx < 0) {
+        LOG(ERROR) << "Invalid memory planner index " << idx;
+    }
+    if (memory_planners.size() <= (size_t)idx) {
+        memory_planners.resize(idx + 1);
+    }
+    return memory_planners[idx];
+}
+
+DLL void memory_planner_init(int idx) {
+    try {
+        MemoryPlanner &planner = get_memory_planner(idx);
+        planner.top = 0;
+        planner.used = 0;
+        planner.free_by_start.clear();
+        planner.free_by_size.clear();
+        planner.size_map.clear();
+    } catch (HidetException &e) {
+        hidet_set_last_error(e.what());
+        return;
+    }
+}
+
+DLL int64_t memory_planner_allocate(int idx, int64_t size) {
+    try {
+        MemoryPlanner &planner = get_memory_planner(idx);
+
+        if (size == 0) {
+            return -1;
+        }
+
+        size = (size + alignment - 1) / alignment * alignment;
+        int64_t start;
+        auto it = planner.free_by_size.lower_bound({size, 0});
+        if (it != planner.free_by_size.end()) {
+            // the smallest free region that fits
+            int64_t region_size = it->first;
+            start = it->second;
+            planner.erase_free(planner.free_by_start.find(start));
+            if (region_size > size) {
+                planner.insert_free(start + size, region_size - size);
+            }
+        } else {
+            start = planner.top;
+            planner.top += size;
+        }
+        planner.size_map[start] = size;
+        planner.used += size;
+        planner.num_allocations++;
+        if (planner.top > planner.peak) {
+            planner.peak = planner.top;
+            planner.peak_used = planner.used;
+        }
+        return start;
+    } catch (HidetException &e) {
+        hidet_set_last_error(e.what());
+        return 0;
+    }
+}
+
+DLL void memory_planner_free(int idx, int64_t ptr) {
+    try {
+        MemoryPlanner &planner = get_memory_planner(idx);
+
+        if (ptr == -1) {
+            return;
+        }
+
+        auto sit = planner.size_map.find(ptr);
+        if (sit == planner.size_map.end()) {
+            LOG(ERROR) << "Freeing an unallocated region at offset " << ptr;
+        }
+        int64_t start = ptr;
+        int64_t size = sit->second;
+        planner.size_map.erase(sit);
+        planner.used -= size;
+
+        // coalesce with the free regions before and after it
+        auto next = planner.free_by_start.lower_bound(start);
+        if (next != planner.free_by_start.begin()) {
+            auto prev = std::prev(next);
+            if (prev->first + prev->second == start) {
+                start = prev->first;
+                size += prev->second;
+                planner.erase_free(prev);
+            }
+        }
+        if (next != planner.free_by_start.end() && start + size == next->first) {
+            size += next->second;
+            planner.erase_free(next);
+        }
+        if (start + size == planner.top) {
+            planner.top = start;
+        } else {
+            planner.insert_free(start, size);
+        }
+    } catch (HidetException &e) {
+        hidet_set_last_error(e.what());
+        return;
+    }
+}
+
+DLL int64_t memory_planner_used(int idx) {
+    try {
+        return get_memory_planner(idx).top;
+    } catch (HidetException &e) {
+        hidet_set_last_error(e.what());
+        return 0;
+    }
+}
+
+DLL void memory_planner_get_stats(int idx, int64_t *stats) {
+    try {
+        MemoryPlanner &planner = get_memory_planner(idx);
+        stats[0] = planner.peak;
+        stats[1] = planner.peak_used;
+        stats[2] = planner.top;
+        stats[3] = planner.used;
+        stats[4] = (int64_t)planner.free_by_start.size();
+        stats[5] = planner.free_by_size.empty() ? 0 : planner.free_by_size.rbegin()->first;
+        stats[6] = planner.num_allocations;
+    } catch (HidetException &e) {
+        hidet_set_last_error(e.what());
+        return;
+    }
+}
+
+DLL void memory_planner_reset_stats(int idx) {
+    try {
+        MemoryPlanner &planner = get_memory_planner(idx);
+        planner.peak = planner.top;
+        planner.peak_used = planner.used;
+        planner.num_allocations = 0;
+    } catch (HidetException &e) {
+        hidet_set_last_error(e.what());
+        return;
+    }
+}
@@ -11,26 +11,72 @@
 // limitations under the License.
 #include <hidet/runtime/logging.h>
 #include <hidet/runtime/symbols.h>
+#include <algorithm>
+#include <mutex>
+#include <unordered_map>
 
-static std::map<std::string, int32_t> symbol_mapping;
+int32_t hidet_symbol_table[HIDET_MAX_NUM_SYMBOLS];
+bool hidet_symbol_is_set[HIDET_MAX_NUM_SYMBOLS];
+static std::unordered_map<std::string, int32_t> symbol_slots;
+static std::mutex symbol_slots_mutex;
 static std::map<std::string, void *> symbol_mapping_ptr;
 
-DLL void reset_symbol_table() {
+static int32_t find_symbol_slot(const char *symbol_name) {
+    std::lock_guard<std::mutex> lock(symbol_slots_mutex);
+    auto it = symbol_slots.find(symbol_name);
+    return it == symbol_slots.end() ? -1 : it->second;
+}
+
+static int32_t register_symbol_slot(const char *symbol_name) {
+    std::lock_guard<std::mutex> lock(symbol_slots_mutex);
+    auto it = symbol_slots.find(symbol_name);
+    if (it != symbol_slots.end()) {
+        return it->second;
+    }
+    int32_t slot = (int32_t)symbol_slots.size();
+    if (slot >= HIDET_MAX_NUM_SYMBOLS) {
+        LOG(ERROR) << "Too many symbols, at most " << HIDET_MAX_NUM_SYMBOLS << " symbols are supported";
+    }
+    symbol_slots[symbol_name] = slot;
+    return slot;
+}
+
+DLL int32_t register_symbol(const char *symbol_name) {
     try {
-        symbol_mapping.clear();
+        return register_symbol_slot(symbol_name);
     } catch (HidetException &e) {
         hidet_set_last_error(e.what());
-        return;
+        // an invalid slot, which get_symbol_slot_value rejects on every read
+        return -1;
     }
 }
 
+DLL void set_symbol_values(int32_t num_symbols, const int32_t *slots, const int32_t *values) {
+    for (int32_t i = 0; i < num_symbols; i++) {
+        hidet_symbol_table[slots[i]] = values[i];
+        hidet_symbol_is_set[slots[i]] = true;
+    }
+}
+
+DLL void get_symbol_values(int32_t num_symbols, const int32_t *slots, int32_t *values) {
+    for (int32_t i = 0; i < num_symbols; i++) {
+        values[i] = hidet_symbol_table[slots[i]];
+    }
+}
+
+DLL void reset_symbol_table() {
+    // the slots are kept, as they have been cached by the call sites in the loaded modules
+    std::fill(hidet_symbol_table, hidet_symbol_table + HIDET_MAX_NUM_SYMBOLS, 0);
+    std::fill(hidet_symbol_is_set, hidet_symbol_is_set + HIDET_MAX_NUM_SYMBOLS, false);
+}
+
 DLL int32_t get_symbol_value(const char *symbol_name) {
     try {
-        auto it = symbol_mapping.find(symbol_name);
-        if (it == symbol_mapping.end()) {
+        int32_t slot = find_symbol_slot(symbol_name);
+        if (slot < 0 || !hidet_symbol_is_set[slot]) {
             LOG(ERROR) << "Symbol " << symbol_name << " not found";
         }
-        return it->second;
+        return hidet_symbol_table[slot];
     } catch (HidetException &e) {
         hidet_set_last_error(e.what());
         return 0;
@@ -39,7 +85,9 @@ DLL int32_t get_symbol_value(const char *symbol_name) {
 
 DLL void set_symbol_value(const char *symbol_name, int32_t value) {
     try {
-        symbol_mapping[symbol_name] = value;
+        int32_t slot = register_symbol_slot(symbol_name);
+        hidet_symbol_table[slot] = value;
+        hidet_symbol_is_set[slot] = true;
     } catch (HidetException &e) {
         hidet_set_last_error(e.what());
         return;
@@ -0,0 +1,68 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import os
+import sys
+import subprocess
+import hidet
+from hidet.ir.expr import var
+from hidet.ir.tools import structural_hash
+
+
+def _relu_task(shape):
+    return hidet.ops.relu(hidet.symbol(shape, device='cpu')).op.task
+
+
+def test_structural_hash():
+    a, b = var('a', 'int32'), var('b', 'int32')
+    c, d = var('c', 'int32'), var('d', 'int32')
+    # the hints of the variables do not matter, but their bindings do
+    assert structural_hash(a + b * 2) == structural_hash(c + d * 2)
+    assert structural_hash(a + a * 2) != structural_hash(a + b * 2)
+    assert structural_hash(a + 1) != structural_hash(a + 1.0)
+    # the equal tuples with different element types are not mixed up
+    assert structural_hash([(1,), (True,)]) != structural_hash([(1,), (1,)])
+    assert structural_hash([(1.0,), (1,)]) != structural_hash([(1,), (1,)])
+
+    assert _relu_task([3, 4]).calculate_hash() == _relu_task([3, 4]).calculate_hash()
+    assert _relu_task([3, 4]).calculate_hash() != _relu_task([3, 5]).calculate_hash()
+    assert _relu_task([3, 4]).calculate_hash() != hidet.ops.sigmoid(hidet.symbol([3, 4])).op.task.calculate_hash()
+
+
+def test_structural_hash_temporary_containers():
+    from hidet.ir.task import InverseMap
+    from hidet.ir.tools.hasher import StructuralHash
+
+    # the temporary lists and dicts may reuse the ids of the freed ones, which must not share their digests
+    hasher = StructuralHash()
+    assert hasher([1, 2]) != hasher([3, 4])
+    assert hasher({'a': 'x'}) != hasher({'a': 'y'})
+
+    def relu_task(inverse_map=None, mode=None):
+        task = _relu_task([3, 4])
+        if inverse_map is not None:
+            task.inverse_map = {x: InverseMap.from_lambda(inverse_map) for x in task.inverse_map}
+        if mode is not None:
+            task.attrs['mode'] = mode
+        return task
+
+    assert relu_task(lambda i, j: [i, j]).calculate_hash() != relu_task(lambda i, j: [j, i]).calculate_hash()
+    assert relu_task(mode='a').calculate_hash() != relu_task(mode='b').calculate_hash()
+
+
+def test_structural_hash_across_processes():
+    # the hash must not depend on the python hash seed, since it is used as the key of the operator cache
+    script = 'import hidet; print(hidet.ops.softmax(hidet.symbol([3, 4])).op.task.calculate_hash())'
+    hashes = set()
+    for seed in ['1', '2']:
+        env = dict(os.environ, PYTHONHASHSEED=seed)
+        hashes.add(subprocess.check_output([sys.executable, '-c', script], env=env).decode().strip().splitlines()[-1])
+    assert len(hashes) == 1
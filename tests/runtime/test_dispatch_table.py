@@ -171,15 +171,15 @@ def test_points_dispatch_table_pick_best_candidate(fresh_task_dir):
         mock_find_best.return_value = (0, [5.0, 10.0])
         candidates = [MockCompiledFunction("cand0"), MockCompiledFunction("cand1")]
         table = PointsDispachTable(candidates=candidates, task_dir=fresh_task_dir, symbols=["s0"], name="test_points")
-        with patch.object(RuntimeAPI, 'get_symbol_value', return_value=42):
-            idx = table.pick_best_candidate([], [])
-            assert idx == 0
-            assert table.dispatch_table[(42,)] == 0
-
-            mock_find_best.reset_mock()
-            idx2 = table.pick_best_candidate([], [])
-            assert idx2 == 0
-            mock_find_best.assert_not_called()
+        RuntimeAPI.set_symbol_value('s0', 42)
+        idx = table.pick_best_candidate([], [])
+        assert idx == 0
+        assert table.dispatch_table[(42,)] == 0
+
+        mock_find_best.reset_mock()
+        idx2 = table.pick_best_candidate([], [])
+        assert idx2 == 0
+        mock_find_best.assert_not_called()
 
 
 def test_points_dispatch_table_load_save(fresh_task_dir):
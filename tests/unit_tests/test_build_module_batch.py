@@ -0,0 +1,111 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import os
+import time
+import multiprocessing
+import hidet
+from hidet.drivers import build_module
+
+
+def _candidate(i: int):
+    from hidet.lang import attrs
+    from hidet.lang.types import f32
+
+    with hidet.script_module() as script_module:
+
+        @hidet.script
+        def launch(out: f32[4], inp: f32[4]):
+            attrs.func_kind = 'public'
+
+            for j in range(4):
+                out[j] = inp[j] + float(i)
+
+    ir_module = script_module.ir_module()
+    ir_module.namespace = 'candidate_{}'.format(i)
+    return ir_module
+
+
+def test_pipelined_batch_build(tmp_path, monkeypatch):
+    # count the busy lowering workers (forked processes) and compiler threads (in this process)
+    busy = multiprocessing.get_context('fork').Value('i', 0)
+    max_busy = multiprocessing.get_context('fork').Value('i', 0)
+
+    def tracked(func):
+        def wrapped(*args, **kwargs):
+            with busy.get_lock():
+                busy.value += 1
+                max_busy.value = max(max_busy.value, busy.value)
+            try:
+                time.sleep(0.05)
+                return func(*args, **kwargs)
+            finally:
+                with busy.get_lock():
+                    busy.value -= 1
+
+        return wrapped
+
+    monkeypatch.setattr(build_module, 'generate_ir_module_source', tracked(build_module.generate_ir_module_source))
+    monkeypatch.setattr(build_module.CompilationJob, 'compile', tracked(build_module.CompilationJob.compile))
+
+    with hidet.option.context():
+        hidet.option.num_local_workers(2)
+        hidet.option.cache_compiled_objects(False)
+        # compile each candidate in its own translation unit
+        hidet.option.unity_build(True, max_candidates=1)
+        num_candidates = 6
+        output_dirs = [str(tmp_path / str(i)) for i in range(num_candidates)]
+        built_dirs = build_module.build_ir_module_batch(
+            ir_modules=[_candidate(i) for i in range(num_candidates)],
+            output_dirs=output_dirs,
+            output_kind='.o',
+            target='cpu',
+        )
+
+    assert built_dirs == output_dirs
+    for built_dir in built_dirs:
+        assert os.path.getsize(os.path.join(built_dir, 'lib.o')) > 0
+    # the lowering workers and the compilers share the local worker slots
+    assert 1 <= max_busy.value <= 2
+
+
+def test_regroup_modules():
+    modules = list(range(7))
+    with hidet.option.context():
+        hidet.option.num_local_workers(2)
+
+        # without unity build, the modules are only grouped when there are more modules than workers
+        hidet.option.unity_build(False)
+        assert build_module.regroup_modules(modules[:2]) == modules[:2]
+        groups = build_module.regroup_modules(list(modules))
+        assert len(groups) == 2
+        assert sorted(sum(groups, [])) == modules
+
+        # with unity build, the groups are bounded by the maximum number of candidates per translation unit
+        hidet.option.unity_build(True, max_candidates=3)
+        groups = build_module.regroup_modules(list(modules))
+        assert len(groups) == 3
+        assert all(1 <= len(group) <= 3 for group in groups)
+        assert sorted(sum(groups, [])) == modules
+
+        # each worker gets a translation unit when there are more workers than the bounded groups
+        hidet.option.num_local_workers(5)
+        groups = build_module.regroup_modules(list(modules))
+        assert len(groups) == 5
+        assert all(1 <= len(group) <= 3 for group in groups)
+        assert sorted(sum(groups, [])) == modules
+        hidet.option.num_local_workers(8)
+        assert build_module.regroup_modules(list(modules)) == modules
+        hidet.option.num_local_workers(2)
+
+        # a single candidate per translation unit does not group the modules
+        hidet.option.unity_build(True, max_candidates=1)
+        assert build_module.regroup_modules(list(modules)) == modules
@@ -0,0 +1,90 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import os
+import json
+import zipfile
+import pytest
+import hidet
+from hidet.utils.cache_bundle import BUNDLE_INDEX_NAME
+from hidet.utils.cache_bundle import export_cache_bundle, import_cache_bundle, read_cache_bundle_index
+
+
+def test_cache_bundle(tmp_path):
+    bundle_path = str(tmp_path / 'bundle.zip')
+    with hidet.option.context():
+        hidet.option.cache_dir(str(tmp_path / 'src'))
+        task = hidet.ops.relu(hidet.symbol([3, 4], device='cpu')).op.task
+        task.build(target='cpu', load=False)
+        assert export_cache_bundle(bundle_path) == 1
+
+    index = read_cache_bundle_index(bundle_path)
+    assert index['hidet_version'] == hidet.__version__
+    assert index['entries'][0]['target'] == 'cpu'
+
+    with hidet.option.context():
+        hidet.option.cache_dir(str(tmp_path / 'dst'))
+        assert import_cache_bundle(bundle_path)['imported'] == 1
+        assert import_cache_bundle(bundle_path)['existing'] == 1
+
+        # the imported task is loaded from the cache instead of being compiled
+        hidet.runtime.compiled_task.compiled_task_cache.clear()
+        compiled_task = task.build(target='cpu')
+        assert compiled_task.task_dir.startswith(str(tmp_path / 'dst'))
+        x = hidet.randn([3, 4], device='cpu')
+        y = hidet.empty([3, 4], device='cpu')
+        compiled_task(x, y)
+        hidet.utils.assert_close(y, hidet.ops.relu(x))
+
+
+def _rewrite_bundle(src_path: str, dst_path: str, update_entry):
+    # copy the bundle, with each entry of its index updated by update_entry
+    index = read_cache_bundle_index(src_path)
+    for entry in index['entries']:
+        update_entry(entry)
+    with zipfile.ZipFile(src_path, 'r') as src, zipfile.ZipFile(dst_path, 'w') as dst:
+        for info in src.infolist():
+            if info.filename != BUNDLE_INDEX_NAME:
+                dst.writestr(info, src.read(info))
+        dst.writestr(BUNDLE_INDEX_NAME, json.dumps(index))
+
+
+def test_cache_bundle_rejects_unsafe_and_mismatched_entries(tmp_path):
+    bundle_path = str(tmp_path / 'bundle.zip')
+    with hidet.option.context():
+        hidet.option.cache_dir(str(tmp_path / 'src'))
+        task = hidet.ops.relu(hidet.symbol([3, 5], device='cpu')).op.task
+        task.build(target='cpu', load=False)
+        assert export_cache_bundle(bundle_path) == 1
+
+    def escape_task_dir(entry):
+        entry['files'] = {
+            '../../../../escaped.txt' if name == 'task.txt' else name: d for name, d in entry['files'].items()
+        }
+
+    def other_version(entry):
+        entry['hidet_version'] = '0.0.0'
+
+    escaping_path = str(tmp_path / 'escaping.zip')
+    _rewrite_bundle(bundle_path, escaping_path, escape_task_dir)
+    mismatched_path = str(tmp_path / 'mismatched.zip')
+    _rewrite_bundle(bundle_path, mismatched_path, other_version)
+
+    with hidet.option.context():
+        hidet.option.cache_dir(str(tmp_path / 'dst'))
+        # the files of an entry can not be extracted outside of its task directory
+        with pytest.raises(ValueError):
+            import_cache_bundle(escaping_path)
+        assert not os.path.exists(str(tmp_path / 'dst' / 'escaped.txt'))
+
+        # the entries built by another hidet version are not imported, even when forced
+        assert import_cache_bundle(mismatched_path, force=True)['incompatible'] == 1
+        assert import_cache_bundle(bundle_path)['imported'] == 1
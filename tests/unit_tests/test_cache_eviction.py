@@ -0,0 +1,99 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import os
+from hidet.utils.cache_manager import evict_cache, list_cache_entries, pin_cache_entry, unpin_cache_entry, parse_size
+
+
+def _make_entry(path: str, size: int, last_access: float):
+    os.makedirs(path, exist_ok=True)
+    with open(os.path.join(path, 'lib.so'), 'wb') as f:
+        f.write(b'0' * size)
+    os.utime(os.path.join(path, 'lib.so'), (last_access, last_access))
+    os.utime(path, (last_access, last_access))
+
+
+def test_parse_size():
+    assert parse_size(1024) == 1024
+    assert parse_size('2KiB') == 2048
+    assert parse_size('1.5 MB') == 1536 * 1024
+    assert parse_size('100G') == 100 * 1024**3
+
+
+def test_evict_cache(tmp_path):
+    cache_dir = str(tmp_path)
+    old = os.path.join(cache_dir, 'ops', 'cpu_space_0', 'relu', 'a')
+    pinned = os.path.join(cache_dir, 'ops', 'cpu_space_0', 'add', 'b')
+    graph = os.path.join(cache_dir, 'graphs', 'c')
+    recent = os.path.join(cache_dir, 'ir_modules', 'd')
+    _make_entry(old, 100, 1000)
+    _make_entry(pinned, 100, 2000)
+    _make_entry(graph, 100, 3000)
+    _make_entry(recent, 100, 4000)
+    assert len(list_cache_entries(cache_dir)) == 4
+
+    pin_cache_entry(pinned)
+    try:
+        evicted = evict_cache(200, cache_dir, min_age=0)
+    finally:
+        unpin_cache_entry(pinned)
+
+    # the least-recently-used unpinned entries are evicted until the cache is within the limit
+    assert [entry.path for entry in evicted] == [old, graph]
+    assert not os.path.exists(os.path.dirname(old))
+    assert os.path.exists(pinned) and os.path.exists(recent)
+
+
+def test_evict_cache_in_use(tmp_path):
+    cache_dir = str(tmp_path)
+    building = os.path.join(cache_dir, 'ops', 'cpu_space_0', 'relu', 'a')
+    pinned = os.path.join(cache_dir, 'ops', 'cpu_space_0', 'add', 'b')
+    candidate_dir = os.path.join(building, 'candidates', '0')
+    _make_entry(candidate_dir, 100, 1000)
+    _make_entry(building, 100, 1000)
+    _make_entry(pinned, 100, 1000)
+    os.utime(os.path.dirname(candidate_dir), (1000, 1000))
+
+    # a file written under the entry (e.g., a candidate being built) marks the entry as in use
+    assert len(evict_cache(0, cache_dir, min_age=600, dry_run=True)) == 2
+    with open(os.path.join(candidate_dir, 'source.cc'), 'w') as f:
+        f.write('// candidate')
+    assert [entry.path for entry in evict_cache(0, cache_dir, min_age=600, dry_run=True)] == [pinned]
+    pin_cache_entry(pinned)
+    assert evict_cache(0, cache_dir, min_age=600, dry_run=True) == []
+
+    # the pins are counted
+    pin_cache_entry(pinned)
+    unpin_cache_entry(pinned)
+    assert [entry.path for entry in evict_cache(0, cache_dir, min_age=0, dry_run=True)] == [building]
+    unpin_cache_entry(pinned)
+    assert len(evict_cache(0, cache_dir, min_age=0, dry_run=True)) == 2
+
+
+def test_evict_cache_pinned_by_other_process(tmp_path):
+    import sys
+    import subprocess
+
+    cache_dir = str(tmp_path)
+    entry = os.path.join(cache_dir, 'graphs', 'a')
+    _make_entry(entry, 100, 1000)
+
+    # the entries pinned by another process are kept until the process releases them (e.g., exits)
+    script = 'import sys; from hidet.utils.cache_manager import pin_cache_entry; pin_cache_entry(sys.argv[1]); '
+    script += 'print("pinned", flush=True); sys.stdin.readline()'
+    with subprocess.Popen(
+        [sys.executable, '-c', script, entry], stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True
+    ) as proc:
+        assert proc.stdout.readline().strip() == 'pinned'
+        assert evict_cache(0, cache_dir, min_age=0) == []
+        proc.stdin.write('\n')
+        proc.stdin.flush()
+    assert [e.path for e in evict_cache(0, cache_dir, min_age=0)] == [entry]
@@ -0,0 +1,51 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import os
+import shutil
+import hidet
+from hidet.utils.counters import counters
+from hidet.utils.cache_index import lookup_task_index
+from hidet.runtime.compiled_task import compiled_task_cache
+
+
+def test_cache_index(tmp_path):
+    counters.clear()
+    compiled_task_cache.clear()
+    with hidet.option.context():
+        hidet.option.cache_dir(str(tmp_path))
+        task = hidet.ops.relu(hidet.symbol([3, 4], device='cpu')).op.task
+        task_dir = task.build(target='cpu').task_dir
+        assert lookup_task_index(task_dir) is not None
+
+        # the warm load takes the meta data from the index
+        compiled_task_cache.clear()
+        compiled_task = task.build(target='cpu')
+        assert counters['cache_index']['hit'] == 1
+        x = hidet.randn([3, 4], device='cpu')
+        y = hidet.empty([3, 4], device='cpu')
+        compiled_task(x, y)
+        hidet.utils.assert_close(y, hidet.ops.relu(x))
+
+        # the stale entry is dropped and the task is compiled again
+        compiled_task_cache.clear()
+        shutil.rmtree(task_dir)
+        task.build(target='cpu')
+        assert counters['cache_index']['stale'] == 1
+        assert os.path.exists(os.path.join(task_dir, 'lib.so'))
+
+        # the stale entry is also detected when the task is built without being loaded
+        compiled_task_cache.clear()
+        shutil.rmtree(task_dir)
+        assert task.build(target='cpu', load=False) is None
+        assert counters['cache_index']['stale'] == 2
+        assert os.path.exists(os.path.join(task_dir, 'lib.so'))
+    compiled_task_cache.clear()
@@ -0,0 +1,65 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import os
+import json
+from click.testing import CliRunner
+import hidet
+from hidet.cli.cache.warmup import hidet_cache_warmup
+
+
+def test_cache_warmup(tmp_path):
+    with hidet.option.context():
+        hidet.option.cache_dir(str(tmp_path / 'src'))
+        task = hidet.ops.relu(hidet.symbol([3, 4], device='cpu')).op.task
+        task.build(target='cpu', load=False)
+
+    # pre-build the tasks found in the operator cache of 'src' into 'dst'
+    report_path = str(tmp_path / 'report.json')
+    with hidet.option.context():
+        result = CliRunner().invoke(
+            hidet_cache_warmup,
+            [
+                str(tmp_path / 'src' / 'ops'),
+                '--cache-dir',
+                str(tmp_path / 'dst'),
+                '--num-workers',
+                '1',
+                '--report',
+                report_path,
+            ],
+        )
+    assert result.exit_code == 0, result.output
+    assert 'Built 1 tasks' in result.output
+
+    with open(report_path, 'r') as f:
+        tasks = json.load(f)['tasks']
+    assert len(tasks) == 1 and tasks[0]['success']
+    # the target and space are inferred from the location of the task in the operator cache
+    dst_ops_dir = str(tmp_path / 'dst' / 'ops' / 'cpu_space_0')
+    task_dirs = [root for root, _, files in os.walk(dst_ops_dir) if 'lib.so' in files]
+    assert len(task_dirs) == 1
+
+
+def test_cache_warmup_reports_failures(tmp_path):
+    # a manifest that lists a task which can not be loaded
+    bad_task = tmp_path / 'ops' / 'cpu_space_0' / 'bad' / '0' / 'task.pickle'
+    os.makedirs(bad_task.parent)
+    bad_task.write_bytes(b'not a pickled task')
+    manifest = tmp_path / 'manifest.txt'
+    manifest.write_text('# tasks to build\n{}\n'.format(os.path.relpath(str(bad_task), str(tmp_path))))
+
+    with hidet.option.context():
+        result = CliRunner().invoke(
+            hidet_cache_warmup, [str(manifest), '--cache-dir', str(tmp_path / 'dst'), '--num-workers', '1']
+        )
+    assert result.exit_code != 0
+    assert 'Built 0 tasks' in result.output and '1 failed' in result.output
@@ -0,0 +1,76 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import os
+import hidet
+from hidet.drivers import build_ir_module
+from hidet.runtime.compiled_module import load_compiled_module
+from hidet.utils.counters import counters
+
+
+def _copy_module():
+    from hidet.lang import attrs
+    from hidet.lang.types import f32
+
+    with hidet.script_module() as script_module:
+
+        @hidet.script
+        def launch(out: f32[4], inp: f32[4]):
+            attrs.func_kind = 'public'
+
+            for i in range(4):
+                out[i] = inp[i]
+
+    return script_module.ir_module()
+
+
+def test_compile_cache_reuses_identical_sources(tmp_path):
+    with hidet.option.context():
+        hidet.option.cache_dir(str(tmp_path / 'cache'))
+        hidet.option.cache_compiled_objects(True)
+
+        hits = counters['compile_cache']['hit']
+        for name in ['a', 'b']:
+            os.makedirs(tmp_path / name)
+            build_ir_module(_copy_module(), output_dir=str(tmp_path / name), target='cpu')
+        assert counters['compile_cache']['hit'] == hits + 1
+
+        # the reused library is loadable and functional
+        func = load_compiled_module(str(tmp_path / 'b'))['launch']
+        x = hidet.randn([4], device='cpu')
+        y = hidet.empty([4], device='cpu')
+        func(y, x)
+        hidet.utils.assert_close(y, x)
+        assert os.path.exists(os.path.join(str(tmp_path / 'cache'), 'objects'))
+
+        # the libraries of different tasks are different files for the dynamic loader
+        assert os.stat(tmp_path / 'a' / 'lib.so').st_ino != os.stat(tmp_path / 'b' / 'lib.so').st_ino
+
+
+def test_compile_cache_key_covers_headers(tmp_path, monkeypatch):
+    from hidet.backend import compile_cache
+
+    include_dir = tmp_path / 'include'
+    os.makedirs(include_dir / 'hidet')
+    header = include_dir / 'hidet' / 'runtime.h'
+    header.write_text('#define VALUE 1\n')
+    src = tmp_path / 'source.cc'
+    src.write_text('#include <hidet/runtime.h>\n')
+    monkeypatch.setattr(compile_cache, 'get_include_dirs', lambda: [str(include_dir)])
+
+    command = 'g++ {} -o {}'.format(src, tmp_path / 'lib.so')
+    key = compile_cache.compile_cache_key(command, str(src), str(tmp_path / 'lib.so'))
+    assert compile_cache.compile_cache_key(command, str(src), str(tmp_path / 'lib.so')) == key
+
+    # a changed header invalidates the cached objects compiled against the old one
+    header.write_text('#define VALUE 2\n')
+    os.utime(header, ns=(0, 0))
+    assert compile_cache.compile_cache_key(command, str(src), str(tmp_path / 'lib.so')) != key
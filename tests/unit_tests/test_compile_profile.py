@@ -0,0 +1,51 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import os
+import hidet
+from hidet.drivers import build_ir_module
+from hidet.transforms.instruments.compile_profile_instrument import load_compile_profiles, write_compile_profile_report
+
+
+def _copy_module():
+    from hidet.lang import attrs
+    from hidet.lang.types import f32
+
+    with hidet.script_module() as script_module:
+
+        @hidet.script
+        def launch(out: f32[4], inp: f32[4]):
+            attrs.func_kind = 'public'
+
+            for i in range(4):
+                out[i] = inp[i]
+
+    return script_module.ir_module()
+
+
+def test_compile_profile(tmp_path):
+    with hidet.option.context():
+        hidet.option.compile_profile(True)
+        build_ir_module(_copy_module(), output_dir=str(tmp_path / 'module'), target='cpu')
+
+    records = load_compile_profiles(str(tmp_path / 'module' / 'lower_profile.json'))
+    assert len(records) == 1
+    passes = records[0]['passes']
+    assert len(passes) > 0
+    assert all(p['time'] >= 0 for p in passes)
+    # the nodes are counted by the passes that traverse the module with memoized functors
+    counted = [p for p in passes if p['nodes_before'] is not None]
+    assert len(counted) > 0
+    assert all(p['nodes_before'] > 0 and p['nodes_after'] > 0 for p in counted)
+
+    write_compile_profile_report(records, out_dir=str(tmp_path / 'report'))
+    assert os.path.exists(str(tmp_path / 'report' / 'compile_profile.json'))
+    assert os.path.exists(str(tmp_path / 'report' / 'compile_profile.txt'))
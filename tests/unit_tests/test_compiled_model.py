@@ -44,3 +44,257 @@ def test_load_save(device: str):
 
     numpy.testing.assert_allclose(y1.cpu().numpy(), y2.cpu().numpy())
     numpy.testing.assert_allclose(y1.cpu().numpy(), y3.cpu().numpy())
+
+
+def test_lazy_load(tmp_path):
+    x = hidet.symbol([2, 3], device='cpu')
+    y = hidet.ops.relu(x) + 1.0
+    compiled_graph = hidet.trace_from(y).build()
+    compiled_graph.save(str(tmp_path / 'model.hidet'))
+
+    # the kernels are not loaded until they are used or preloaded
+    loaded_compiled_graph = hidet.load_compiled_graph(str(tmp_path / 'model.hidet'))
+    assert not any(task.is_loaded() for task in loaded_compiled_graph.compiled_tasks)
+    loaded_compiled_graph.preload(num_threads=2)
+    assert all(task.is_loaded() for task in loaded_compiled_graph.compiled_tasks)
+
+
+def test_mmap_weights(tmp_path):
+    x = hidet.symbol([2, 3], device='cpu')
+    w1 = hidet.randn([3, 4], device='cpu')
+    w2 = hidet.randn([4], device='cpu').to(dtype='float16')
+    y = hidet.ops.matmul(x, w1) + w2.to(dtype='float32')
+    compiled_graph = hidet.trace_from(y).build()
+    compiled_graph.save(str(tmp_path / 'model.hidet'))
+
+    # the weights are mapped from the saved file and match the original weights
+    loaded_compiled_graph = hidet.load_compiled_graph(str(tmp_path / 'model.hidet'))
+    assert len(loaded_compiled_graph.weights) == len(compiled_graph.weights)
+    for w, loaded_w in zip(compiled_graph.weights, loaded_compiled_graph.weights):
+        assert loaded_w.dtype == w.dtype and loaded_w.shape == w.shape
+        assert loaded_w.storage.addr % 64 == 0
+        numpy.testing.assert_equal(loaded_w.numpy(), w.numpy())
+
+
+def test_streaming_save(tmp_path):
+    import zipfile
+    from hidet.runtime.compiled_graph import save_compiled_graph
+
+    x = hidet.symbol([2, 3], device='cpu')
+    w = hidet.randn([3, 4], device='cpu')
+    compiled_graph = hidet.trace_from(hidet.ops.matmul(x, w)).build()
+
+    path = str(tmp_path / 'model.hidet')
+    save_compiled_graph(compiled_graph, path, compression={'modules': 'deflate'}, num_workers=4)
+    with zipfile.ZipFile(path, 'r') as zf:
+        assert zf.getinfo('graph_module/lib.so').compress_type == zipfile.ZIP_DEFLATED
+        assert zf.getinfo('weights.bin').compress_type == zipfile.ZIP_STORED
+        assert zf.getinfo('meta.json').compress_type == zipfile.ZIP_STORED
+    loaded_compiled_graph = hidet.load_compiled_graph(path)
+    numpy.testing.assert_equal(loaded_compiled_graph.weights[0].numpy(), w.numpy())
+
+    # the deflated weights are read to memory instead of being memory-mapped
+    save_compiled_graph(compiled_graph, path, compression='deflate')
+    with zipfile.ZipFile(path, 'r') as zf:
+        assert zf.getinfo('weights.bin').compress_type == zipfile.ZIP_DEFLATED
+    loaded_compiled_graph = hidet.load_compiled_graph(path)
+    numpy.testing.assert_equal(loaded_compiled_graph.weights[0].numpy(), w.numpy())
+
+    with pytest.raises(ValueError):
+        save_compiled_graph(compiled_graph, path, compression={'weights': 'zstd'})
+
+
+def test_parallel_load(tmp_path):
+    import os
+
+    x = hidet.symbol([2, 3], device='cpu')
+    y = hidet.ops.relu(x) + 1.0
+    compiled_graph = hidet.trace_from(y).build()
+    compiled_graph.save(str(tmp_path / 'model.hidet'))
+
+    loaded_compiled_graph = hidet.load_compiled_graph(str(tmp_path / 'model.hidet'), num_workers=4, preload=True)
+    assert all(task.is_loaded() for task in loaded_compiled_graph.compiled_tasks)
+
+    # a damaged extraction is detected by the manifest and extracted again
+    graph_dir = loaded_compiled_graph.get_cache_dir()
+    source_path = os.path.join(graph_dir, 'graph_module', 'source.cc')
+    with open(source_path, 'w') as f:
+        f.write('')
+    hidet.load_compiled_graph(str(tmp_path / 'model.hidet'), num_workers=4)
+    assert os.path.getsize(source_path) > 0
+
+    # the files updated at runtime do not invalidate the extraction
+    mtime = os.path.getmtime(source_path)
+    with open(os.path.join(graph_dir, 'kernels', '0', 'dispatch_table.txt'), 'a') as f:
+        f.write('2 3 0\n')
+    hidet.load_compiled_graph(str(tmp_path / 'model.hidet'), num_workers=4)
+    assert os.path.getmtime(source_path) == mtime
+
+
+def test_load_rejects_unsafe_members(tmp_path):
+    import os
+    import zipfile
+
+    x = hidet.symbol([2, 3], device='cpu')
+    compiled_graph = hidet.trace_from(hidet.ops.relu(x) + 2.0).build()
+    path = str(tmp_path / 'model.hidet')
+    compiled_graph.save(path)
+    with zipfile.ZipFile(path, 'a') as zf:
+        zf.writestr('../escaped.txt', 'escaped')
+
+    # the members are never extracted outside the cache directory of the graph
+    with pytest.raises(ValueError):
+        hidet.load_compiled_graph(path)
+    graph_dir = hidet.utils.cache_dir('graphs', compiled_graph.meta.graph_hash)
+    assert not os.path.exists(os.path.join(os.path.dirname(graph_dir), 'escaped.txt'))
+
+
+def test_share_kernels(tmp_path):
+    import zipfile
+    from hidet.runtime.compiled_task import compiled_task_cache
+
+    x = hidet.symbol([2, 3], device='cpu')
+    graph_1 = hidet.trace_from(hidet.ops.relu(x) + 1.0).build()
+    graph_2 = hidet.trace_from(hidet.ops.relu(x) * 2.0).build()
+    graph_1.save(str(tmp_path / 'model_1.hidet'), share_kernels=True)
+    graph_2.save(str(tmp_path / 'model_2.hidet'), share_kernels=True)
+
+    # the kernels in the operator cache are referenced instead of embedded
+    with zipfile.ZipFile(str(tmp_path / 'model_1.hidet'), 'r') as zf:
+        assert 'shared_kernels.json' in zf.namelist()
+        assert not any(name.startswith('kernels/') for name in zf.namelist())
+
+    # the loaded graphs share the compiled tasks of the same kernels
+    compiled_task_cache.clear()
+    loaded_1 = hidet.load_compiled_graph(str(tmp_path / 'model_1.hidet'))
+    loaded_2 = hidet.load_compiled_graph(str(tmp_path / 'model_2.hidet'))
+    shared = {id(task) for task in loaded_1.compiled_tasks} & {id(task) for task in loaded_2.compiled_tasks}
+    assert len(shared) == 1
+
+
+def test_share_kernels_eviction(tmp_path):
+    import gc
+    import os
+    from hidet.runtime.compiled_task import compiled_task_cache
+    from hidet.utils.cache_manager import evict_cache
+
+    compiled_task_cache.clear()
+    with hidet.option.context():
+        hidet.option.cache_dir(str(tmp_path / 'cache'))
+        x = hidet.symbol([2, 3], device='cpu')
+        compiled_graph = hidet.trace_from(hidet.ops.relu(x) - 1.0).build()
+        path = str(tmp_path / 'model.hidet')
+        compiled_graph.save(path, share_kernels=True)
+        task_dirs = [task.task_dir for task in compiled_graph.compiled_tasks]
+        # release the compiled tasks, which pin their directories
+        del compiled_graph
+        compiled_task_cache.clear()
+        gc.collect()
+
+        # the kernels referenced by the saved file are kept, until the saved file is removed
+        evict_cache(0, min_age=0)
+        assert all(os.path.exists(task_dir) for task_dir in task_dirs)
+        os.remove(path)
+        evict_cache(0, min_age=0)
+        assert not any(os.path.exists(task_dir) for task_dir in task_dirs)
+
+
+def test_static_call_plan(device: str):
+    x = hidet.symbol([2, 3], device=device)
+    w = hidet.randn([3, 4], device=device)
+    y = hidet.ops.relu(hidet.ops.matmul(x, w))
+    graph = hidet.trace_from([y, x])
+    compiled_graph = graph.build()
+
+    xx = hidet.randn([2, 3], device=device)
+    y1, x1 = graph(xx)
+    # the first call benchmarks the kernels, the following calls go through the precomputed call plan
+    for _ in range(3):
+        y2, x2 = compiled_graph(xx)
+        numpy.testing.assert_allclose(y1.cpu().numpy(), y2.cpu().numpy())
+        assert x2 is xx
+    assert compiled_graph._call_plan is not None
+
+    y3, _ = compiled_graph.run_async([xx.torch()], output_to_torch_tensor=True)
+    numpy.testing.assert_allclose(y1.cpu().numpy(), y3.cpu().numpy())
+
+    # the inputs are still checked on the planned path
+    with hidet.option.context():
+        hidet.option.runtime_check(True)
+        with pytest.raises(RuntimeError):
+            compiled_graph(hidet.randn([3, 3], device=device))
+
+
+def test_provided_outputs(device: str):
+    import torch
+
+    x = hidet.symbol([2, 3], device=device)
+    w = hidet.randn([3, 4], device=device)
+    graph = hidet.trace_from([hidet.ops.relu(hidet.ops.matmul(x, w)), x])
+    compiled_graph = graph.build()
+    xx = hidet.randn([2, 3], device=device)
+    y1, _ = graph(xx)
+
+    # the outputs are written to the caller-provided tensors, including on the first (interpreted) call
+    for _ in range(3):
+        out = hidet.empty([2, 4], device=device)
+        y2, x2 = compiled_graph.run_async([xx], outputs=[out, None])
+        assert y2 is out and x2 is xx
+        numpy.testing.assert_allclose(y1.cpu().numpy(), out.cpu().numpy())
+    out = torch.empty(2, 4, device=device)
+    y3, _ = compiled_graph.run_async([xx], outputs=[out, None])
+    assert y3 is out
+    numpy.testing.assert_allclose(y1.cpu().numpy(), out.cpu().numpy())
+    with pytest.raises(ValueError):
+        compiled_graph.run_async([xx], outputs=[hidet.empty([4, 2], device=device), None])
+
+    # the released outputs are reused by the following call
+    compiled_graph.set_output_ring(1)
+    y4, _ = compiled_graph(xx)
+    compiled_graph.release_outputs([y4, xx])
+    y5, _ = compiled_graph(xx)
+    assert y5 is y4
+    numpy.testing.assert_allclose(y1.cpu().numpy(), y5.cpu().numpy())
+
+
+def test_best_fit_offsets():
+    from hidet.drivers.build_graph import LiveInterval, _best_fit_offsets
+
+    # a, c are freed after node 0, leaving the free regions [0, 256) and [384, 512) below the top
+    intervals = [
+        LiveInterval('a', 'cpu', 256, 0, 0),
+        LiveInterval('b', 'cpu', 128, 0, 1),
+        LiveInterval('c', 'cpu', 100, 0, 0),
+        LiveInterval('d', 'cpu', 128, 0, 1),
+        LiveInterval('e', 'cpu', 128, 1, 1),
+    ]
+    offsets, peak = _best_fit_offsets(intervals, num_nodes=2)
+    # e takes the smallest free region that fits, as the runtime memory planner does
+    assert offsets == {'a': 0, 'b': 256, 'c': 384, 'd': 512, 'e': 384}
+    assert peak == 640
+
+
+def test_static_memory_plan(device: str):
+    import os
+
+    def build(batch_size):
+        x = hidet.symbol([batch_size, 16], device=device)
+        w1 = hidet.randn([16, 32], device=device)
+        w2 = hidet.randn([32, 16], device=device)
+        h = hidet.ops.relu(hidet.ops.matmul(x, w1))
+        y = hidet.ops.softmax(hidet.ops.matmul(h, w2) + hidet.ops.relu(x), axis=1)
+        graph = hidet.trace_from(y, [x])
+        compiled_graph = graph.build()
+        with open(os.path.join(compiled_graph.graph_module.module_dir, 'source.cc'), 'r') as f:
+            source = f.read()
+        return graph, compiled_graph, source
+
+    # the intermediate tensors of a static-shape graph get constant offsets
+    graph, compiled_graph, source = build(4)
+    assert 'memory_planner_allocate' not in source
+    xx = hidet.randn([4, 16], device=device)
+    numpy.testing.assert_allclose(compiled_graph(xx).cpu().numpy(), graph(xx).cpu().numpy(), atol=1e-5, rtol=1e-5)
+
+    # dynamic-shape graphs still use the runtime memory planner
+    _, _, source = build('b')
+    assert 'memory_planner_allocate' in source
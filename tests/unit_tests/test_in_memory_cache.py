@@ -0,0 +1,52 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import hidet
+from hidet.utils.counters import counters
+from hidet.utils.structure import LRUCache
+from hidet.runtime.compiled_task import compiled_task_cache
+
+
+def test_lru_cache_capacity():
+    counters.clear()
+    cache = LRUCache('test_lru_cache')
+    cache.put('a', 1, capacity=2)
+    cache.put('b', 2, capacity=2)
+    assert cache.get('a') == 1  # 'b' becomes the least recently used one
+    cache.put('c', 3, capacity=2)
+    assert 'b' not in cache and 'a' in cache and 'c' in cache
+    assert cache.get('b') is None
+    assert counters['test_lru_cache'] == {'hit': 1, 'miss': 1, 'evict': 1}
+
+
+def test_lru_cache_max_bytes():
+    counters.clear()
+    cache = LRUCache('test_lru_cache', nbytes=len)
+    cache.put('a', b'0' * 60, max_bytes=100)
+    cache.put('b', b'0' * 30, max_bytes=100)
+    cache.put('c', b'0' * 30, max_bytes=100)
+    assert len(cache) == 2 and 'a' not in cache
+    # the newly added entry is kept even if it exceeds the limit alone
+    cache.put('d', b'0' * 200, max_bytes=100)
+    assert len(cache) == 1 and 'd' in cache
+    assert counters['test_lru_cache']['evict'] == 3
+
+
+def test_compiled_task_cache_capacity():
+    counters.clear()
+    compiled_task_cache.clear()
+    with hidet.option.context():
+        hidet.option.compiled_task_cache_capacity(1)
+        for shape in [[3], [4]]:
+            hidet.ops.relu(hidet.symbol(shape, device='cpu')).op.task.build('cpu')
+    assert len(compiled_task_cache.cached) == 1
+    assert counters['compiled_task_cache']['evict'] == 1
+    compiled_task_cache.clear()
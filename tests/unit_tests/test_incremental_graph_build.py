@@ -0,0 +1,44 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import os
+import shutil
+import numpy.testing
+import hidet
+from hidet.runtime.compiled_task import compiled_task_cache
+from hidet.utils.counters import counters
+
+
+def test_reuse_graph_kernels(tmp_path):
+    with hidet.option.context():
+        hidet.option.cache_dir(str(tmp_path))
+        hidet.option.reuse_graph_kernels(True)
+        hidet.option.parallel_build(False)
+
+        x = hidet.symbol([2, 3], device='cpu')
+        y = hidet.ops.relu(x)
+        graph1 = hidet.trace_from(y + 1.0)
+        graph2 = hidet.trace_from(y * 2.0)
+        graph1.build()
+
+        # only the kernels in the graph cache are left
+        shutil.rmtree(os.path.join(str(tmp_path), 'ops'))
+        compiled_task_cache.clear()
+
+        # relu is reused from the cached graph, only the multiplication is compiled
+        hits, misses = counters['graph_kernels']['hit'], counters['graph_kernels']['miss']
+        compiled_graph2 = graph2.build()
+        assert counters['graph_kernels']['hit'] == hits + 1
+        assert counters['graph_kernels']['miss'] == misses + 1
+        assert len(compiled_graph2.compiled_tasks) == 2
+
+        xx = hidet.randn([2, 3], device='cpu')
+        numpy.testing.assert_allclose(compiled_graph2(xx).numpy(), graph2(xx).numpy())
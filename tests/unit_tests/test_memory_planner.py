@@ -0,0 +1,77 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import random
+from ctypes import c_int32, c_int64
+from hidet.ffi.ffi import get_func
+from hidet.ffi.runtime_api import runtime_api
+
+memory_planner_init = get_func('memory_planner_init', [c_int32], None)
+memory_planner_allocate = get_func('memory_planner_allocate', [c_int32, c_int64], c_int64)
+memory_planner_free = get_func('memory_planner_free', [c_int32, c_int64], None)
+memory_planner_used = get_func('memory_planner_used', [c_int32], c_int64)
+
+
+def test_best_fit_and_coalescing():
+    memory_planner_init(0)
+    runtime_api.reset_memory_planner_stats('cpu')
+
+    # the sizes are aligned to 128 bytes, and the empty tensors get -1
+    a = memory_planner_allocate(0, 1000)
+    b = memory_planner_allocate(0, 100)
+    c = memory_planner_allocate(0, 4096)
+    d = memory_planner_allocate(0, 128)
+    assert (a, b, c, d) == (0, 1024, 1152, 5248)
+    assert memory_planner_allocate(0, 0) == -1
+
+    # the smallest free region that fits is used
+    memory_planner_free(0, a)
+    memory_planner_free(0, c)
+    assert memory_planner_allocate(0, 512) == a
+
+    # the freed neighbours are coalesced, and the regions at the end give back the workspace
+    memory_planner_free(0, b)
+    stats = runtime_api.get_memory_planner_stats('cpu')
+    assert stats['num_free_regions'] == 1 and stats['largest_free_region'] == 512 + 128 + 4096
+    memory_planner_free(0, d)
+    assert memory_planner_used(0) == 512
+
+    stats = runtime_api.get_memory_planner_stats('cpu')
+    assert stats['peak'] == 5376 and stats['peak_used'] == 5376 and stats['fragmentation'] == 0.0
+    assert stats['num_allocations'] == 5 and stats['used'] == 512
+
+
+def test_random_allocations():
+    rng = random.Random(0)
+    memory_planner_init(0)
+    runtime_api.reset_memory_planner_stats('cpu')
+    live = {}
+    peak_used = 0
+    for _ in range(2000):
+        if live and rng.random() < 0.45:
+            start = rng.choice(list(live))
+            memory_planner_free(0, start)
+            del live[start]
+        else:
+            size = rng.choice([1, 128, 1000, 4096, 65536]) * rng.randint(1, 8)
+            start = memory_planner_allocate(0, size)
+            assert start % 128 == 0 and start not in live
+            live[start] = (size + 127) // 128 * 128
+        regions = sorted(live.items())
+        for (start, size), (next_start, _) in zip(regions, regions[1:]):
+            assert start + size <= next_start
+        top = memory_planner_used(0)
+        assert all(start + size <= top for start, size in regions)
+        peak_used = max(peak_used, sum(live.values()))
+
+    stats = runtime_api.get_memory_planner_stats('cpu')
+    assert stats['used'] == sum(live.values()) and stats['reserved'] == memory_planner_used(0)
+    assert stats['peak'] >= peak_used and 0.0 <= stats['fragmentation'] < 1.0
@@ -0,0 +1,73 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from hidet.runtime.device import Device
+from hidet.runtime.storage import MemoryPool, CpuMemoryAPI
+
+KiB = 1024
+MiB = 1024**2
+
+
+def test_best_fit_and_coalescing():
+    pool = MemoryPool(CpuMemoryAPI(Device('cpu')), block_size=4 * KiB, max_reserve_size=64 * MiB)
+
+    # the small requests of different sizes share a segment
+    a = pool.malloc(10 * KiB)
+    b = pool.malloc(5 * KiB)
+    c = pool.malloc(100 * KiB)
+    assert a.num_bytes == 12 * KiB and b.num_bytes == 8 * KiB
+    assert pool.stats()['segments'] == 1
+    assert b.addr == a.addr + a.num_bytes and c.addr == b.addr + b.num_bytes
+
+    # a freed block is reused by a smaller request of another size (best-fit with splitting)
+    addr_a = a.addr
+    del a
+    d = pool.malloc(4 * KiB)
+    assert d.addr == addr_a
+
+    # the freed neighbors are coalesced, and the segment is entirely free again
+    del b, c, d
+    stats = pool.stats()
+    assert stats['active'] == 0
+    assert stats['largest_free'] == stats['reserved'] == MemoryPool.SMALL_SEGMENT_SIZE
+    assert stats['fragmentation'] == 0.0
+    assert stats['hit_rate'] == 0.75
+
+
+def test_trim():
+    pool = MemoryPool(CpuMemoryAPI(Device('cpu')), block_size=4 * KiB, max_reserve_size=5 * MiB)
+    storages = [pool.malloc(4 * MiB) for _ in range(3)]
+    assert pool.stats()['segments'] == 3
+
+    # only the free segments exceeding the limit are released, instead of all the cached memory
+    storages.clear()
+    stats = pool.stats()
+    assert stats['segments'] == 1 and stats['reserved'] == 4 * MiB
+    storage = pool.malloc(3 * MiB)
+    assert pool.stats()['segments'] == 1 and pool.stats()['hit_rate'] == 0.25
+    assert 'Hit rate' in pool.status()
+
+
+def test_trim_fragmented():
+    pool = MemoryPool(CpuMemoryAPI(Device('cpu')), block_size=4 * KiB, max_reserve_size=0)
+    trim = pool.trim
+    num_trims = []
+    pool.trim = lambda *args: num_trims.append(1) or trim(*args)
+
+    # the frees that leave no entirely free segment do not look for segments to release
+    storages = [pool.malloc(64 * KiB) for _ in range(4)]
+    del storages[0], storages[1]
+    assert pool.stats()['reserved'] > 0 and len(num_trims) == 0
+
+    # the segment is released once it becomes entirely free
+    storages.clear()
+    assert len(num_trims) == 1
+    assert pool.stats()['segments'] == 0 and pool.stats()['reserved'] == 0
@@ -0,0 +1,38 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import os
+import hidet
+from hidet.backend import precompiled_header
+
+
+def test_precompiled_header_covers_header_contents(tmp_path, monkeypatch):
+    include_dir = tmp_path / 'include'
+    os.makedirs(include_dir / 'hidet')
+    header = include_dir / 'hidet' / 'runtime.h'
+    header.write_text('#pragma once\n#define VALUE 1\n')
+    src = tmp_path / 'source.cc'
+    src.write_text('#include <hidet/runtime.h>\n\nint value() { return VALUE; }\n')
+    monkeypatch.setattr(precompiled_header, 'get_include_dirs', lambda: [str(include_dir)])
+
+    with hidet.option.context():
+        hidet.option.cache_dir(str(tmp_path / 'cache'))
+        flags = ['g++', '-I{}'.format(include_dir)]
+        pch = precompiled_header.get_precompiled_header(str(src), flags)
+        assert pch is not None and os.path.exists(pch + '.gch')
+        assert precompiled_header.get_precompiled_header(str(src), flags) == pch
+
+        # a changed header must not reuse the precompiled header built from the old one
+        header.write_text('#pragma once\n#define VALUE 2\n')
+        os.utime(header, ns=(0, 0))
+        updated = precompiled_header.get_precompiled_header(str(src), flags)
+        assert updated is not None and updated != pch
+        assert os.path.exists(updated + '.gch')
@@ -0,0 +1,58 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import pytest
+import hidet
+from hidet.ffi import runtime_api
+
+
+def test_symbol_slots():
+    slots = runtime_api.symbol_slots(['test_sym_a', 'test_sym_b'])
+    assert runtime_api.register_symbol('test_sym_a') == slots.slots[0]
+    assert runtime_api.register_symbol('test_sym_b') == slots.slots[1]
+
+    # the values set in a batch are visible through the name-based api, and vice versa
+    slots.set_values([3, 5])
+    assert runtime_api.get_symbol_value('test_sym_a') == 3
+    assert runtime_api.get_symbol_value('test_sym_b') == 5
+    runtime_api.set_symbol_value('test_sym_b', 7)
+    assert slots.get_values() == (3, 7)
+
+    # resetting the table clears the values but keeps the slots
+    runtime_api.reset_symbol_table()
+    with pytest.raises(Exception):
+        runtime_api.get_symbol_value('test_sym_a')
+    assert runtime_api.register_symbol('test_sym_a') == slots.slots[0]
+    slots.set_values([1, 2])
+    assert runtime_api.get_symbol_value('test_sym_b') == 2
+
+
+def test_symbol_slot_value():
+    from hidet.lang import attrs, int32
+    from hidet.ir.primitives.runtime import get_symbol_slot_value
+
+    with hidet.script_module() as script_module:
+
+        @hidet.script
+        def launch(out: int32[1]):
+            attrs.func_kind = 'public'
+            out[0] = get_symbol_slot_value('test_sym_c')
+
+    func = script_module.build()
+    out = hidet.zeros([1], dtype='int32', device='cpu')
+    runtime_api.set_symbol_value('test_sym_c', 5)
+    func(out)
+    assert out.numpy()[0] == 5
+
+    # reading a symbol that has not been set fails instead of reading zero
+    runtime_api.reset_symbol_table()
+    with pytest.raises(Exception, match='test_sym_c'):
+        func(out)
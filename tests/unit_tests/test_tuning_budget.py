@@ -0,0 +1,94 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import os
+import json
+import hidet
+from hidet.ir.compute import compute, tensor_input
+from hidet.ir.task import Task
+from hidet.drivers import build_task
+from hidet.drivers.build_task import BUDGETED_BUILD_FILE, prepare_cache_paths
+
+
+class AddOneTask(Task):
+    def __init__(self):
+        x = tensor_input('x', 'float32', [64])
+        y = compute('y', shape=[64], fcompute=lambda i: x[i] + 1.0)
+        super().__init__(name='add_one', inputs=[x], outputs=[y])
+
+    def implement_cpu(self, working_dir: str):
+        return [self._candidate(i) for i in range(3)]
+
+    @staticmethod
+    def _candidate(unroll: int):
+        from hidet.lang import attrs
+        from hidet.lang.types import f32
+
+        with hidet.script_module() as script_module:
+
+            @hidet.script
+            def launch(x: f32[64], y: f32[64]):
+                attrs.func_kind = 'public'
+
+                for i in range(64 // (unroll + 1)):
+                    for j in range(unroll + 1):
+                        y[i * (unroll + 1) + j] = x[i * (unroll + 1) + j] + 1.0
+
+        return script_module.ir_module()
+
+
+def test_budgeted_build_is_rebuilt_without_budget(tmp_path):
+    task = AddOneTask()
+
+    with hidet.option.context():
+        hidet.option.cache_dir(str(tmp_path / 'cache'))
+        hidet.option.search_space(1)
+        hidet.option.num_local_workers(2)
+        hidet.option.unity_build(True, max_candidates=1)
+        # the candidates of the budgeted build are kept, and must not be mistaken for the ones of the full build
+        hidet.option.debug_cache_tuning(True)
+        ops_dir = os.path.join(str(tmp_path / 'cache'), 'ops')
+        task_dir, _ = prepare_cache_paths(ops_dir, 'cpu_space_1', task, task.calculate_hash())
+
+        with hidet.option.context():
+            hidet.option.tuning_budget(candidates=1)
+            build_task(task, target='cpu', load=False)
+            assert os.path.exists(os.path.join(task_dir, BUDGETED_BUILD_FILE))
+            with open(os.path.join(task_dir, 'candidates.json'), 'r') as f:
+                assert len(json.load(f)['skipped']) == 2
+
+            # the following builds with a budget reuse the budgeted build
+            lib_stat = os.stat(os.path.join(task_dir, 'lib.so'))
+            build_task(task, target='cpu', load=False)
+            assert os.stat(os.path.join(task_dir, 'lib.so')).st_mtime_ns == lib_stat.st_mtime_ns
+
+        # the builds without a budget rebuild the task with all its candidates
+        compiled_task = build_task(task, target='cpu')
+        assert compiled_task.meta_data.num_candidates == 3
+        assert not os.path.exists(os.path.join(task_dir, BUDGETED_BUILD_FILE))
+
+
+def test_plateau_skipped_candidates_are_recorded(tmp_path):
+    from hidet.runtime.utils.dispatch_table import DispatchTable
+
+    candidates_json_path = os.path.join(str(tmp_path), 'candidates.json')
+    with open(candidates_json_path, 'w') as f:
+        json.dump({'headers': ['index'], 'candidates': [['0'], ['1'], ['2']], 'skipped': []}, f)
+
+    # the candidates that are not benchmarked after the plateau have infinite latencies
+    table = DispatchTable(candidates=[], task_dir=str(tmp_path), symbols=['plateau_n'], name='add_one')
+    table._record_candidate_selection((16,), [0.1, 0.2, float('inf')])
+    table._record_candidate_selection((16,), [0.1, 0.2, float('inf')])
+    table._record_candidate_selection((32,), [0.1, 0.2, 0.3])
+
+    with open(candidates_json_path, 'r') as f:
+        candidates_json = json.load(f)
+    assert candidates_json['plateau_skipped'] == [{'symbols': {'plateau_n': 16}, 'candidates': [2]}]
@@ -0,0 +1,45 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import os
+import time
+import hidet
+from hidet.utils.multiprocess import parallel_imap_1stlevel, shutdown_worker_pool
+
+
+def _worker_pid(_):
+    # keep each worker busy for a while, so that all the workers take jobs
+    time.sleep(0.05)
+    return os.getpid()
+
+
+def _worker_search_space(_):
+    return hidet.option.get_search_space()
+
+
+def test_persistent_worker_pool():
+    with hidet.option.context():
+        hidet.option.persistent_worker_pool(True)
+        hidet.option.num_local_workers(2)
+        try:
+            first = set(parallel_imap_1stlevel(_worker_pid, list(range(8))))
+            second = set(parallel_imap_1stlevel(_worker_pid, list(range(8))))
+            # the workers are reused by the following builds
+            assert os.getpid() not in first
+            assert second <= first
+
+            # the workers see the options of the context the jobs are submitted in
+            for space in [1, 2]:
+                with hidet.option.context():
+                    hidet.option.search_space(space)
+                    assert set(parallel_imap_1stlevel(_worker_search_space, list(range(4)))) == {space}
+        finally:
+            shutdown_worker_pool()